@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from difflib import SequenceMatcher
+import logging
+import re
+import threading
+from typing import Any, Iterable, Optional
+
+import data_persistence
+from env_settings import env_float, env_int
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_MIN_SIMILARITY = 0.85
+DEFAULT_WARM_LIMIT = 5000
+
+STREET_ABBREVIATIONS = {
+    "aly": "alley",
+    "ave": "avenue",
+    "blvd": "boulevard",
+    "cir": "circle",
+    "ct": "court",
+    "dr": "drive",
+    "hwy": "highway",
+    "ln": "lane",
+    "pkwy": "parkway",
+    "pl": "place",
+    "rd": "road",
+    "sq": "square",
+    "st": "street",
+    "ter": "terrace",
+    "trl": "trail",
+    "way": "way",
+}
+ADDRESS_FIELDS = ("street", "city", "state", "zip", "country")
+DIRECTIONAL_ABBREVIATIONS = {
+    "n": "north",
+    "s": "south",
+    "e": "east",
+    "w": "west",
+    "ne": "northeast",
+    "nw": "northwest",
+    "se": "southeast",
+    "sw": "southwest",
+}
+ORDINAL_WORDS = {
+    "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth",
+    "eleventh", "twelfth",
+}
+UNIT_DESIGNATORS = {
+    "apartment", "apt", "bldg", "building", "fl", "floor", "lot", "rm", "room", "space", "spc", "ste",
+    "suite", "unit",
+}
+# One letter or digit apart in these tokens is a different place, however similar the rest is.
+# Street types are compared here too: "Main St" and "Main Ave" are different streets.
+_HARD_MATCH_TOKENS = (
+    set(DIRECTIONAL_ABBREVIATIONS.values()) | ORDINAL_WORDS | UNIT_DESIGNATORS | set(STREET_ABBREVIATIONS.values())
+)
+# A street-name token only matches fuzzily when it is near-identical to the indexed one: a
+# SequenceMatcher ratio this high, or a single edit when both tokens are at least this long.
+_NAME_TOKEN_MIN_RATIO = 0.95
+_SINGLE_EDIT_MIN_LENGTH = 5
+
+_INDEX: Optional["AddressIndex"] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def normalize_lookup_text(value):
+    return re.sub(r"[^a-z0-9]+", " ", str(value).lower()).strip()
+
+
+def normalize_lookup_tokens(value):
+    return [
+        STREET_ABBREVIATIONS.get(token, token)
+        for token in normalize_lookup_text(value).split()
+        if token
+    ]
+
+
+def normalize_street_text(value):
+    return " ".join(normalize_lookup_tokens(value))
+
+
+def address_from_lookup_key(cache_key: str):
+    """Rebuild the (lower-cased) request address behind a ``build_address_lookup_key`` value."""
+    parts = str(cache_key or "").split("|")
+    if len(parts) != len(ADDRESS_FIELDS):
+        return None
+    return dict(zip(ADDRESS_FIELDS, parts))
+
+
+def _alias(address: dict[str, Any]):
+    tokens = [
+        DIRECTIONAL_ABBREVIATIONS.get(token, token)
+        for token in normalize_lookup_tokens(address.get("street", ""))
+    ]
+    house_number = tokens[0] if tokens and tokens[0].isdigit() else ""
+    street_tokens = tuple(tokens[1:] if house_number else tokens)
+    if not street_tokens:
+        return None
+    return (
+        house_number,
+        street_tokens,
+        normalize_lookup_text(address.get("city", "")),
+        normalize_lookup_text(address.get("state", "")),
+        normalize_lookup_text(address.get("zip", "")),
+        normalize_lookup_text(address.get("country", "")),
+    )
+
+
+def _split_hard_tokens(street_tokens: tuple[str, ...]):
+    """Separate tokens that must match exactly (directionals, ordinals, numbers, units, street types)
+    from the street-name tokens."""
+    hard_tokens = []
+    soft_tokens = []
+    after_unit = False
+    for token in street_tokens:
+        if after_unit or token in _HARD_MATCH_TOKENS or any(char.isdigit() for char in token):
+            hard_tokens.append(token)
+        else:
+            soft_tokens.append(token)
+        after_unit = token in UNIT_DESIGNATORS
+    return tuple(sorted(hard_tokens)), tuple(soft_tokens)
+
+
+def _within_one_edit(token: str, candidate: str):
+    if abs(len(token) - len(candidate)) > 1:
+        return False
+    if len(token) > len(candidate):
+        token, candidate = candidate, token
+    index = 0
+    while index < len(token) and token[index] == candidate[index]:
+        index += 1
+    if len(token) == len(candidate):
+        return token[index + 1:] == candidate[index + 1:]
+    return token[index:] == candidate[index + 1:]
+
+
+def _name_similarity(query_tokens: tuple[str, ...], candidate_tokens: tuple[str, ...]):
+    """Return ``(similarity, near_identical)`` for two street names compared token by token.
+
+    "Hill" / "Hall" or "Main" / "Maine" score well on ratio alone but name different streets,
+    so every token must be near-identical for the match to be trusted.
+    """
+    if len(query_tokens) != len(candidate_tokens):
+        return 0.0, False
+    ratios = []
+    near_identical = True
+    for token, candidate in zip(query_tokens, candidate_tokens):
+        ratio = SequenceMatcher(None, token, candidate).ratio()
+        ratios.append(ratio)
+        near_identical = near_identical and (
+            ratio >= _NAME_TOKEN_MIN_RATIO
+            or (
+                min(len(token), len(candidate)) >= _SINGLE_EDIT_MIN_LENGTH
+                and _within_one_edit(token, candidate)
+            )
+        )
+    return sum(ratios) / len(ratios), near_identical
+
+
+def _block_keys(alias: tuple):
+    # Aliases are bucketed by house number and ZIP, and by house number, city and state, so a
+    # fuzzy lookup only compares against the handful of addresses that could be the same one.
+    house_number, _, city, state, zip_code, _ = alias
+    keys = []
+    if zip_code:
+        keys.append((house_number, zip_code))
+    if city and state:
+        keys.append((house_number, city, state))
+    return keys
+
+
+def _same_locality(query: tuple, candidate: tuple):
+    # Parts present on both sides must agree, and both sides must name the same ZIP or the same
+    # city and state: a missing part cannot vouch for a fuzzy match.
+    if any(
+        query_part and candidate_part and query_part != candidate_part
+        for query_part, candidate_part in zip(query[2:], candidate[2:])
+    ):
+        return False
+    _, _, city, state, zip_code, _ = query
+    same_zip = bool(zip_code) and zip_code == candidate[4]
+    same_city_and_state = bool(city and state) and (city, state) == (candidate[2], candidate[3])
+    return same_zip or same_city_and_state
+
+
+class AddressIndex:
+    """Normalized address aliases pointing at forward geocode cache keys.
+
+    Exact aliases resolve through one dict lookup. Fuzzy matches are limited to aliases with the
+    same house number, ZIP or city and state, street type, and directional, ordinal, numbered and
+    unit tokens, and compare only the street-name tokens. A name that is similar but not
+    near-identical comes back as a ``"hint"``, which callers must confirm with a provider. The
+    index only stores keys, so callers re-read the cache entry and a purged or expired entry
+    simply misses.
+    """
+
+    def __init__(self, *, max_entries: Optional[int] = None, min_similarity: Optional[float] = None):
+        self.max_entries = max(
+            max_entries if max_entries is not None else env_int("ADDRESS_INDEX_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+            1,
+        )
+        self.min_similarity = (
+            min_similarity
+            if min_similarity is not None
+            else env_float("ADDRESS_INDEX_MIN_SIMILARITY", DEFAULT_MIN_SIMILARITY)
+        )
+        self._entries: OrderedDict[str, set[tuple]] = OrderedDict()
+        self._exact: dict[tuple, str] = {}
+        self._blocks: dict[tuple, dict[tuple, str]] = {}
+        self._lock = threading.RLock()
+        self._counters = {"exact_hits": 0, "fuzzy_hits": 0, "hints": 0, "misses": 0, "stale": 0, "evictions": 0}
+        self.warmed = False
+
+    def add(self, cache_key: str, addresses: Iterable[Optional[dict[str, Any]]]):
+        aliases = {alias for alias in (_alias(address) for address in addresses if address) if alias}
+        if not cache_key or not aliases:
+            return
+        with self._lock:
+            for alias in aliases:
+                previous_key = self._exact.get(alias)
+                if previous_key is not None and previous_key != cache_key:
+                    self._entries.get(previous_key, set()).discard(alias)
+                self._exact[alias] = cache_key
+                if alias[0]:
+                    for block_key in _block_keys(alias):
+                        self._blocks.setdefault(block_key, {})[alias] = cache_key
+            self._entries.setdefault(cache_key, set()).update(aliases)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def _drop(self, cache_key: str):
+        for alias in self._entries.pop(cache_key, ()):
+            if self._exact.get(alias) == cache_key:
+                del self._exact[alias]
+                for block_key in _block_keys(alias):
+                    block = self._blocks.get(block_key, {})
+                    block.pop(alias, None)
+                    if not block:
+                        self._blocks.pop(block_key, None)
+
+    def discard(self, cache_key: str):
+        with self._lock:
+            self._drop(cache_key)
+            self._counters["stale"] += 1
+
+    def match(self, address: dict[str, Any]):
+        """Return ``(cache_key, "exact" | "fuzzy" | "hint", similarity)`` for the closest alias, or None."""
+        query = _alias(address)
+        if query is None:
+            return None
+
+        with self._lock:
+            cache_key = self._exact.get(query)
+            if cache_key is not None:
+                self._counters["exact_hits"] += 1
+                return cache_key, "exact", 1.0
+            # Without a house number only exact aliases are trusted.
+            candidates = {}
+            if query[0]:
+                for block_key in _block_keys(query):
+                    candidates.update(self._blocks.get(block_key, {}))
+
+        best = None
+        query_hard, query_soft = _split_hard_tokens(query[1])
+        for alias, alias_key in candidates.items():
+            if not _same_locality(query, alias):
+                continue
+            alias_hard, alias_soft = _split_hard_tokens(alias[1])
+            if alias_hard != query_hard or not query_soft or not alias_soft:
+                continue
+            similarity, near_identical = _name_similarity(query_soft, alias_soft)
+            if similarity < self.min_similarity:
+                continue
+            candidate = (near_identical, similarity, alias_key)
+            if best is None or candidate[:2] > best[:2]:
+                best = candidate
+
+        with self._lock:
+            if best is None:
+                self._counters["misses"] += 1
+                return None
+            near_identical, similarity, alias_key = best
+            self._counters["fuzzy_hits" if near_identical else "hints"] += 1
+            return alias_key, "fuzzy" if near_identical else "hint", round(similarity, 4)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._exact.clear()
+            self._blocks.clear()
+            self.warmed = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "aliases": len(self._exact),
+                "max_entries": self.max_entries,
+                "min_similarity": self.min_similarity,
+                "warmed": self.warmed,
+            }
+
+
+def get_address_index():
+    global _INDEX
+
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = AddressIndex()
+        return _INDEX
+
+
+def warm_address_index(query_type: str, limit: Optional[int] = None, force: bool = False):
+    """Load recent forward geocode cache entries and saved property records into the index.
+
+    Saved records whose address has no fresh cache entry get one seeded from their stored
+    property preview, so reopening a saved property never needs a provider call.
+    """
+    index = get_address_index()
+    with _INDEX_LOCK:
+        if index.warmed and not force:
+            return 0
+        index.warmed = True
+
+    limit = max(limit or env_int("ADDRESS_INDEX_WARM_LIMIT", DEFAULT_WARM_LIMIT), 1)
+    loaded = 0
+    # Oldest first so the newest entries survive if the index is smaller than the limit.
+    for cache_key, response in reversed(data_persistence.list_geocode_cache(query_type, limit=limit)):
+        index.add(cache_key, [address_from_lookup_key(cache_key), (response or {}).get("address")])
+        loaded += 1
+
+    for record in reversed(data_persistence.list_property_records(limit=limit, fields=("address", "property_preview"))):
+        address = record.get("address") or {}
+        preview = record.get("property_preview") or {}
+        if not address or preview.get("latitude") is None or preview.get("longitude") is None:
+            continue
+        cache_key = data_persistence.build_address_lookup_key(address)
+        if data_persistence.get_geocode_cache(query_type, cache_key) is None:
+            data_persistence.store_geocode_cache(query_type, cache_key, preview, preview.get("source"))
+        index.add(cache_key, [address, preview.get("address")])
+        loaded += 1
+
+    logger.info("Address index warmed with %s entries", loaded)
+    return loaded
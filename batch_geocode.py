@@ -0,0 +1,248 @@
+import argparse
+import contextvars
+import csv
+import io
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import data_persistence
+from env_settings import env_float
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_FIELDS = ("street", "city", "state", "zip", "country")
+# Public Nominatim allows one request per second; ArcGIS tolerates more but still throttles bursts.
+PROVIDER_RATE_DEFAULTS = {
+    "nominatim": (1.0, 1),
+    "arcgis": (10.0, 10),
+}
+_DEFAULT_BATCH_WORKERS = 2
+
+# Set while a batch job runs so provider calls made anywhere below it wait for a token.
+# Interactive requests leave it unset; their only pacing is main's Nominatim lock.
+provider_rate_limits = contextvars.ContextVar("provider_rate_limits", default=None)
+# Per batch task, a one-item list of the seconds spent waiting for tokens, so geocode deadlines
+# can leave that time out.
+_token_wait_seconds = contextvars.ContextVar("token_wait_seconds", default=None)
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve the next free slot and sleep until it arrives."""
+
+    def __init__(self, rate_per_second, capacity=1):
+        self.rate_per_second = max(float(rate_per_second), 0.001)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            # Going negative reserves a slot, so concurrent callers queue instead of racing.
+            self._tokens -= 1
+            wait_seconds = max(-self._tokens / self.rate_per_second, 0.0)
+            self.acquired += 1
+            self.waited_seconds += wait_seconds
+        if wait_seconds:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate_per_second": self.rate_per_second,
+                "capacity": self.capacity,
+                "acquired": self.acquired,
+                "waited_seconds": round(self.waited_seconds, 4),
+            }
+
+
+def get_provider_buckets():
+    """Process-wide buckets, so concurrent batch jobs share each provider's budget."""
+    with _buckets_lock:
+        for provider, (default_rate, default_burst) in PROVIDER_RATE_DEFAULTS.items():
+            if provider not in _buckets:
+                prefix = f"GEOCODE_{provider.upper()}"
+                _buckets[provider] = TokenBucket(
+                    env_float(f"{prefix}_RATE_PER_SECOND", default_rate),
+                    env_float(f"{prefix}_BURST", default_burst),
+                )
+        return dict(_buckets)
+
+
+def get_provider_bucket_stats():
+    with _buckets_lock:
+        buckets = dict(_buckets)
+    return {provider: bucket.stats() for provider, bucket in buckets.items()}
+
+
+def acquire_provider_token(provider):
+    buckets = provider_rate_limits.get()
+    if buckets is None or provider not in buckets:
+        return 0.0
+    waited = buckets[provider].acquire()
+    waits = _token_wait_seconds.get()
+    if waits is not None:
+        waits[0] += waited
+    return waited
+
+
+def get_token_wait_seconds():
+    """Seconds the current batch task has waited for provider tokens so far; 0 outside a batch."""
+    waits = _token_wait_seconds.get()
+    return waits[0] if waits else 0.0
+
+
+def is_rate_limited():
+    return provider_rate_limits.get() is not None
+
+
+def rate_limited_context(buckets=None):
+    """A copy of the current context with the provider buckets switched on.
+
+    Run each task in its own ``.copy()`` of it: one context cannot be entered by two threads.
+    """
+    context = contextvars.copy_context()
+    context.run(provider_rate_limits.set, get_provider_buckets() if buckets is None else buckets)
+    return context
+
+
+def _task_context(limited_context):
+    context = limited_context.copy()
+    context.run(_token_wait_seconds.set, [0.0])
+    return context
+
+
+def _max_batch_workers(buckets, providers):
+    # A worker beyond what the slowest provider's rate can feed only sleeps on its bucket.
+    rates = [buckets[provider].rate_per_second for provider in (providers or buckets) if provider in buckets]
+    return max(math.ceil(min(rates)), 1) if rates else None
+
+
+def _result_lines(indexes, cache_key, status, **fields):
+    for index in indexes:
+        yield {"index": index, "key": cache_key, "status": status, **fields}
+
+
+def run_batch(addresses, lookup_cached, resolve, workers=None, providers=None):
+    """Yield one result dict per input address, cache hits first, then misses as they finish.
+
+    ``lookup_cached(address, cache_key)`` must not call a provider; ``resolve(address)`` may, and
+    runs on a worker pool under the provider token buckets. The pool is capped by the slowest
+    rate among ``providers`` (default: every bucket). Duplicate addresses (same lookup key) are
+    resolved once and reported for every index they appear at. A final summary line follows.
+    """
+    started_at = time.perf_counter()
+    groups = {}
+    for index, address in enumerate(addresses):
+        cache_key = data_persistence.build_address_lookup_key(address)
+        groups.setdefault(cache_key, (address, []))[1].append(index)
+
+    counts = {"cached": 0, "geocoded": 0, "error": 0}
+    misses = []
+    for cache_key, (address, indexes) in groups.items():
+        cached = lookup_cached(address, cache_key)
+        if cached:
+            counts["cached"] += len(indexes)
+            yield from _result_lines(indexes, cache_key, "cached", result=cached)
+        else:
+            misses.append((cache_key, address, indexes))
+
+    buckets = get_provider_buckets()
+    workers = max(int(workers or env_float("GEOCODE_BATCH_WORKERS", _DEFAULT_BATCH_WORKERS)), 1)
+    workers = min(workers, _max_batch_workers(buckets, providers) or workers)
+    limited_context = rate_limited_context(buckets)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="geocode-batch")
+    try:
+        futures = {
+            executor.submit(_task_context(limited_context).run, resolve, address): (cache_key, indexes)
+            for cache_key, address, indexes in misses
+        }
+        for future in as_completed(futures):
+            cache_key, indexes = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                counts["error"] += len(indexes)
+                yield from _result_lines(
+                    indexes,
+                    cache_key,
+                    "error",
+                    status_code=getattr(exc, "status_code", 500),
+                    detail=getattr(exc, "detail", None) or str(exc),
+                )
+                continue
+            counts["geocoded"] += len(indexes)
+            yield from _result_lines(indexes, cache_key, "geocoded", result=result)
+    finally:
+        # A closed stream (client gone) drops the queued misses instead of geocoding them anyway.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    yield {
+        "summary": {
+            "addresses": len(addresses),
+            "unique_addresses": len(groups),
+            **counts,
+            "elapsed_seconds": round(time.perf_counter() - started_at, 4),
+        }
+    }
+
+
+def read_addresses(stream, path=""):
+    """Read addresses from CSV (with a header row) or from NDJSON when the path ends in .ndjson/.jsonl."""
+    if path.endswith((".ndjson", ".jsonl")):
+        rows = (json.loads(line) for line in stream if line.strip())
+    else:
+        rows = csv.DictReader(stream)
+    return [
+        {field: str((row or {}).get(field) or "").strip() for field in ADDRESS_FIELDS}
+        for row in rows
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Geocode a spreadsheet of addresses and write NDJSON results.")
+    parser.add_argument("input", help="CSV with street,city,state,zip,country columns, *.ndjson, or - for stdin")
+    parser.add_argument("output", nargs="?", default="-", help="NDJSON output path, or - for stdout")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    # Imported here because main imports this module for the batch endpoint.
+    from main import stream_property_preview_batch
+
+    if args.input == "-":
+        addresses = read_addresses(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8"))
+    else:
+        with open(args.input, newline="", encoding="utf-8") as stream:
+            addresses = read_addresses(stream, args.input)
+
+    output = (
+        io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8")
+    )
+    with output:
+        for line in stream_property_preview_batch(addresses, workers=args.workers):
+            output.write(line)
+            output.flush()
+    data_persistence.close_connections()
+    return 0
+
+
+#python batch_geocode.py installers.csv installers.ndjson - to geocode a spreadsheet of addresses
+if __name__ == "__main__":
+    raise SystemExit(main())
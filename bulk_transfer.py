@@ -0,0 +1,295 @@
+import argparse
+import gzip
+import io
+import json
+import logging
+import sys
+import time
+
+import data_persistence
+from env_settings import env_int
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CHUNK_SIZE = 5000
+
+# Each table lists its primary key, its columns and its JSON columns, flagged when they may be compressed.
+# JSON columns are exported decoded, so dumps stay readable and independent of APP_DB_BLOB_CODEC.
+TRANSFER_TABLES = {
+    "geocode_cache": {
+        "key": ("cache_key",),
+        "columns": ("cache_key", "query_type", "source", "response_json", "stored_at", "stored_at_epoch"),
+        "json": {"response_json": False},
+    },
+    "solar_data": {
+        "key": ("guid",),
+        "columns": (
+            "guid",
+            "zip_code",
+            "solar_data_json",
+            "time_zone",
+            "data_source",
+            "address_json",
+            "stored_at",
+            "stored_at_epoch",
+        ),
+        "json": {"solar_data_json": False, "address_json": False},
+    },
+    "property_climate_snapshots": {
+        "key": ("coordinate_lookup_key",),
+        "columns": ("coordinate_lookup_key", "climate_json", "stored_at", "stored_at_epoch"),
+        "json": {"climate_json": True},
+    },
+    "property_records": {
+        "key": ("guid",),
+        "columns": (
+            "guid",
+            "address_lookup_key",
+            "address_json",
+            "property_preview_json",
+            "property_context_json",
+            "property_climate_json",
+            "roof_selection_json",
+            "garden_zones_json",
+            "saved_solar_reports_json",
+            "stored_at",
+            "has_garden_zones",
+        ),
+        "json": {
+            "address_json": False,
+            "property_preview_json": False,
+            "property_context_json": True,
+            "property_climate_json": True,
+            "roof_selection_json": False,
+            "garden_zones_json": False,
+            "saved_solar_reports_json": False,
+        },
+    },
+    "property_garden_zones": {
+        "key": ("property_guid", "position"),
+        "columns": ("property_guid", "position", "zone_json"),
+        "json": {"zone_json": False},
+    },
+    "property_solar_reports": {
+        "key": ("property_guid", "report_key"),
+        "columns": ("property_guid", "report_key", "position", "report_json"),
+        "json": {"report_json": True},
+    },
+    "solar_quotes": {
+        "key": ("quote_id",),
+        "columns": ("quote_id", "property_guid", "report_id", "stored_at"),
+        "json": {},
+    },
+    "solar_quote_leads": {
+        "key": ("lead_id",),
+        "columns": ("lead_id", "quote_id", "property_guid", "report_id", "lead_json", "stored_at"),
+        "json": {"lead_json": False},
+    },
+}
+TABLE_GROUPS = {
+    "caches": ("geocode_cache", "solar_data", "property_climate_snapshots"),
+    "records": (
+        "property_records",
+        "property_garden_zones",
+        "property_solar_reports",
+        "solar_quotes",
+        "solar_quote_leads",
+    ),
+}
+TABLE_GROUPS["all"] = TABLE_GROUPS["records"] + TABLE_GROUPS["caches"]
+# Rows owned by a property record; an imported record replaces these instead of merging with them.
+RECORD_CHILD_TABLES = ("property_garden_zones", "property_solar_reports", "solar_quotes")
+
+
+def resolve_tables(names):
+    tables = []
+    for name in names or ("all",):
+        for table in TABLE_GROUPS.get(name, (name,)):
+            if table not in TRANSFER_TABLES:
+                raise ValueError(f"Unknown table or group: {name}")
+            if table not in tables:
+                tables.append(table)
+    return tables
+
+
+def _open_stream(path, mode):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer if mode == "w" else sys.stdin.buffer, encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+def _iter_table_rows(connection, table, chunk_size):
+    # Keyset pagination keeps memory flat and never holds a read transaction across chunks.
+    spec = TRANSFER_TABLES[table]
+    key_columns = ", ".join(spec["key"])
+    select = f"SELECT {', '.join(spec['columns'])} FROM {table}"
+    last_key = None
+    while True:
+        if last_key is None:
+            rows = connection.execute(
+                f"{select} ORDER BY {key_columns} LIMIT ?",
+                (chunk_size,),
+            ).fetchall()
+        else:
+            placeholders = ", ".join("?" for _ in spec["key"])
+            rows = connection.execute(
+                f"{select} WHERE ({key_columns}) > ({placeholders}) ORDER BY {key_columns} LIMIT ?",
+                (*last_key, chunk_size),
+            ).fetchall()
+        if not rows:
+            return
+        yield from rows
+        last_key = tuple(rows[-1][column] for column in spec["key"])
+        if len(rows) < chunk_size:
+            return
+
+
+def _decode_json_column(table, row, column):
+    # Unlike reads through data_persistence, a corrupt value must not be exported as null.
+    try:
+        return data_persistence.load_json_column(row[column])
+    except ValueError as exc:
+        key = ", ".join(str(row[key_column]) for key_column in TRANSFER_TABLES[table]["key"])
+        raise ValueError(f"{table} row ({key}) has an unreadable {column}: {exc}") from exc
+
+
+def export_tables(stream, tables=None, chunk_size=_DEFAULT_CHUNK_SIZE):
+    """Write one NDJSON line per row: ``{"table": ..., "row": {...}}``.
+
+    Raises ValueError naming the row when a JSON column cannot be decoded.
+    """
+    tables = resolve_tables(tables)
+    started_at = time.perf_counter()
+    counts = {}
+    connection = data_persistence.get_connection()
+    for table in tables:
+        spec = TRANSFER_TABLES[table]
+        counts[table] = 0
+        for row in _iter_table_rows(connection, table, chunk_size):
+            payload = {
+                column: _decode_json_column(table, row, column) if column in spec["json"] else row[column]
+                for column in spec["columns"]
+            }
+            stream.write(json.dumps({"table": table, "row": payload}, separators=(",", ":")))
+            stream.write("\n")
+            counts[table] += 1
+    return {
+        "tables": counts,
+        "rows": sum(counts.values()),
+        "elapsed_seconds": round(time.perf_counter() - started_at, 4),
+    }
+
+
+def _upsert_sql(table):
+    spec = TRANSFER_TABLES[table]
+    updates = [column for column in spec["columns"] if column not in spec["key"]]
+    return f"""
+        INSERT INTO {table} ({", ".join(spec["columns"])})
+        VALUES ({", ".join("?" for _ in spec["columns"])})
+        ON CONFLICT({", ".join(spec["key"])}) DO UPDATE SET
+            {", ".join(f"{column} = excluded.{column}" for column in updates)}
+    """
+
+
+def _row_params(table, row):
+    spec = TRANSFER_TABLES[table]
+    return tuple(
+        data_persistence.dump_json_column(row.get(column), spec["json"][column])
+        if column in spec["json"]
+        else row.get(column)
+        for column in spec["columns"]
+    )
+
+
+def _write_chunk(connection, chunk, child_tables=()):
+    guid_position = TRANSFER_TABLES["property_records"]["columns"].index("guid")
+    with connection:
+        for table, rows in chunk.items():
+            if table == "property_records" and child_tables:
+                # Exports list records before their children, so this runs before they are inserted.
+                guids = [(row[guid_position],) for row in rows]
+                for child_table in child_tables:
+                    connection.executemany(f"DELETE FROM {child_table} WHERE property_guid = ?", guids)
+            connection.executemany(_upsert_sql(table), rows)
+
+
+def import_rows(stream, tables=None, chunk_size=_DEFAULT_CHUNK_SIZE):
+    """Upsert NDJSON rows from ``export_tables``, committing every ``chunk_size`` rows.
+
+    Child rows of each imported property record are cleared first when their tables are imported too.
+    """
+    allowed = set(resolve_tables(tables))
+    child_tables = [table for table in RECORD_CHILD_TABLES if table in allowed]
+    started_at = time.perf_counter()
+    counts = {}
+    skipped = 0
+    connection = data_persistence.get_connection()
+    chunk = {}
+    pending = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        table = item.get("table")
+        if table not in allowed:
+            skipped += 1
+            continue
+        chunk.setdefault(table, []).append(_row_params(table, item.get("row") or {}))
+        counts[table] = counts.get(table, 0) + 1
+        pending += 1
+        if pending >= chunk_size:
+            _write_chunk(connection, chunk, child_tables)
+            chunk = {}
+            pending = 0
+    if chunk:
+        _write_chunk(connection, chunk, child_tables)
+    return {
+        "tables": counts,
+        "rows": sum(counts.values()),
+        "skipped": skipped,
+        "elapsed_seconds": round(time.perf_counter() - started_at, 4),
+    }
+
+
+def _env_chunk_size():
+    return max(env_int("APP_DB_TRANSFER_CHUNK_SIZE", _DEFAULT_CHUNK_SIZE), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stream property records and caches to or from NDJSON (gzip when the path ends in .gz)."
+    )
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="NDJSON file, *.gz for compressed, or - for stdout/stdin")
+    parser.add_argument(
+        "--tables",
+        nargs="*",
+        default=["all"],
+        help="Table names or groups: records, caches, all",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    chunk_size = max(args.chunk_size or _env_chunk_size(), 1)
+    try:
+        with _open_stream(args.path, "w" if args.command == "export" else "r") as stream:
+            if args.command == "export":
+                report = export_tables(stream, args.tables, chunk_size=chunk_size)
+            else:
+                report = import_rows(stream, args.tables, chunk_size=chunk_size)
+    except ValueError as exc:
+        logger.error("Bulk %s failed: %s", args.command, str(exc))
+        return 1
+    finally:
+        data_persistence.close_connections()
+    logger.info("Bulk %s finished: %s", args.command, report)
+    return 0
+
+
+#python bulk_transfer.py export caches.ndjson.gz --tables caches - to snapshot the caches
+#python bulk_transfer.py import caches.ndjson.gz - to warm a new replica
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_database(tmp_path, monkeypatch):
+    # Tests that import main persist through the default backend; keep them off APP_DB_PATH's default file.
+    monkeypatch.setenv("APP_DB_BACKEND", "sqlite")
+    monkeypatch.setenv("APP_DB_PATH", str(tmp_path / "solar-potential.sqlite3"))
+
+
+@pytest.fixture(autouse=True)
+def sync_upstream_fetches(monkeypatch):
+    # Endpoint tests fake http_client.get; the async prefetch would otherwise reach the real upstreams.
+    monkeypatch.setenv("UPSTREAM_ASYNC_PREFETCH", "false")
@@ -1,23 +1,54 @@
 import json
 import logging
+import atexit
 import os
+import queue
 import sqlite3
-from datetime import datetime, timedelta
-from pathlib import Path
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from env_settings import env_float, env_int
 from garden_crop_catalog_seed import GARDEN_CROP_CATALOG_SEED
+from response_cache import get_bounded_store, get_response_cache
+from storage_backends import DATABASE_ERRORS, backend_from_env
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
-_personal_info_memory = {}
-_browser_data_memory = {}
-_solar_data_memory = {}
-_property_record_memory = {}
-_geocode_cache_memory = {}
+# Memory fallbacks are bounded by APP_MEMORY_STORE_MAX_ENTRIES / APP_MEMORY_STORE_MAX_BYTES.
+_personal_info_memory = get_bounded_store("personal-info")
+_browser_data_memory = get_bounded_store("browser-data")
+_solar_data_memory = get_bounded_store("solar-data")
+_property_record_memory = get_bounded_store("property-records")
+_geocode_cache_memory = get_response_cache("geocode-fallback", persistent=False)
 _garden_crop_catalog_memory = {}
-_property_climate_snapshot_memory = {}
+_property_climate_snapshot_memory = get_bounded_store("property-climate-snapshots")
 _solar_quote_lead_memory = {}
 _UNSET = object()
-_RECENT_CACHE_DAYS = 30
+# Freshness windows for the cache tables, overridable per table through the named env var.
+_CACHE_TABLE_TTLS = {
+    "solar_data": ("APP_SOLAR_DATA_TTL_SECONDS", 30 * 86400),
+    "geocode_cache": ("APP_GEOCODE_CACHE_TTL_SECONDS", 90 * 86400),
+    "property_climate_snapshots": ("APP_PROPERTY_CLIMATE_TTL_SECONDS", 30 * 86400),
+}
+EXPIRING_CACHE_TABLES = tuple(_CACHE_TABLE_TTLS)
+_CACHE_TABLE_KEYS = {
+    "solar_data": "guid",
+    "geocode_cache": "cache_key",
+    "property_climate_snapshots": "coordinate_lookup_key",
+}
+_connection_local = threading.local()
+_connection_pool_lock = threading.Lock()
+_connection_pool = []
+_connection_pool_generation = 0
+_initialized_db_paths = set()
+_backends = {}
 
 
 def _stored_at_value():
@@ -32,13 +63,53 @@ def _reference_data_stored_at_value():
     return datetime.now().isoformat()
 
 
-def _is_recent(date_value):
-    try:
-        return datetime.strptime(date_value, "%Y-%m-%d") > (
-            datetime.now() - timedelta(days=_RECENT_CACHE_DAYS)
+def _stored_at_epoch_value():
+    return int(time.time())
+
+
+def cache_ttl_seconds(table):
+    env_name, default = _CACHE_TABLE_TTLS[table]
+    return max(env_int(env_name, default), 0)
+
+
+def cache_fresh_after(table, now=None):
+    """Oldest stored_at_epoch still served from ``table``."""
+    return int(time.time() if now is None else now) - cache_ttl_seconds(table)
+
+
+def _is_fresh(table, stored_at_epoch):
+    return stored_at_epoch is not None and stored_at_epoch >= cache_fresh_after(table)
+
+
+def purge_expired_cache_rows(table, cutoff=None, batch_size=500, max_batches=200):
+    """Delete rows of a cache table stored before ``cutoff`` in committed batches; returns the count.
+
+    Each batch commits on its own, so concurrent writers are never blocked for long.
+    """
+    if table not in _CACHE_TABLE_KEYS:
+        raise ValueError(f"Unsupported maintenance table: {table}")
+
+    cutoff = cache_fresh_after(table) if cutoff is None else cutoff
+    key_column = _CACHE_TABLE_KEYS[table]
+    connection = _connect()
+    deleted = 0
+    for _ in range(max(max_batches, 1)):
+        cursor = connection.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE {key_column} IN (
+                SELECT {key_column} FROM {table}
+                WHERE stored_at_epoch IS NULL OR stored_at_epoch < ?
+                LIMIT ?
+            )
+            """,
+            (cutoff, batch_size),
         )
-    except (TypeError, ValueError):
-        return False
+        connection.commit()
+        deleted += cursor.rowcount
+        if cursor.rowcount < batch_size:
+            break
+    return deleted
 
 
 def _normalize_address_part(value):
@@ -56,28 +127,94 @@ def build_coordinate_lookup_key(latitude, longitude):
     return f"{round(float(latitude), 6):.6f},{round(float(longitude), 6):.6f}"
 
 
-def _runtime_db_path():
-    raw_path = os.getenv("APP_DB_PATH") or ".runtime/solar-potential.sqlite3"
-    if raw_path == ":memory:":
-        return raw_path
+def _runtime_backend():
+    with _connection_pool_lock:
+        return backend_from_env(_backends)
+
+
+def _ensure_schema(connection, backend):
+    if not backend.shared:
+        _initialize_db(connection, backend)
+        return
+
+    with _connection_pool_lock:
+        if backend.key in _initialized_db_paths:
+            return
+        _initialize_db(connection, backend)
+        _initialized_db_paths.add(backend.key)
+
+
+def _open_connection(backend):
+    connection = backend.open()
+    try:
+        _ensure_schema(connection, backend)
+    except DATABASE_ERRORS:
+        connection.close()
+        raise
+
+    with _connection_pool_lock:
+        _connection_pool.append(connection)
+    return connection
 
-    path = Path(raw_path)
-    if not path.is_absolute():
-        path = Path(__file__).resolve().parent / path
 
-    path.parent.mkdir(parents=True, exist_ok=True)
-    return path
+def _thread_connections():
+    connections = getattr(_connection_local, "connections", None)
+    if connections is None or getattr(_connection_local, "generation", None) != _connection_pool_generation:
+        connections = {}
+        _connection_local.connections = connections
+        _connection_local.generation = _connection_pool_generation
+    return connections
 
 
-def _connect():
-    path = _runtime_db_path()
-    connection = sqlite3.connect(path)
-    connection.row_factory = sqlite3.Row
-    _initialize_db(connection)
+def _connect(backend=None):
+    backend = backend or _runtime_backend()
+    connections = _thread_connections()
+    connection = connections.get(backend.key)
+    if connection is None:
+        connection = _open_connection(backend)
+        connections[backend.key] = connection
     return connection
 
 
-def _initialize_db(connection):
+def get_connection():
+    """Return this thread's pooled connection to the configured database, for maintenance jobs."""
+    return _connect()
+
+
+def get_database_dialect():
+    return _runtime_backend().dialect
+
+
+def close_connections():
+    global _connection_pool_generation
+
+    with _connection_pool_lock:
+        connections = list(_connection_pool)
+        _connection_pool.clear()
+        _initialized_db_paths.clear()
+        _connection_pool_generation += 1
+
+    for connection in connections:
+        try:
+            connection.close()
+        except DATABASE_ERRORS as exc:
+            logger.warning("Unable to close database connection: %s", str(exc))
+
+
+def get_connection_pool_stats():
+    backend = _runtime_backend()
+    with _connection_pool_lock:
+        return {
+            **backend.describe(),
+            "open_connections": len(_connection_pool),
+            "initialized_databases": len(_initialized_db_paths),
+            "generation": _connection_pool_generation,
+        }
+
+
+def _initialize_db(connection, backend):
+    has_solar_quote_index = backend.table_exists(connection, "solar_quotes")
+    has_record_child_tables = backend.table_exists(connection, "property_solar_reports")
     connection.executescript(
         """
         CREATE TABLE IF NOT EXISTS property_records (
@@ -90,12 +227,10 @@ def _initialize_db(connection):
             roof_selection_json TEXT,
             garden_zones_json TEXT NOT NULL,
             saved_solar_reports_json TEXT NOT NULL,
-            stored_at TEXT NOT NULL
+            stored_at TEXT NOT NULL,
+            has_garden_zones INTEGER NOT NULL DEFAULT 0
         );
 
-        CREATE INDEX IF NOT EXISTS idx_property_records_address_lookup_key
-            ON property_records(address_lookup_key);
-
         CREATE TABLE IF NOT EXISTS browser_data (
             guid TEXT NOT NULL,
             browser_data_json TEXT NOT NULL,
@@ -113,18 +248,17 @@ def _initialize_db(connection):
             time_zone TEXT,
             data_source TEXT,
             address_json TEXT,
-            stored_at TEXT NOT NULL
+            stored_at TEXT NOT NULL,
+            stored_at_epoch INTEGER
         );
 
-        CREATE INDEX IF NOT EXISTS idx_solar_data_zip_code
-            ON solar_data(zip_code, stored_at);
-
         CREATE TABLE IF NOT EXISTS geocode_cache (
             cache_key TEXT PRIMARY KEY,
             query_type TEXT NOT NULL,
             source TEXT,
             response_json TEXT NOT NULL,
-            stored_at TEXT NOT NULL
+            stored_at TEXT NOT NULL,
+            stored_at_epoch INTEGER
         );
 
         CREATE INDEX IF NOT EXISTS idx_geocode_cache_query_type
@@ -140,7 +274,8 @@ def _initialize_db(connection):
         CREATE TABLE IF NOT EXISTS property_climate_snapshots (
             coordinate_lookup_key TEXT PRIMARY KEY,
             climate_json TEXT NOT NULL,
-            stored_at TEXT NOT NULL
+            stored_at TEXT NOT NULL,
+            stored_at_epoch INTEGER
         );
 
         CREATE TABLE IF NOT EXISTS solar_quote_leads (
@@ -154,46 +289,296 @@ def _initialize_db(connection):
 
         CREATE INDEX IF NOT EXISTS idx_solar_quote_leads_quote_id
             ON solar_quote_leads(quote_id, stored_at);
+
+        CREATE TABLE IF NOT EXISTS solar_quotes (
+            quote_id TEXT PRIMARY KEY,
+            property_guid TEXT NOT NULL,
+            report_id TEXT NOT NULL,
+            stored_at TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_solar_quotes_property_guid
+            ON solar_quotes(property_guid);
+
+        CREATE TABLE IF NOT EXISTS property_solar_reports (
+            property_guid TEXT NOT NULL,
+            report_key TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            report_json TEXT NOT NULL,
+            PRIMARY KEY (property_guid, report_key)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_property_solar_reports_position
+            ON property_solar_reports(property_guid, position);
+
+        CREATE TABLE IF NOT EXISTS property_garden_zones (
+            property_guid TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            zone_json TEXT NOT NULL,
+            PRIMARY KEY (property_guid, position)
+        );
         """
     )
-    columns = {
-        row["name"]
-        for row in connection.execute("PRAGMA table_info(property_records)").fetchall()
-    }
+    columns = backend.table_columns(connection, "property_records")
     if "property_context_json" not in columns:
         connection.execute("ALTER TABLE property_records ADD COLUMN property_context_json TEXT")
     if "property_climate_json" not in columns:
         connection.execute("ALTER TABLE property_records ADD COLUMN property_climate_json TEXT")
+    _migrate_cache_freshness_columns(connection, backend)
+    if not has_record_child_tables:
+        _migrate_property_record_children(connection)
+    if "has_garden_zones" not in columns:
+        connection.execute(
+            "ALTER TABLE property_records ADD COLUMN has_garden_zones INTEGER NOT NULL DEFAULT 0"
+        )
+    if not has_record_child_tables or "has_garden_zones" not in columns:
+        connection.execute(
+            """
+            UPDATE property_records
+            SET has_garden_zones = 1
+            WHERE guid IN (SELECT DISTINCT property_guid FROM property_garden_zones)
+            """
+        )
+    _create_recency_indexes(connection)
+    if not has_solar_quote_index:
+        _backfill_solar_quotes(connection)
     _seed_garden_crop_catalog(connection)
     connection.commit()
 
 
+def _create_recency_indexes(connection):
+    # Listings and address lookups read newest-first, so each index ends in stored_at and the
+    # planner walks it backwards instead of sorting; guid rides along so guid-only reads never
+    # touch the table.
+    connection.execute("DROP INDEX IF EXISTS idx_property_records_address_lookup_key")
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_property_records_address_recency
+            ON property_records(address_lookup_key, stored_at, guid)
+        """
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_property_records_recency ON property_records(stored_at, guid)"
+    )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_property_records_garden_recency
+            ON property_records(has_garden_zones, stored_at, guid)
+        """
+    )
+
+
+def _migrate_cache_freshness_columns(connection, backend):
+    for table in _CACHE_TABLE_TTLS:
+        if "stored_at_epoch" in backend.table_columns(connection, table):
+            continue
+        connection.execute(f"ALTER TABLE {table} ADD COLUMN stored_at_epoch INTEGER")
+        # Legacy rows only carry a %Y-%m-%d date; both dialects read it as midnight UTC.
+        if backend.dialect == "postgres":
+            epoch = "CAST(EXTRACT(EPOCH FROM (stored_at::timestamp AT TIME ZONE 'UTC')) AS INTEGER)"
+        else:
+            epoch = "CAST(strftime('%s', stored_at) AS INTEGER)"
+        connection.execute(f"UPDATE {table} SET stored_at_epoch = {epoch}")
+    connection.execute("DROP INDEX IF EXISTS idx_solar_data_zip_code")
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_solar_data_zip_code_fresh ON solar_data(zip_code, stored_at_epoch)"
+    )
+    for table in _CACHE_TABLE_TTLS:
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_stored_at_epoch ON {table}(stored_at_epoch)"
+        )
+
+
 def _json_dump(value):
     return json.dumps(value) if value is not None else None
 
 
+# Encoded blobs start with a magic prefix, a format version and a codec id; plain JSON text
+# rows written before APP_DB_BLOB_CODEC was enabled are read unchanged.
+_BLOB_MAGIC = b"SPB"
+_BLOB_FORMAT_VERSION = 1
+_BLOB_CODEC_IDS = {"zlib": b"z", "zstd": b"s"}
+_BLOB_CODECS_BY_ID = {codec_id: codec for codec, codec_id in _BLOB_CODEC_IDS.items()}
+_DEFAULT_BLOB_MIN_BYTES = 512
+
+
+def _blob_codec():
+    codec = (os.getenv("APP_DB_BLOB_CODEC") or "").strip().lower()
+    if codec == "zstd" and zstandard is None:
+        return "zlib"
+    return codec if codec in _BLOB_CODEC_IDS else None
+
+
+def _blob_min_bytes():
+    return env_int("APP_DB_BLOB_MIN_BYTES", _DEFAULT_BLOB_MIN_BYTES)
+
+
+def _encode_blob(text):
+    codec = _blob_codec()
+    if codec is None or len(text) < _blob_min_bytes() or not _runtime_backend().stores_binary_in_text_columns:
+        return text
+
+    raw = text.encode("utf-8")
+    if codec == "zstd":
+        payload = zstandard.ZstdCompressor().compress(raw)
+    else:
+        payload = zlib.compress(raw, 6)
+    return _BLOB_MAGIC + bytes((_BLOB_FORMAT_VERSION,)) + _BLOB_CODEC_IDS[codec] + payload
+
+
+def _decode_blob(value):
+    value = bytes(value)
+    header_size = len(_BLOB_MAGIC) + 2
+    if not value.startswith(_BLOB_MAGIC) or len(value) < header_size:
+        return value.decode("utf-8")
+    if value[len(_BLOB_MAGIC)] != _BLOB_FORMAT_VERSION:
+        raise ValueError(f"Unsupported blob format version {value[len(_BLOB_MAGIC)]}")
+
+    codec = _BLOB_CODECS_BY_ID.get(value[len(_BLOB_MAGIC) + 1:header_size])
+    payload = value[header_size:]
+    if codec == "zlib":
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    raise ValueError(f"Unsupported blob codec {codec or 'unknown'}")
+
+
+def _json_dump_blob(value):
+    """Serialize a large JSON column, compressing it when APP_DB_BLOB_CODEC is set."""
+    return _encode_blob(json.dumps(value)) if value is not None else None
+
+
+def dump_json_column(value, compressible=False):
+    """Serialize a value for a JSON column; ``compressible`` columns honour APP_DB_BLOB_CODEC."""
+    return _json_dump_blob(value) if compressible else _json_dump(value)
+
+
+def load_json_column(value):
+    """Decode a stored JSON column, plain or encoded; raises ValueError when it is unreadable."""
+    if value in (None, "", b""):
+        return None
+    try:
+        if isinstance(value, (bytes, memoryview)):
+            value = _decode_blob(value)
+        return json.loads(value)
+    except zlib.error as exc:
+        raise ValueError(str(exc)) from exc
+
+
 def _json_load(value, default=None):
-    if value in (None, ""):
+    if value in (None, "", b""):
         return default
 
     try:
+        if isinstance(value, (bytes, memoryview)):
+            value = _decode_blob(value)
         return json.loads(value)
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, UnicodeDecodeError, ValueError, zlib.error) as exc:
+        if not isinstance(exc, json.JSONDecodeError):
+            logger.warning("Stored blob could not be decoded: %s", str(exc))
         return default
 
 
-def _build_property_record_from_row(row):
-    return {
-        "guid": row["guid"],
-        "address": _json_load(row["address_json"], default={}) or {},
-        "property_preview": _json_load(row["property_preview_json"]),
-        "property_context": _json_load(row["property_context_json"]),
-        "property_climate": _json_load(row["property_climate_json"]),
-        "roof_selection": _json_load(row["roof_selection_json"]),
-        "stored_at": row["stored_at"],
-        "garden_zones": _json_load(row["garden_zones_json"], default=[]) or [],
-        "saved_solar_reports": _json_load(row["saved_solar_reports_json"], default=[]) or [],
+_PROPERTY_RECORD_FIELD_COLUMNS = {
+    "address": "address_json",
+    "property_preview": "property_preview_json",
+    "property_context": "property_context_json",
+    "property_climate": "property_climate_json",
+    "roof_selection": "roof_selection_json",
+    "stored_at": "stored_at",
+    "garden_zones": None,
+    "saved_solar_reports": None,
+}
+PROPERTY_RECORD_FIELDS = tuple(_PROPERTY_RECORD_FIELD_COLUMNS)
+
+
+def _normalize_record_fields(fields):
+    if fields is None:
+        return PROPERTY_RECORD_FIELDS
+    unknown_fields = set(fields) - set(PROPERTY_RECORD_FIELDS)
+    if unknown_fields:
+        raise ValueError(f"Unknown property record fields: {', '.join(sorted(unknown_fields))}")
+    return tuple(field for field in PROPERTY_RECORD_FIELDS if field in fields)
+
+
+def _property_record_select_columns(fields):
+    columns = [_PROPERTY_RECORD_FIELD_COLUMNS[field] for field in fields if _PROPERTY_RECORD_FIELD_COLUMNS[field]]
+    return ", ".join(["guid", *columns])
+
+
+def _project_property_record(record, fields):
+    if record is None or fields == PROPERTY_RECORD_FIELDS:
+        return record
+    return {"guid": record.get("guid"), **{field: record.get(field) for field in fields}}
+
+
+def _build_property_record_from_row(
+    row,
+    garden_zones=None,
+    saved_solar_reports=None,
+    fields=PROPERTY_RECORD_FIELDS,
+):
+    decoders = {
+        "address": lambda: _json_load(row["address_json"], default={}) or {},
+        "property_preview": lambda: _json_load(row["property_preview_json"]),
+        "property_context": lambda: _json_load(row["property_context_json"]),
+        "property_climate": lambda: _json_load(row["property_climate_json"]),
+        "roof_selection": lambda: _json_load(row["roof_selection_json"]),
+        "stored_at": lambda: row["stored_at"],
+        "garden_zones": lambda: garden_zones or [],
+        "saved_solar_reports": lambda: saved_solar_reports or [],
     }
+    # Only the requested blobs are decoded; projected reads skip the rest entirely.
+    return {"guid": row["guid"], **{field: decoders[field]() for field in fields}}
+
+
+def _chunked(values, size=500):
+    for index in range(0, len(values), size):
+        yield values[index:index + size]
+
+
+def _load_record_children(connection, guids):
+    garden_zones = {guid: [] for guid in guids}
+    saved_solar_reports = {guid: [] for guid in guids}
+    for chunk in _chunked(list(garden_zones)):
+        placeholders = ", ".join("?" for _ in chunk)
+        for row in connection.execute(
+            f"""
+            SELECT property_guid, zone_json
+            FROM property_garden_zones
+            WHERE property_guid IN ({placeholders})
+            ORDER BY property_guid, position
+            """,
+            chunk,
+        ):
+            garden_zones[row["property_guid"]].append(_json_load(row["zone_json"], default={}))
+        for row in connection.execute(
+            f"""
+            SELECT property_guid, report_json
+            FROM property_solar_reports
+            WHERE property_guid IN ({placeholders})
+            ORDER BY property_guid, position
+            """,
+            chunk,
+        ):
+            saved_solar_reports[row["property_guid"]].append(_json_load(row["report_json"], default={}))
+    return garden_zones, saved_solar_reports
+
+
+def _read_property_records(connection, rows, fields=PROPERTY_RECORD_FIELDS):
+    if "garden_zones" in fields or "saved_solar_reports" in fields:
+        garden_zones, saved_solar_reports = _load_record_children(connection, [row["guid"] for row in rows])
+    else:
+        garden_zones, saved_solar_reports = {}, {}
+    return [
+        _build_property_record_from_row(
+            row,
+            garden_zones.get(row["guid"]),
+            saved_solar_reports.get(row["guid"]),
+            fields=fields,
+        )
+        for row in rows
+    ]
 
 
 def _remember_property_record(record):
@@ -201,7 +586,7 @@ def _remember_property_record(record):
     if not guid:
         return
 
-    _property_record_memory.pop(guid, None)
+    # Writes move the guid to the end, so listings see the most recently stored records last.
     _property_record_memory[guid] = record
 
 
@@ -319,74 +704,335 @@ def _seed_garden_crop_catalog(connection):
     _write_garden_crop_catalog(connection, seed_payload)
 
 
+def _iter_report_quotes(saved_solar_reports):
+    for report in saved_solar_reports or []:
+        quote = (report or {}).get("homeowner_quote") or {}
+        if quote.get("id") and report.get("id"):
+            yield quote["id"], report["id"]
+
+
+def _write_solar_quotes(connection, guid, saved_solar_reports, stored_at):
+    connection.execute("DELETE FROM solar_quotes WHERE property_guid = ?", (guid,))
+    connection.executemany(
+        """
+        INSERT INTO solar_quotes (quote_id, property_guid, report_id, stored_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(quote_id) DO UPDATE SET
+            property_guid = excluded.property_guid,
+            report_id = excluded.report_id,
+            stored_at = excluded.stored_at
+        """,
+        [
+            (quote_id, guid, report_id, stored_at)
+            for quote_id, report_id in _iter_report_quotes(saved_solar_reports)
+        ],
+    )
+
+
+def _backfill_solar_quotes(connection):
+    rows = connection.execute(
+        """
+        SELECT guid, stored_at
+        FROM property_records
+        ORDER BY stored_at ASC
+        """
+    ).fetchall()
+    _, saved_solar_reports = _load_record_children(connection, [row["guid"] for row in rows])
+    for row in rows:
+        _write_solar_quotes(
+            connection,
+            row["guid"],
+            saved_solar_reports.get(row["guid"]) or [],
+            row["stored_at"],
+        )
+
+
+def _keyed_solar_reports(saved_solar_reports):
+    keyed_reports = []
+    seen_keys = set()
+    for position, report in enumerate(saved_solar_reports or []):
+        report_key = str((report or {}).get("id") or "")
+        if not report_key or report_key in seen_keys:
+            report_key = f"position-{position}"
+        seen_keys.add(report_key)
+        keyed_reports.append((report_key, report))
+    return keyed_reports
+
+
+def _write_solar_reports(connection, guid, saved_solar_reports, existing_by_key=None):
+    existing_by_key = existing_by_key or {}
+    rows_to_write = []
+    positions_to_move = []
+    current_keys = set()
+    for position, (report_key, report) in enumerate(_keyed_solar_reports(saved_solar_reports)):
+        current_keys.add(report_key)
+        previous = existing_by_key.get(report_key)
+        if previous is None or previous[1] != report:
+            rows_to_write.append((guid, report_key, position, _json_dump_blob(report)))
+        elif previous[0] != position:
+            positions_to_move.append((position, guid, report_key))
+    removed_keys = [(guid, report_key) for report_key in existing_by_key if report_key not in current_keys]
+
+    if removed_keys:
+        connection.executemany(
+            "DELETE FROM property_solar_reports WHERE property_guid = ? AND report_key = ?",
+            removed_keys,
+        )
+    if positions_to_move:
+        connection.executemany(
+            "UPDATE property_solar_reports SET position = ? WHERE property_guid = ? AND report_key = ?",
+            positions_to_move,
+        )
+    if rows_to_write:
+        connection.executemany(
+            """
+            INSERT INTO property_solar_reports (property_guid, report_key, position, report_json)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(property_guid, report_key) DO UPDATE SET
+                position = excluded.position,
+                report_json = excluded.report_json
+            """,
+            rows_to_write,
+        )
+    return bool(removed_keys or positions_to_move or rows_to_write)
+
+
+def _write_garden_zones(connection, guid, garden_zones, existing_zones=None):
+    garden_zones = garden_zones or []
+    existing_zones = existing_zones or []
+    rows_to_write = [
+        (guid, position, json.dumps(zone))
+        for position, zone in enumerate(garden_zones)
+        if position >= len(existing_zones) or existing_zones[position] != zone
+    ]
+    if rows_to_write:
+        connection.executemany(
+            """
+            INSERT INTO property_garden_zones (property_guid, position, zone_json)
+            VALUES (?, ?, ?)
+            ON CONFLICT(property_guid, position) DO UPDATE SET
+                zone_json = excluded.zone_json
+            """,
+            rows_to_write,
+        )
+    removed = 0
+    if len(existing_zones) > len(garden_zones):
+        removed = connection.execute(
+            "DELETE FROM property_garden_zones WHERE property_guid = ? AND position >= ?",
+            (guid, len(garden_zones)),
+        ).rowcount
+    return bool(rows_to_write) or removed > 0
+
+
+def _begin_property_record_write(connection, guid):
+    # The child-row diff must see the rows this transaction will overwrite, so take the write
+    # lock before reading them: a concurrent writer then waits instead of being overwritten.
+    if isinstance(connection, sqlite3.Connection):
+        if not connection.in_transaction:
+            connection.execute("BEGIN IMMEDIATE")
+    else:
+        connection.execute("SELECT guid FROM property_records WHERE guid = ? FOR UPDATE", (guid,))
+
+
+def _stored_record_children(connection, guid):
+    garden_zones = [
+        _json_load(row["zone_json"], default={})
+        for row in connection.execute(
+            "SELECT zone_json FROM property_garden_zones WHERE property_guid = ? ORDER BY position",
+            (guid,),
+        )
+    ]
+    saved_solar_reports = {
+        row["report_key"]: (row["position"], _json_load(row["report_json"], default={}))
+        for row in connection.execute(
+            """
+            SELECT report_key, position, report_json
+            FROM property_solar_reports
+            WHERE property_guid = ?
+            """,
+            (guid,),
+        )
+    }
+    return garden_zones, saved_solar_reports
+
+
+def _migrate_property_record_children(connection):
+    rows = connection.execute(
+        """
+        SELECT guid, garden_zones_json, saved_solar_reports_json
+        FROM property_records
+        WHERE garden_zones_json != '[]' OR saved_solar_reports_json != '[]'
+        """
+    ).fetchall()
+    for row in rows:
+        _write_garden_zones(connection, row["guid"], _json_load(row["garden_zones_json"], default=[]) or [])
+        _write_solar_reports(
+            connection,
+            row["guid"],
+            _json_load(row["saved_solar_reports_json"], default=[]) or [],
+        )
+    # The legacy JSON columns are left as they were so a rollback to the previous release still
+    # reads its data; they are no longer written and can be cleared once that window has passed.
+
+
+def _find_quote_in_record(record, quote_id):
+    for report in record.get("saved_solar_reports", []):
+        quote = report.get("homeowner_quote")
+        if quote and quote.get("id") == quote_id:
+            return {
+                "record": record,
+                "report": report,
+                "quote": quote,
+            }
+
+    return None
+
+
+_PROPERTY_RECORD_JSON_COLUMNS = (
+    ("property_preview", "property_preview_json"),
+    ("property_context", "property_context_json"),
+    ("property_climate", "property_climate_json"),
+    ("roof_selection", "roof_selection_json"),
+)
+_PROPERTY_RECORD_BLOB_COLUMNS = {"property_context_json", "property_climate_json"}
+
+
+def _changed_property_record_columns(existing_record, values):
+    assignments = {}
+    if (existing_record.get("address") or {}) != values["address"]:
+        assignments["address_lookup_key"] = build_address_lookup_key(values["address"])
+        assignments["address_json"] = json.dumps(values["address"])
+    for field, column in _PROPERTY_RECORD_JSON_COLUMNS:
+        if existing_record.get(field) != values[field]:
+            serialize = _json_dump_blob if column in _PROPERTY_RECORD_BLOB_COLUMNS else _json_dump
+            assignments[column] = serialize(values[field])
+    return assignments
+
+
+def _read_locked_property_record(connection, guid):
+    # Read after _begin_property_record_write so the diff sees what this transaction overwrites,
+    # not what the caller saw before another writer committed.
+    fields = tuple(field for field in PROPERTY_RECORD_FIELDS if _PROPERTY_RECORD_FIELD_COLUMNS[field])
+    row = connection.execute(
+        f"SELECT {_property_record_select_columns(fields)} FROM property_records WHERE guid = ?",
+        (guid,),
+    ).fetchone()
+    if not row:
+        return None, [], {}
+    existing_zones, existing_reports = _stored_record_children(connection, guid)
+    record = _build_property_record_from_row(
+        row,
+        existing_zones,
+        [report for _, report in sorted(existing_reports.values(), key=lambda item: item[0])],
+    )
+    return record, existing_zones, existing_reports
+
+
 def _write_property_record(
     connection,
     guid,
     address,
-    property_preview,
-    property_context,
-    property_climate,
-    roof_selection,
-    garden_zones,
-    saved_solar_reports,
+    property_preview=_UNSET,
+    property_context=_UNSET,
+    property_climate=_UNSET,
+    roof_selection=_UNSET,
+    garden_zones=_UNSET,
+    saved_solar_reports=_UNSET,
 ):
+    """Write a property record; fields left as _UNSET keep the value stored when the lock is taken."""
     stored_at = _property_record_stored_at_value()
-    connection.execute(
-        """
-        INSERT INTO property_records (
-            guid,
-            address_lookup_key,
-            address_json,
-            property_preview_json,
-            property_context_json,
-            property_climate_json,
-            roof_selection_json,
-            garden_zones_json,
-            saved_solar_reports_json,
-            stored_at
+    _begin_property_record_write(connection, guid)
+    existing_record, existing_zones, existing_reports = _read_locked_property_record(connection, guid)
+    # A record only held in memory while the database was down is carried over on its first write.
+    kept = existing_record or _property_record_memory.get(guid) or {}
+
+    def _resolve(field, value):
+        return kept.get(field) if value is _UNSET else value
+
+    garden_zones = _resolve("garden_zones", garden_zones) or []
+    saved_solar_reports = _resolve("saved_solar_reports", saved_solar_reports) or []
+    values = {
+        "address": dict(address),
+        "property_preview": _resolve("property_preview", property_preview),
+        "property_context": _resolve("property_context", property_context),
+        "property_climate": _resolve("property_climate", property_climate),
+        "roof_selection": _resolve("roof_selection", roof_selection),
+    }
+
+    updated = False
+    if existing_record:
+        # Only columns whose decoded value changed are re-serialized and written.
+        assignments = _changed_property_record_columns(existing_record, values)
+        if bool(existing_record.get("garden_zones")) != bool(garden_zones):
+            assignments["has_garden_zones"] = 1 if garden_zones else 0
+        assignments["stored_at"] = stored_at
+        cursor = connection.execute(
+            f"""
+            UPDATE property_records
+            SET {", ".join(f"{column} = ?" for column in assignments)}
+            WHERE guid = ?
+            """,
+            [*assignments.values(), guid],
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(guid) DO UPDATE SET
-            address_lookup_key = excluded.address_lookup_key,
-            address_json = excluded.address_json,
-            property_preview_json = excluded.property_preview_json,
-            property_context_json = excluded.property_context_json,
-            property_climate_json = excluded.property_climate_json,
-            roof_selection_json = excluded.roof_selection_json,
-            garden_zones_json = excluded.garden_zones_json,
-            saved_solar_reports_json = excluded.saved_solar_reports_json,
-            stored_at = excluded.stored_at
-        """,
-        (
-            guid,
-            build_address_lookup_key(address),
-            json.dumps(address),
-            _json_dump(property_preview),
-            _json_dump(property_context),
-            _json_dump(property_climate),
-            _json_dump(roof_selection),
-            json.dumps(garden_zones or []),
-            json.dumps(saved_solar_reports or []),
-            stored_at,
-        ),
-    )
+        updated = cursor.rowcount > 0
+
+    if not updated:
+        existing_zones, existing_reports = [], {}
+        connection.execute(
+            """
+            INSERT INTO property_records (
+                guid,
+                address_lookup_key,
+                address_json,
+                property_preview_json,
+                property_context_json,
+                property_climate_json,
+                roof_selection_json,
+                garden_zones_json,
+                saved_solar_reports_json,
+                stored_at,
+                has_garden_zones
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, '[]', '[]', ?, ?)
+            ON CONFLICT(guid) DO UPDATE SET
+                address_lookup_key = excluded.address_lookup_key,
+                address_json = excluded.address_json,
+                property_preview_json = excluded.property_preview_json,
+                property_context_json = excluded.property_context_json,
+                property_climate_json = excluded.property_climate_json,
+                roof_selection_json = excluded.roof_selection_json,
+                stored_at = excluded.stored_at,
+                has_garden_zones = excluded.has_garden_zones
+            """,
+            (
+                guid,
+                build_address_lookup_key(address),
+                json.dumps(address),
+                _json_dump(values["property_preview"]),
+                _json_dump_blob(values["property_context"]),
+                _json_dump_blob(values["property_climate"]),
+                _json_dump(values["roof_selection"]),
+                stored_at,
+                1 if garden_zones else 0,
+            ),
+        )
+        connection.execute("DELETE FROM property_garden_zones WHERE property_guid = ?", (guid,))
+        connection.execute("DELETE FROM property_solar_reports WHERE property_guid = ?", (guid,))
+
+    _write_garden_zones(connection, guid, garden_zones, existing_zones)
+    if _write_solar_reports(connection, guid, saved_solar_reports, existing_reports):
+        _write_solar_quotes(connection, guid, saved_solar_reports, stored_at)
     connection.commit()
 
     _personal_info_memory[guid] = dict(address)
-    _remember_property_record({
-        "guid": guid,
-        "address": dict(address),
-        "property_preview": property_preview,
-        "property_context": property_context,
-        "property_climate": property_climate,
-        "roof_selection": roof_selection,
-        "garden_zones": garden_zones or [],
-        "saved_solar_reports": saved_solar_reports or [],
-        "stored_at": stored_at,
-    })
+    # The memory copy only serves reads while the database is unavailable; sizing a full mirror
+    # after every committed write cost a json.dumps of the whole record. Drop the now stale copy.
+    _property_record_memory.pop(guid, None)
 
 
 def reset_memory_storage():
+    with _write_behind_flush_lock:
+        _release_write_behind_keys(_drain_write_behind_queue())
     _personal_info_memory.clear()
     _browser_data_memory.clear()
     _solar_data_memory.clear()
@@ -405,71 +1051,77 @@ def reset_memory_storage():
             connection.execute("DELETE FROM garden_crop_catalogs")
             connection.execute("DELETE FROM property_climate_snapshots")
             connection.execute("DELETE FROM solar_quote_leads")
+            connection.execute("DELETE FROM solar_quotes")
+            connection.execute("DELETE FROM property_solar_reports")
+            connection.execute("DELETE FROM property_garden_zones")
+            _seed_garden_crop_catalog(connection)
             connection.commit()
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Unable to reset SQLite persistence: %s", str(exc))
 
 
-def get_property_record(guid):
+def get_property_record(guid, fields=None):
+    fields = _normalize_record_fields(fields)
     try:
         with _connect() as connection:
             row = connection.execute(
-                "SELECT * FROM property_records WHERE guid = ?",
+                f"SELECT {_property_record_select_columns(fields)} FROM property_records WHERE guid = ?",
                 (guid,),
             ).fetchone()
-        if row:
-            return _build_property_record_from_row(row)
-    except sqlite3.Error as exc:
+            if row:
+                return _read_property_records(connection, [row], fields)[0]
+    except DATABASE_ERRORS as exc:
         logger.warning("Property lookup fell back to memory: %s", str(exc))
 
-    return _property_record_memory.get(guid)
+    return _project_property_record(_property_record_memory.get(guid), fields)
 
 
-def find_property_record_by_address(address):
+def find_property_record_by_address(address, fields=None):
     lookup_key = build_address_lookup_key(address)
     if not lookup_key:
         return None
 
+    fields = _normalize_record_fields(fields)
     try:
         with _connect() as connection:
             row = connection.execute(
-                """
-                SELECT * FROM property_records
+                f"""
+                SELECT {_property_record_select_columns(fields)} FROM property_records
                 WHERE address_lookup_key = ?
                 ORDER BY stored_at DESC
                 LIMIT 1
                 """,
                 (lookup_key,),
             ).fetchone()
-        if row:
-            return _build_property_record_from_row(row)
-    except sqlite3.Error as exc:
+            if row:
+                return _read_property_records(connection, [row], fields)[0]
+    except DATABASE_ERRORS as exc:
         logger.warning("Property address lookup fell back to memory: %s", str(exc))
 
     records = list(_property_record_memory.values())
     for record in reversed(records):
         if build_address_lookup_key(record.get("address", {})) == lookup_key:
-            return record
+            return _project_property_record(record, fields)
 
     return None
 
 
-def list_property_records(limit=8, require_garden_zones=False):
+def list_property_records(limit=8, require_garden_zones=False, fields=None):
     try:
         normalized_limit = max(1, int(limit or 8))
     except (TypeError, ValueError):
         normalized_limit = 8
 
+    fields = _normalize_record_fields(fields)
     try:
         with _connect() as connection:
-            query = """
-                SELECT * FROM property_records
+            query = f"""
+                SELECT {_property_record_select_columns(fields)} FROM property_records
             """
             parameters = []
             if require_garden_zones:
                 query += """
-                WHERE garden_zones_json IS NOT NULL
-                  AND garden_zones_json != '[]'
+                WHERE has_garden_zones = 1
                 """
             query += """
                 ORDER BY stored_at DESC
@@ -477,15 +1129,15 @@ def list_property_records(limit=8, require_garden_zones=False):
             """
             parameters.append(normalized_limit)
             rows = connection.execute(query, parameters).fetchall()
-        return [_build_property_record_from_row(row) for row in rows]
-    except sqlite3.Error as exc:
+            return _read_property_records(connection, rows, fields)
+    except DATABASE_ERRORS as exc:
         logger.warning("Property listing fell back to memory: %s", str(exc))
 
     records = list(_property_record_memory.values())
     if require_garden_zones:
         records = [record for record in records if record.get("garden_zones")]
 
-    return list(reversed(records))[:normalized_limit]
+    return [_project_property_record(record, fields) for record in list(reversed(records))[:normalized_limit]]
 
 
 def get_garden_crop_catalog(catalog_id="default"):
@@ -504,7 +1156,7 @@ def get_garden_crop_catalog(catalog_id="default"):
             if payload:
                 _remember_garden_crop_catalog(payload)
                 return payload
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Garden crop catalog lookup fell back to memory: %s", str(exc))
 
     payload = _garden_crop_catalog_memory.get(catalog_id)
@@ -540,7 +1192,7 @@ def list_solar_quote_leads(quote_id):
             for payload in payloads:
                 _remember_solar_quote_lead(payload)
             return payloads
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Quote lead lookup fell back to memory: %s", str(exc))
 
     return list(_solar_quote_lead_memory.get(quote_id, []))
@@ -555,7 +1207,7 @@ def store_solar_quote_lead(payload):
             _write_solar_quote_lead(connection, payload)
             connection.commit()
         return
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Quote lead persistence fell back to memory: %s", str(exc))
 
     _remember_solar_quote_lead(payload)
@@ -567,54 +1219,41 @@ def find_solar_quote(quote_id):
 
     try:
         with _connect() as connection:
-            rows = connection.execute(
-                "SELECT * FROM property_records ORDER BY stored_at DESC"
-            ).fetchall()
-        for row in rows:
-            record = _build_property_record_from_row(row)
-            for report in record.get("saved_solar_reports", []):
-                quote = report.get("homeowner_quote")
-                if quote and quote.get("id") == quote_id:
-                    return {
-                        "record": record,
-                        "report": report,
-                        "quote": quote,
-                    }
-    except sqlite3.Error as exc:
+            row = connection.execute(
+                """
+                SELECT property_records.*
+                FROM solar_quotes
+                JOIN property_records ON property_records.guid = solar_quotes.property_guid
+                WHERE solar_quotes.quote_id = ?
+                """,
+                (quote_id,),
+            ).fetchone()
+            record = _read_property_records(connection, [row])[0] if row else None
+        if record:
+            match = _find_quote_in_record(record, quote_id)
+            if match:
+                return match
+    except DATABASE_ERRORS as exc:
         logger.warning("Quote lookup fell back to memory: %s", str(exc))
 
     for record in reversed(list(_property_record_memory.values())):
-        for report in record.get("saved_solar_reports", []):
-            quote = report.get("homeowner_quote")
-            if quote and quote.get("id") == quote_id:
-                return {
-                    "record": record,
-                    "report": report,
-                    "quote": quote,
-                }
+        match = _find_quote_in_record(record, quote_id)
+        if match:
+            return match
 
     return None
 
 
 def store_personal_info(guid, address):
-    existing_record = get_property_record(guid) or {}
     try:
         with _connect() as connection:
-            _write_property_record(
-                connection,
-                guid,
-                address,
-                existing_record.get("property_preview"),
-                existing_record.get("property_context"),
-                existing_record.get("property_climate"),
-                existing_record.get("roof_selection"),
-                existing_record.get("garden_zones") or [],
-                existing_record.get("saved_solar_reports") or [],
-            )
+            # Every other field keeps whatever is stored once the write lock is held.
+            _write_property_record(connection, guid, address)
         return
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Storing address fell back to memory: %s", str(exc))
 
+    existing_record = get_property_record(guid) or {}
     stored_at = _property_record_stored_at_value()
     _personal_info_memory[guid] = dict(address)
     _remember_property_record({
@@ -640,130 +1279,317 @@ def upsert_property_record(
     garden_zones=_UNSET,
     saved_solar_reports=_UNSET,
 ):
-    existing_record = get_property_record(guid) or {}
-    if property_context is _UNSET:
-        property_context_to_store = existing_record.get("property_context")
-    else:
-        property_context_to_store = property_context
-    if property_climate is _UNSET:
-        property_climate_to_store = existing_record.get("property_climate")
-    else:
-        property_climate_to_store = property_climate
-    if garden_zones is _UNSET:
-        garden_zones_to_store = existing_record.get("garden_zones") or []
-    else:
-        garden_zones_to_store = garden_zones or []
-
-    if saved_solar_reports is _UNSET:
-        saved_solar_reports_to_store = existing_record.get("saved_solar_reports") or []
-    else:
-        saved_solar_reports_to_store = saved_solar_reports or []
-
     try:
         with _connect() as connection:
+            # _UNSET fields are resolved against the row read inside the write transaction.
             _write_property_record(
                 connection,
                 guid,
                 address,
                 property_preview,
-                property_context_to_store,
-                property_climate_to_store,
+                property_context,
+                property_climate,
                 roof_selection,
-                garden_zones_to_store,
-                saved_solar_reports_to_store,
+                garden_zones,
+                saved_solar_reports,
             )
         return
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Property upsert fell back to memory: %s", str(exc))
 
+    existing_record = get_property_record(guid) or {}
+
+    def _kept(field, value):
+        return existing_record.get(field) if value is _UNSET else value
+
     stored_at = _property_record_stored_at_value()
     _personal_info_memory[guid] = dict(address)
     _remember_property_record({
         "guid": guid,
         "address": dict(address),
         "property_preview": property_preview,
-        "property_context": property_context_to_store,
-        "property_climate": property_climate_to_store,
+        "property_context": _kept("property_context", property_context),
+        "property_climate": _kept("property_climate", property_climate),
         "roof_selection": roof_selection,
-        "garden_zones": garden_zones_to_store,
-        "saved_solar_reports": saved_solar_reports_to_store,
+        "garden_zones": _kept("garden_zones", garden_zones) or [],
+        "saved_solar_reports": _kept("saved_solar_reports", saved_solar_reports) or [],
         "stored_at": stored_at,
     })
 
 
-def store_browser_data(guid, browser_data, ip_address):
+_BROWSER_DATA_INSERT_SQL = """
+    INSERT INTO browser_data (guid, browser_data_json, ip_address, stored_at)
+    VALUES (?, ?, ?, ?)
+"""
+_SOLAR_DATA_UPSERT_SQL = """
+    INSERT INTO solar_data (
+        guid,
+        zip_code,
+        solar_data_json,
+        time_zone,
+        data_source,
+        address_json,
+        stored_at,
+        stored_at_epoch
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(guid) DO UPDATE SET
+        zip_code = excluded.zip_code,
+        solar_data_json = excluded.solar_data_json,
+        time_zone = excluded.time_zone,
+        data_source = excluded.data_source,
+        address_json = excluded.address_json,
+        stored_at = excluded.stored_at,
+        stored_at_epoch = excluded.stored_at_epoch
+"""
+_DEFAULT_WRITE_BEHIND_FLUSH_SECONDS = 0.25
+_DEFAULT_WRITE_BEHIND_MAX_BATCH = 500
+_DEFAULT_WRITE_BEHIND_MAX_QUEUE = 10000
+_write_behind_queue = queue.Queue()
+_write_behind_pending = threading.Event()
+_write_behind_flush_lock = threading.Lock()
+_write_behind_thread = None
+_write_behind_thread_lock = threading.Lock()
+_write_behind_stats_lock = threading.Lock()
+# Lookup keys of rows queued or mid-flush, so readers only flush when their row is still pending.
+_write_behind_keys = Counter()
+_write_behind_keys_lock = threading.Lock()
+_write_behind_stats = {
+    "enqueued": 0,
+    "rows_written": 0,
+    "batches": 0,
+    "last_batch_size": 0,
+    "max_queue_depth": 0,
+    "sync_writes": 0,
+    "memory_fallbacks": 0,
+}
+
+
+def _count_write_behind(name, amount=1):
+    with _write_behind_stats_lock:
+        _write_behind_stats[name] += amount
+
+
+def _write_behind_enabled():
+    return (os.getenv("APP_DB_WRITE_BEHIND") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _remember_browser_data(guid, browser_data, ip_address, stored_at):
+    _browser_data_memory[guid] = {
+        **browser_data,
+        "ipAddress": ip_address,
+        "storedAt": stored_at,
+    }
+
+
+def _remember_solar_data(guid, solar_data, time_zone, address, data_source, stored_at, stored_at_epoch):
+    _solar_data_memory[guid] = {
+        "solar_data": dict(solar_data),
+        "time_zone": time_zone,
+        "address": dict(address),
+        "data_source": data_source,
+        "stored_at": stored_at,
+        "stored_at_epoch": stored_at_epoch,
+    }
+
+
+_WRITE_BEHIND_KINDS = {
+    "browser_data": (_BROWSER_DATA_INSERT_SQL, _remember_browser_data),
+    "solar_data": (_SOLAR_DATA_UPSERT_SQL, _remember_solar_data),
+}
+
+
+def _write_behind_batch(items):
+    # Items are (backend, kind, params, fallback_args, lookup_keys); each database gets one transaction.
+    by_backend = {}
+    for backend, kind, params, fallback_args, _ in items:
+        by_backend.setdefault(backend.key, (backend, []))[1].append((kind, params, fallback_args))
+
+    for backend, path_items in by_backend.values():
+        try:
+            connection = _connect(backend)
+            with connection:
+                for kind in _WRITE_BEHIND_KINDS:
+                    rows = [params for item_kind, params, _ in path_items if item_kind == kind]
+                    if rows:
+                        connection.executemany(_WRITE_BEHIND_KINDS[kind][0], rows)
+            _count_write_behind("rows_written", len(path_items))
+        except DATABASE_ERRORS as exc:
+            logger.warning("Write-behind batch fell back to memory: %s", str(exc))
+            _count_write_behind("memory_fallbacks", len(path_items))
+            for kind, _, fallback_args in path_items:
+                _WRITE_BEHIND_KINDS[kind][1](*fallback_args)
+    with _write_behind_stats_lock:
+        _write_behind_stats["batches"] += 1
+        _write_behind_stats["last_batch_size"] = len(items)
+
+
+def _drain_write_behind_queue(limit=None):
+    items = []
+    while limit is None or len(items) < limit:
+        try:
+            items.append(_write_behind_queue.get_nowait())
+        except queue.Empty:
+            break
+    return items
+
+
+def _release_write_behind_keys(items):
+    # Called once the rows are written (or discarded), never at drain time, so a reader that
+    # misses its key in the counter is guaranteed to find the row in the database.
+    with _write_behind_keys_lock:
+        for *_, lookup_keys in items:
+            _write_behind_keys.subtract(lookup_keys)
+        for key in [key for key, count in _write_behind_keys.items() if count <= 0]:
+            del _write_behind_keys[key]
+
+
+def _is_write_behind_pending(lookup_key):
+    with _write_behind_keys_lock:
+        return _write_behind_keys.get(lookup_key, 0) > 0
+
+
+def flush_write_behind():
+    """Write every queued browser_data/solar_data row now; returns the number of rows flushed."""
+    with _write_behind_flush_lock:
+        items = _drain_write_behind_queue()
+        try:
+            if items:
+                _write_behind_batch(items)
+        finally:
+            _release_write_behind_keys(items)
+    return len(items)
+
+
+def _flush_write_behind_for(lookup_key):
+    # Reads only pay for a flush when the row they are after is still waiting in the queue.
+    if _is_write_behind_pending(lookup_key):
+        flush_write_behind()
+
+
+def _write_behind_worker():
+    flush_seconds = max(
+        env_float("APP_DB_WRITE_BEHIND_FLUSH_SECONDS", _DEFAULT_WRITE_BEHIND_FLUSH_SECONDS),
+        0.01,
+    )
+    max_batch = max(env_int("APP_DB_WRITE_BEHIND_MAX_BATCH", _DEFAULT_WRITE_BEHIND_MAX_BATCH), 1)
+    while True:
+        _write_behind_pending.wait()
+        # Rows stay queued during the interval so readers can still flush them synchronously.
+        time.sleep(flush_seconds)
+        with _write_behind_flush_lock:
+            _write_behind_pending.clear()
+            items = _drain_write_behind_queue(max_batch)
+            if not _write_behind_queue.empty():
+                _write_behind_pending.set()
+            if not items:
+                continue
+            try:
+                _write_behind_batch(items)
+            except Exception:
+                logger.exception("Write-behind batch failed")
+            finally:
+                _release_write_behind_keys(items)
+
+
+def _ensure_write_behind_thread():
+    global _write_behind_thread
+
+    with _write_behind_thread_lock:
+        if _write_behind_thread is None or not _write_behind_thread.is_alive():
+            _write_behind_thread = threading.Thread(
+                target=_write_behind_worker,
+                name="data-persistence-write-behind",
+                daemon=True,
+            )
+            _write_behind_thread.start()
+
+
+def _enqueue_write(kind, params, fallback_args, durable, lookup_keys=()):
+    max_queue = max(env_int("APP_DB_WRITE_BEHIND_MAX_QUEUE", _DEFAULT_WRITE_BEHIND_MAX_QUEUE), 1)
+    if durable or not _write_behind_enabled() or _write_behind_queue.qsize() >= max_queue:
+        return False
+
+    lookup_keys = tuple(lookup_keys)
+    with _write_behind_keys_lock:
+        _write_behind_keys.update(lookup_keys)
+    _write_behind_queue.put((_runtime_backend(), kind, params, fallback_args, lookup_keys))
+    _write_behind_pending.set()
+    with _write_behind_stats_lock:
+        _write_behind_stats["enqueued"] += 1
+        _write_behind_stats["max_queue_depth"] = max(
+            _write_behind_stats["max_queue_depth"],
+            _write_behind_queue.qsize(),
+        )
+    _ensure_write_behind_thread()
+    return True
+
+
+def get_write_behind_stats():
+    with _write_behind_stats_lock:
+        stats = dict(_write_behind_stats)
+    return {
+        **stats,
+        "enabled": _write_behind_enabled(),
+        "queue_depth": _write_behind_queue.qsize(),
+    }
+
+
+atexit.register(flush_write_behind)
+
+
+def store_browser_data(guid, browser_data, ip_address, durable=False):
+    """Persist browser telemetry; queued for a batched write when APP_DB_WRITE_BEHIND is on and not durable."""
     stored_at = _stored_at_value()
+    params = (guid, json.dumps(browser_data), ip_address, stored_at)
+    fallback_args = (guid, browser_data, ip_address, stored_at)
+    if _enqueue_write("browser_data", params, fallback_args, durable):
+        return
+
+    _count_write_behind("sync_writes")
     try:
         with _connect() as connection:
-            connection.execute(
-                """
-                INSERT INTO browser_data (guid, browser_data_json, ip_address, stored_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                (guid, json.dumps(browser_data), ip_address, stored_at),
-            )
+            connection.execute(_BROWSER_DATA_INSERT_SQL, params)
             connection.commit()
         return
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Browser data persistence fell back to memory: %s", str(exc))
 
-    _browser_data_memory[guid] = {
-        **browser_data,
-        "ipAddress": ip_address,
-        "storedAt": stored_at,
-    }
+    _remember_browser_data(*fallback_args)
 
 
-def store_solar_data(guid, solar_data, time_zone, address, data_source):
+def store_solar_data(guid, solar_data, time_zone, address, data_source, durable=False):
     stored_at = _stored_at_value()
+    stored_at_epoch = _stored_at_epoch_value()
+    params = (
+        guid,
+        address.get("zip", ""),
+        json.dumps(solar_data),
+        time_zone,
+        data_source,
+        json.dumps(address),
+        stored_at,
+        stored_at_epoch,
+    )
+    fallback_args = (guid, solar_data, time_zone, address, data_source, stored_at, stored_at_epoch)
+    lookup_keys = [("solar_data", guid)] + ([("solar_zip", params[1])] if params[1] else [])
+    if _enqueue_write("solar_data", params, fallback_args, durable, lookup_keys):
+        return
+
+    _count_write_behind("sync_writes")
     try:
         with _connect() as connection:
-            connection.execute(
-                """
-                INSERT INTO solar_data (
-                    guid,
-                    zip_code,
-                    solar_data_json,
-                    time_zone,
-                    data_source,
-                    address_json,
-                    stored_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(guid) DO UPDATE SET
-                    zip_code = excluded.zip_code,
-                    solar_data_json = excluded.solar_data_json,
-                    time_zone = excluded.time_zone,
-                    data_source = excluded.data_source,
-                    address_json = excluded.address_json,
-                    stored_at = excluded.stored_at
-                """,
-                (
-                    guid,
-                    address.get("zip", ""),
-                    json.dumps(solar_data),
-                    time_zone,
-                    data_source,
-                    json.dumps(address),
-                    stored_at,
-                ),
-            )
+            connection.execute(_SOLAR_DATA_UPSERT_SQL, params)
             connection.commit()
         return
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Solar data persistence fell back to memory: %s", str(exc))
 
-    _solar_data_memory[guid] = {
-        "solar_data": dict(solar_data),
-        "time_zone": time_zone,
-        "address": dict(address),
-        "data_source": data_source,
-        "stored_at": stored_at,
-    }
+    _remember_solar_data(*fallback_args)
 
 
 def check_existing_address_data(guid):
-    property_record = get_property_record(guid)
+    property_record = get_property_record(guid, fields=("address",))
     if property_record:
         logger.info("Address data found for GUID %s", guid)
         return property_record["address"]
@@ -773,19 +1599,25 @@ def check_existing_address_data(guid):
 
 
 def check_existing_solar_data(guid):
+    # A queued solar row must be visible to the cache lookup.
+    _flush_write_behind_for(("solar_data", guid))
     try:
         with _connect() as connection:
             row = connection.execute(
-                "SELECT solar_data_json, time_zone, stored_at FROM solar_data WHERE guid = ?",
-                (guid,),
+                """
+                SELECT solar_data_json, time_zone
+                FROM solar_data
+                WHERE guid = ? AND stored_at_epoch >= ?
+                """,
+                (guid, cache_fresh_after("solar_data")),
             ).fetchone()
-        if row and _is_recent(row["stored_at"]):
+        if row:
             return _json_load(row["solar_data_json"], default={}), row["time_zone"]
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Solar lookup fell back to memory: %s", str(exc))
 
     cached = _solar_data_memory.get(guid)
-    if cached and _is_recent(cached.get("stored_at")):
+    if cached and _is_fresh("solar_data", cached.get("stored_at_epoch")):
         return cached["solar_data"], cached["time_zone"]
 
     return None, None
@@ -795,28 +1627,30 @@ def check_existing_zip_data(zip_code):
     if not zip_code:
         return None, None
 
+    _flush_write_behind_for(("solar_zip", zip_code))
+
     try:
         with _connect() as connection:
             row = connection.execute(
                 """
-                SELECT solar_data_json, time_zone, stored_at
+                SELECT solar_data_json, time_zone
                 FROM solar_data
-                WHERE zip_code = ?
-                ORDER BY stored_at DESC
+                WHERE zip_code = ? AND stored_at_epoch >= ?
+                ORDER BY stored_at_epoch DESC
                 LIMIT 1
                 """,
-                (zip_code,),
+                (zip_code, cache_fresh_after("solar_data")),
             ).fetchone()
-        if row and _is_recent(row["stored_at"]):
+        if row:
             return _json_load(row["solar_data_json"], default={}), row["time_zone"]
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("ZIP solar lookup fell back to memory: %s", str(exc))
 
     for guid, address in _personal_info_memory.items():
         if address.get("zip") != zip_code:
             continue
         cached = _solar_data_memory.get(guid)
-        if cached and _is_recent(cached.get("stored_at")):
+        if cached and _is_fresh("solar_data", cached.get("stored_at_epoch")):
             return cached["solar_data"], cached["time_zone"]
 
     return None, None
@@ -831,19 +1665,19 @@ def get_cached_property_climate(latitude, longitude):
         with _connect() as connection:
             row = connection.execute(
                 """
-                SELECT climate_json, stored_at
+                SELECT climate_json
                 FROM property_climate_snapshots
-                WHERE coordinate_lookup_key = ?
+                WHERE coordinate_lookup_key = ? AND stored_at_epoch >= ?
                 """,
-                (coordinate_lookup_key,),
+                (coordinate_lookup_key, cache_fresh_after("property_climate_snapshots")),
             ).fetchone()
-        if row and _is_recent(row["stored_at"]):
+        if row:
             return _json_load(row["climate_json"], default={})
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Property climate lookup fell back to memory: %s", str(exc))
 
     cached = _property_climate_snapshot_memory.get(coordinate_lookup_key)
-    if cached and _is_recent(cached.get("stored_at")):
+    if cached and _is_fresh("property_climate_snapshots", cached.get("stored_at_epoch")):
         return cached.get("climate")
 
     return None
@@ -855,26 +1689,34 @@ def store_cached_property_climate(latitude, longitude, climate):
 
     coordinate_lookup_key = build_coordinate_lookup_key(latitude, longitude)
     stored_at = _stored_at_value()
+    stored_at_epoch = _stored_at_epoch_value()
     try:
         with _connect() as connection:
             connection.execute(
                 """
-                INSERT INTO property_climate_snapshots (coordinate_lookup_key, climate_json, stored_at)
-                VALUES (?, ?, ?)
+                INSERT INTO property_climate_snapshots (
+                    coordinate_lookup_key,
+                    climate_json,
+                    stored_at,
+                    stored_at_epoch
+                )
+                VALUES (?, ?, ?, ?)
                 ON CONFLICT(coordinate_lookup_key) DO UPDATE SET
                     climate_json = excluded.climate_json,
-                    stored_at = excluded.stored_at
+                    stored_at = excluded.stored_at,
+                    stored_at_epoch = excluded.stored_at_epoch
                 """,
-                (coordinate_lookup_key, json.dumps(climate), stored_at),
+                (coordinate_lookup_key, _json_dump_blob(climate), stored_at, stored_at_epoch),
             )
             connection.commit()
         return
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Property climate persistence fell back to memory: %s", str(exc))
 
     _property_climate_snapshot_memory[coordinate_lookup_key] = {
         "climate": climate,
         "stored_at": stored_at,
+        "stored_at_epoch": stored_at_epoch,
     }
 
 
@@ -887,20 +1729,20 @@ def get_geocode_cache(query_type, cache_key):
         with _connect() as connection:
             row = connection.execute(
                 """
-                SELECT response_json, stored_at
+                SELECT response_json
                 FROM geocode_cache
-                WHERE cache_key = ? AND query_type = ?
+                WHERE cache_key = ? AND query_type = ? AND stored_at_epoch >= ?
                 """,
-                (composite_key, query_type),
+                (composite_key, query_type, cache_fresh_after("geocode_cache")),
             ).fetchone()
-        if row and _is_recent(row["stored_at"]):
+        if row:
             return _json_load(row["response_json"], default={})
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Geocode cache lookup fell back to memory: %s", str(exc))
 
-    cached = _geocode_cache_memory.get(composite_key)
-    if cached and _is_recent(cached.get("stored_at")):
-        return cached.get("response")
+    cached = _geocode_cache_memory.get_fresh(composite_key)
+    if cached:
+        return cached["data"].get("response")
 
     return None
 
@@ -911,27 +1753,63 @@ def store_geocode_cache(query_type, cache_key, response, source=None):
 
     composite_key = f"{query_type}:{cache_key}"
     stored_at = _stored_at_value()
+    stored_at_epoch = _stored_at_epoch_value()
     try:
         with _connect() as connection:
             connection.execute(
                 """
-                INSERT INTO geocode_cache (cache_key, query_type, source, response_json, stored_at)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO geocode_cache (cache_key, query_type, source, response_json, stored_at, stored_at_epoch)
+                VALUES (?, ?, ?, ?, ?, ?)
                 ON CONFLICT(cache_key) DO UPDATE SET
                     query_type = excluded.query_type,
                     source = excluded.source,
                     response_json = excluded.response_json,
-                    stored_at = excluded.stored_at
+                    stored_at = excluded.stored_at,
+                    stored_at_epoch = excluded.stored_at_epoch
                 """,
-                (composite_key, query_type, source, json.dumps(response), stored_at),
+                (composite_key, query_type, source, json.dumps(response), stored_at, stored_at_epoch),
             )
             connection.commit()
         return
-    except sqlite3.Error as exc:
+    except DATABASE_ERRORS as exc:
         logger.warning("Geocode cache persistence fell back to memory: %s", str(exc))
 
-    _geocode_cache_memory[composite_key] = {
-        "response": response,
-        "source": source,
-        "stored_at": stored_at,
-    }
+    _geocode_cache_memory.set(
+        composite_key,
+        {
+            "response": response,
+            "source": source,
+            "stored_at": stored_at,
+        },
+        cache_ttl_seconds("geocode_cache"),
+        fetched_at=stored_at_epoch,
+    )
+
+
+def list_geocode_cache(query_type, limit=500):
+    """Return ``(cache_key, response)`` pairs for fresh entries of one query type, newest first."""
+    if not query_type:
+        return []
+
+    prefix = f"{query_type}:"
+    try:
+        with _connect() as connection:
+            rows = connection.execute(
+                """
+                SELECT cache_key, response_json
+                FROM geocode_cache
+                WHERE query_type = ? AND stored_at_epoch >= ?
+                ORDER BY stored_at_epoch DESC
+                LIMIT ?
+                """,
+                (query_type, cache_fresh_after("geocode_cache"), max(int(limit), 1)),
+            ).fetchall()
+    except DATABASE_ERRORS as exc:
+        logger.warning("Geocode cache listing unavailable: %s", str(exc))
+        return []
+
+    return [
+        (row["cache_key"][len(prefix):], _json_load(row["response_json"], default={}))
+        for row in rows
+        if row["cache_key"].startswith(prefix)
+    ]
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import data_persistence
+from env_settings import env_int
+import response_cache
+
+logger = logging.getLogger(__name__)
+
+# Cache tables whose rows stop being served once stored_at_epoch ages past the table's TTL.
+EXPIRING_TABLES = data_persistence.EXPIRING_CACHE_TABLES
+_DEFAULT_BATCH_SIZE = 500
+_DEFAULT_MAX_BATCHES = 200
+_DEFAULT_VACUUM_PAGES = 2000
+
+
+def _page_counts(connection, dialect):
+    if dialect != "sqlite":
+        return {"page_count": None, "freelist_count": None}
+    return {
+        "page_count": connection.execute("PRAGMA page_count").fetchone()[0],
+        "freelist_count": connection.execute("PRAGMA freelist_count").fetchone()[0],
+    }
+
+
+def _reclaim_pages(connection, dialect, vacuum_pages):
+    if dialect != "sqlite":
+        return "skipped"
+    auto_vacuum = connection.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if auto_vacuum == 2 and vacuum_pages > 0:
+        # execute() steps the pragma once, which frees a single page; executescript runs it to completion.
+        connection.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+        return "incremental"
+    return "skipped"
+
+
+def enable_incremental_vacuum():
+    """Switch an existing database to incremental auto-vacuum; needs one full VACUUM rewrite."""
+    connection = data_persistence.get_connection()
+    connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    connection.execute("VACUUM")
+    return connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def run_maintenance(batch_size=None, max_batches=None, vacuum_pages=None, now=None):
+    """Purge expired cache rows, reclaim free pages and refresh planner statistics."""
+    batch_size = max(batch_size or env_int("APP_DB_MAINTENANCE_BATCH_SIZE", _DEFAULT_BATCH_SIZE), 1)
+    max_batches = max_batches or env_int("APP_DB_MAINTENANCE_MAX_BATCHES", _DEFAULT_MAX_BATCHES)
+    if vacuum_pages is None:
+        vacuum_pages = env_int("APP_DB_MAINTENANCE_VACUUM_PAGES", _DEFAULT_VACUUM_PAGES)
+
+    started_at = time.perf_counter()
+    cutoffs = {table: data_persistence.cache_fresh_after(table, now) for table in EXPIRING_TABLES}
+    dialect = data_persistence.get_database_dialect()
+    connection = data_persistence.get_connection()
+    before = _page_counts(connection, dialect)
+    purged = {
+        table: data_persistence.purge_expired_cache_rows(
+            table,
+            cutoff,
+            batch_size=batch_size,
+            max_batches=max_batches,
+        )
+        for table, cutoff in cutoffs.items()
+    }
+    vacuum = _reclaim_pages(connection, dialect, vacuum_pages)
+    if any(purged.values()):
+        for table in EXPIRING_TABLES:
+            connection.execute(f"ANALYZE {table}")
+        connection.commit()
+    after = _page_counts(connection, dialect)
+    response_cache_pruned = response_cache.prune_response_caches(now)
+
+    report = {
+        "cutoffs": cutoffs,
+        "purged_rows": purged,
+        "response_cache_pruned_rows": response_cache_pruned,
+        "vacuum": vacuum,
+        "pages_before": before["page_count"],
+        "pages_after": after["page_count"],
+        "reclaimed_pages": (
+            before["page_count"] - after["page_count"] if before["page_count"] is not None else None
+        ),
+        "freelist_pages": after["freelist_count"],
+        "elapsed_seconds": round(time.perf_counter() - started_at, 4),
+    }
+    logger.info("Database maintenance finished: %s", report)
+    return report
+
+
+async def run_maintenance_periodically(interval_seconds):
+    """Background loop for the app; each pass runs off the event loop in a worker thread."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_maintenance)
+        except Exception:
+            # Any failure must not end the loop, or maintenance silently stops until a restart.
+            logger.exception("Database maintenance pass failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Purge expired cache rows and compact the SQLite database.")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--vacuum-pages", type=int, default=None)
+    parser.add_argument(
+        "--enable-incremental-vacuum",
+        action="store_true",
+        help="Rewrite a database created before incremental auto-vacuum so free pages can be reclaimed.",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.enable_incremental_vacuum:
+        enable_incremental_vacuum()
+    report = run_maintenance(
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+        vacuum_pages=args.vacuum_pages,
+    )
+    data_persistence.close_connections()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+#python db_maintenance.py --batch-size 500 - to purge expired cache rows once
+if __name__ == "__main__":
+    raise SystemExit(main())
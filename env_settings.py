@@ -0,0 +1,26 @@
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+
+def _parse(name, default, cast):
+    value = (os.getenv(name) or "").strip()
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %s", name, value, default)
+        return default
+
+
+def env_int(name, default):
+    """Integer setting from the environment; blank uses ``default``, invalid logs and uses it."""
+    return _parse(name, default, int)
+
+
+def env_float(name, default):
+    """Float setting from the environment; blank uses ``default``, invalid logs and uses it."""
+    return _parse(name, default, float)
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from env_settings import env_float, env_int
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_SECONDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# A 429 from these hosts means back off, not try again; HTTP_RATE_LIMITED_HOSTS adds more.
+RATE_LIMITED_HOSTS = ("overpass-api.de", "nominatim.openstreetmap.org")
+
+# Monotonic deadline shared by every request made in this context, retries and backoff included.
+# Fan-outs set it in the context they copy into their worker tasks.
+request_deadline = contextvars.ContextVar("request_deadline", default=None)
+# (deadline, per-attempt timeout) of the request in flight on this thread, read by the retry policy.
+_attempt_budget = contextvars.ContextVar("attempt_budget", default=None)
+
+_SESSIONS: dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+_HOST_STATS: dict[str, dict[str, Any]] = {}
+_STATS_LOCK = threading.Lock()
+_ASYNC_CLIENTS: dict[int, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _host_timeouts():
+    # HTTP_HOST_TIMEOUTS="services.swpc.noaa.gov=8,overpass-api.de=25"
+    timeouts = {}
+    for item in (os.getenv("HTTP_HOST_TIMEOUTS") or "").split(","):
+        host, _, seconds = item.partition("=")
+        try:
+            timeouts[host.strip().lower()] = float(seconds)
+        except ValueError:
+            continue
+    return timeouts
+
+
+def _host_for(url: str):
+    return (urlparse(url).hostname or "").lower()
+
+
+def _rate_limited_hosts():
+    extra = (os.getenv("HTTP_RATE_LIMITED_HOSTS") or "").split(",")
+    return set(RATE_LIMITED_HOSTS) | {host.strip().lower() for host in extra if host.strip()}
+
+
+class _CappedRetry(Retry):
+    """Honours Retry-After, but never sleeps longer than HTTP_RETRY_AFTER_MAX_SECONDS.
+
+    A retry is refused when its pause plus another full attempt would overrun the request's
+    deadline, so retries never stretch a call past the budget its caller passed down.
+    """
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, max(env_float("HTTP_RETRY_AFTER_MAX_SECONDS", 5.0), 0.0))
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        budget = _attempt_budget.get()
+        if budget is not None:
+            deadline, attempt_timeout = budget
+            pause = (retry.get_retry_after(response) if response is not None else None) or retry.get_backoff_time()
+            if time.monotonic() + pause + attempt_timeout > deadline:
+                raise MaxRetryError(_pool, url, error or f"request deadline leaves no time to retry {url}")
+        return retry
+
+
+def _build_session(host: str = ""):
+    status_forcelist = RETRY_STATUS_CODES
+    if host in _rate_limited_hosts():
+        status_forcelist = tuple(code for code in RETRY_STATUS_CODES if code != 429)
+    retry = _CappedRetry(
+        total=max(env_int("HTTP_RETRY_TOTAL", 2), 0),
+        backoff_factor=max(env_float("HTTP_RETRY_BACKOFF_SECONDS", 0.3), 0.0),
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=max(env_int("HTTP_POOL_CONNECTIONS", 4), 1),
+        pool_maxsize=max(env_int("HTTP_POOL_MAXSIZE", 16), 1),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url: str):
+    host = _host_for(url)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(host)
+        if session is None:
+            session = _build_session(host)
+            _SESSIONS[host] = session
+        return session
+
+
+def resolve_timeout(url: str, timeout: Optional[float] = None):
+    # A host budget caps the caller's timeout; it never extends a tighter one.
+    host_timeout = _host_timeouts().get(_host_for(url))
+    if host_timeout is not None and timeout is not None:
+        return min(host_timeout, timeout)
+    if host_timeout is not None:
+        return host_timeout
+    if timeout is not None:
+        return timeout
+    return env_float("HTTP_DEFAULT_TIMEOUT_SECONDS", 15.0)
+
+
+def _record_request(host: str, elapsed_seconds: float, failed: bool):
+    with _STATS_LOCK:
+        stats = _HOST_STATS.setdefault(
+            host,
+            {
+                "requests": 0,
+                "errors": 0,
+                "latency_sum_seconds": 0.0,
+                "latency_buckets": [0] * (len(LATENCY_BUCKETS_SECONDS) + 1),
+            },
+        )
+        stats["requests"] += 1
+        stats["errors"] += 1 if failed else 0
+        stats["latency_sum_seconds"] += elapsed_seconds
+        stats["latency_buckets"][bisect_left(LATENCY_BUCKETS_SECONDS, elapsed_seconds)] += 1
+
+
+def get(
+    url: str,
+    params: Optional[dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    **kwargs,
+):
+    """GET through the host's pooled session.
+
+    ``deadline`` (time.monotonic()) or the context's ``request_deadline``, whichever is sooner,
+    caps each attempt's timeout and stops retries that could not finish before it.
+    """
+    host = _host_for(url)
+    started_at = time.perf_counter()
+    failed = True
+    timeout = resolve_timeout(url, timeout)
+    deadline = min((value for value in (deadline, request_deadline.get()) if value is not None), default=None)
+    budget_token = None
+    try:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout(f"Request deadline passed before calling {host}")
+            timeout = min(timeout, remaining)
+            budget_token = _attempt_budget.set((deadline, timeout))
+        response = get_session(url).get(url, params=params, timeout=timeout, **kwargs)
+        failed = response.status_code >= 400
+        return response
+    finally:
+        if budget_token is not None:
+            _attempt_budget.reset(budget_token)
+        _record_request(host, time.perf_counter() - started_at, failed)
+
+
+def _get_async_client():
+    # httpx clients are bound to the loop that opened their connections.
+    loop = asyncio.get_running_loop()
+    _, client = _ASYNC_CLIENTS.get(id(loop), (None, None))
+    if client is None or client.is_closed:
+        for loop_id, (client_loop, _) in list(_ASYNC_CLIENTS.items()):
+            if client_loop.is_closed():
+                _ASYNC_CLIENTS.pop(loop_id, None)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max(env_int("HTTP_ASYNC_MAX_CONNECTIONS", 200), 1),
+                max_keepalive_connections=max(env_int("HTTP_POOL_MAXSIZE", 16), 1),
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=max(env_int("HTTP_RETRY_TOTAL", 2), 0)),
+        )
+        _ASYNC_CLIENTS[id(loop)] = (loop, client)
+    return client
+
+
+async def async_get(
+    url: str,
+    params: Optional[dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+):
+    """GET on the event loop's shared httpx.AsyncClient, with the same timeout and deadline rules as get()."""
+    host = _host_for(url)
+    started_at = time.perf_counter()
+    failed = True
+    timeout = resolve_timeout(url, timeout)
+    deadline = min((value for value in (deadline, request_deadline.get()) if value is not None), default=None)
+    try:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise httpx.TimeoutException(f"Request deadline passed before calling {host}")
+            timeout = min(timeout, remaining)
+        response = await _get_async_client().get(url, params=params, timeout=timeout)
+        failed = response.status_code >= 400
+        return response
+    finally:
+        _record_request(host, time.perf_counter() - started_at, failed)
+
+
+async def close_async_clients():
+    loop = asyncio.get_running_loop()
+    entry = _ASYNC_CLIENTS.pop(id(loop), None)
+    if entry:
+        await entry[1].aclose()
+
+
+def _pool_counters(session: requests.Session):
+    connections = 0
+    pooled_requests = 0
+    for adapter in set(session.adapters.values()):
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += getattr(pool, "num_connections", 0)
+            pooled_requests += getattr(pool, "num_requests", 0)
+    return connections, pooled_requests
+
+
+def get_http_client_stats():
+    with _SESSIONS_LOCK:
+        sessions = dict(_SESSIONS)
+    with _STATS_LOCK:
+        host_stats = {
+            host: {**stats, "latency_buckets": list(stats["latency_buckets"])}
+            for host, stats in _HOST_STATS.items()
+        }
+
+    bucket_labels = [str(bound) for bound in LATENCY_BUCKETS_SECONDS] + ["+Inf"]
+    empty_stats = {"requests": 0, "errors": 0, "latency_sum_seconds": 0.0, "latency_buckets": []}
+    hosts = {}
+    for host in sorted(set(sessions) | set(host_stats)):
+        stats = host_stats.get(host) or empty_stats
+        connections, pooled_requests = _pool_counters(sessions[host]) if host in sessions else (0, 0)
+        hosts[host] = {
+            "requests": stats["requests"],
+            "errors": stats["errors"],
+            "mean_latency_seconds": (
+                round(stats["latency_sum_seconds"] / stats["requests"], 4) if stats["requests"] else None
+            ),
+            "latency_histogram": dict(zip(bucket_labels, stats["latency_buckets"])),
+            "connections_opened": connections,
+            "connection_reuse_rate": (
+                round(1 - connections / pooled_requests, 4) if pooled_requests else None
+            ),
+        }
+    return {"hosts": hosts}
+
+
+def close_sessions():
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+def reset_stats():
+    with _STATS_LOCK:
+        _HOST_STATS.clear()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 import json
 import logging
@@ -11,10 +12,14 @@ from zoneinfo import ZoneInfo
 
 import requests
 
+from env_settings import env_int
+import http_client
+from response_cache import get_response_cache
+
 
 logger = logging.getLogger(__name__)
 
-_CACHE: dict[tuple[str, tuple[tuple[str, str], ...]], dict[str, Any]] = {}
+_CACHE = get_response_cache("live-conditions")
 
 NOAA_SCALES_URL = "https://services.swpc.noaa.gov/products/noaa-scales.json"
 NOAA_ALERTS_URL = "https://services.swpc.noaa.gov/products/alerts.json"
@@ -35,12 +40,28 @@ AURORA_NEARBY_DISTANCE_KM = 1000
 AURORA_DISTANT_DISTANCE_KM = 1800
 
 
+UPSTREAM_FETCH_WORKERS = max(env_int("LIVE_CONDITIONS_FETCH_WORKERS", 16), 1)
+
+_FETCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=UPSTREAM_FETCH_WORKERS,
+    thread_name_prefix="live-conditions-fetch",
+)
+
+
 def _normalize_params(params: Optional[dict[str, Any]]) -> tuple[tuple[str, str], ...]:
     if not params:
         return ()
     return tuple(sorted((str(key), str(value)) for key, value in params.items()))
 
 
+def _run_concurrently(tasks: dict[str, tuple[Any, tuple[Any, ...], dict[str, Any]]]) -> dict[str, Any]:
+    futures = {
+        name: _FETCH_EXECUTOR.submit(function, *args, **kwargs)
+        for name, (function, args, kwargs) in tasks.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
 def _timestamp_to_iso(timestamp: float) -> str:
     return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
 
@@ -247,17 +268,11 @@ def _fetch_json(
         return result if return_metadata else result["data"]
 
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = http_client.get(url, params=params, timeout=15)
         response.raise_for_status()
         data = _decode_json_payload(response.text)
-        fetched_at = time.time()
-        cache_entry = {
-            "data": data,
-            "fetched_at": fetched_at,
-            "expires_at": fetched_at + ttl_seconds,
-            "ttl_seconds": ttl_seconds,
-        }
-        _CACHE[key] = cache_entry
+        cache_entry = _CACHE.set(key, data, ttl_seconds)
+        fetched_at = cache_entry["fetched_at"]
         result = {
             "data": data,
             "freshness": _build_source_freshness(
@@ -311,16 +326,10 @@ def _fetch_text(
         return result if return_metadata else result["data"]
 
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = http_client.get(url, params=params, timeout=15)
         response.raise_for_status()
-        fetched_at = time.time()
-        cache_entry = {
-            "data": response.text,
-            "fetched_at": fetched_at,
-            "expires_at": fetched_at + ttl_seconds,
-            "ttl_seconds": ttl_seconds,
-        }
-        _CACHE[key] = cache_entry
+        cache_entry = _CACHE.set(key, response.text, ttl_seconds)
+        fetched_at = cache_entry["fetched_at"]
         result = {
             "data": response.text,
             "freshness": _build_source_freshness(
@@ -1991,6 +2000,18 @@ def _build_climate_extreme(
     }
 
 
+def _open_meteo_forecast_params(latitude: float, longitude: float, time_zone_name: str):
+    return {
+        "latitude": round(latitude, 6),
+        "longitude": round(longitude, 6),
+        "timezone": time_zone_name or "UTC",
+        "past_hours": 2,
+        "forecast_hours": 24,
+        "current": "is_day,shortwave_radiation,direct_normal_irradiance",
+        "hourly": "shortwave_radiation,direct_normal_irradiance",
+    }
+
+
 def _build_open_meteo_payload(
     latitude: float,
     longitude: float,
@@ -2001,15 +2022,7 @@ def _build_open_meteo_payload(
 ):
     return _fetch_json(
         OPEN_METEO_FORECAST_URL,
-        params={
-            "latitude": round(latitude, 6),
-            "longitude": round(longitude, 6),
-            "timezone": time_zone_name or "UTC",
-            "past_hours": 2,
-            "forecast_hours": 24,
-            "current": "is_day,shortwave_radiation,direct_normal_irradiance",
-            "hourly": "shortwave_radiation,direct_normal_irradiance",
-        },
+        params=_open_meteo_forecast_params(latitude, longitude, time_zone_name),
         ttl_seconds=600,
         force_refresh=force_refresh,
         return_metadata=return_metadata,
@@ -2017,23 +2030,27 @@ def _build_open_meteo_payload(
     )
 
 
-def _build_open_meteo_historical_payload(latitude: float, longitude: float, time_zone_name: str):
+def _open_meteo_historical_params(latitude: float, longitude: float, time_zone_name: str):
     start_date, end_date, _, _ = _historical_climate_window()
+    return {
+        "latitude": round(latitude, 6),
+        "longitude": round(longitude, 6),
+        "timezone": time_zone_name or "UTC",
+        "start_date": start_date,
+        "end_date": end_date,
+        "daily": (
+            "temperature_2m_mean,"
+            "temperature_2m_min,"
+            "relative_humidity_2m_mean,"
+            "shortwave_radiation_sum"
+        ),
+    }
+
+
+def _build_open_meteo_historical_payload(latitude: float, longitude: float, time_zone_name: str):
     return _fetch_json(
         OPEN_METEO_ARCHIVE_URL,
-        params={
-            "latitude": round(latitude, 6),
-            "longitude": round(longitude, 6),
-            "timezone": time_zone_name or "UTC",
-            "start_date": start_date,
-            "end_date": end_date,
-            "daily": (
-                "temperature_2m_mean,"
-                "temperature_2m_min,"
-                "relative_humidity_2m_mean,"
-                "shortwave_radiation_sum"
-            ),
-        },
+        params=_open_meteo_historical_params(latitude, longitude, time_zone_name),
         ttl_seconds=86400,
     )
 
@@ -2355,98 +2372,219 @@ def get_property_climate_snapshot(latitude: float, longitude: float, time_zone_n
     }
 
 
-def get_space_weather_snapshot(
+def _recent_donki_params():
+    end_date = datetime.now(timezone.utc).date()
+    start_date = end_date - timedelta(days=7)
+    return {
+        "startDate": start_date.isoformat(),
+        "endDate": end_date.isoformat(),
+    }
+
+
+def _plan_entry(
+    url: str,
+    params: Optional[dict[str, Any]] = None,
+    ttl_seconds: int = 300,
+    *,
+    text: bool = False,
+):
+    return {
+        "cache": _CACHE,
+        "key": (url, _normalize_params(params)),
+        "url": url,
+        "params": params,
+        "ttl_seconds": ttl_seconds,
+        "timeout": 15,
+        "decode": (lambda body: body) if text else _decode_json_payload,
+    }
+
+
+def build_surface_irradiance_fetch_plan(
     latitude: float,
     longitude: float,
     time_zone_name: str,
     force_refresh: bool = False,
 ):
-    scales_response = _fetch_json(
-        NOAA_SCALES_URL,
-        ttl_seconds=60,
-        force_refresh=force_refresh,
-        return_metadata=True,
-        source_name="noaa-scales",
-    )
-    alerts_response = _fetch_json(
-        NOAA_ALERTS_URL,
-        ttl_seconds=60,
-        force_refresh=force_refresh,
-        return_metadata=True,
-        source_name="noaa-alerts",
-    )
-    plasma_response = _fetch_json(
-        NOAA_PLASMA_URL,
-        ttl_seconds=60,
-        force_refresh=force_refresh,
-        return_metadata=True,
-        source_name="noaa-solar-wind",
-    )
-    xray_response = _fetch_json(
-        NOAA_XRAY_URL,
-        ttl_seconds=60,
-        force_refresh=force_refresh,
-        return_metadata=True,
-        source_name="noaa-goes-xray",
-    )
-    aurora_response = _fetch_optional_json(
-        NOAA_AURORA_OVATION_URL,
-        ttl_seconds=300,
-        force_refresh=force_refresh,
-        source_name="noaa-ovation-aurora",
-        default_data={},
+    if force_refresh:
+        return []
+    return [
+        _plan_entry(
+            OPEN_METEO_FORECAST_URL,
+            _open_meteo_forecast_params(latitude, longitude, time_zone_name),
+            ttl_seconds=600,
+        )
+    ]
+
+
+def build_property_climate_fetch_plan(latitude: float, longitude: float, time_zone_name: str):
+    return [
+        _plan_entry(
+            OPEN_METEO_ARCHIVE_URL,
+            _open_meteo_historical_params(latitude, longitude, time_zone_name),
+            ttl_seconds=86400,
+        )
+    ]
+
+
+def build_space_weather_fetch_plan(
+    latitude: float,
+    longitude: float,
+    time_zone_name: str,
+    force_refresh: bool = False,
+):
+    # Forced refreshes bypass the cache, so prefetching would only duplicate the sync fetches.
+    if force_refresh:
+        return []
+    donki_params = _recent_donki_params()
+    return [
+        _plan_entry(NOAA_SCALES_URL, ttl_seconds=60),
+        _plan_entry(NOAA_ALERTS_URL, ttl_seconds=60),
+        _plan_entry(NOAA_PLASMA_URL, ttl_seconds=60),
+        _plan_entry(NOAA_XRAY_URL, ttl_seconds=60),
+        _plan_entry(NOAA_AURORA_OVATION_URL, ttl_seconds=300),
+        _plan_entry(NOAA_DRAP_URL, ttl_seconds=60, text=True),
+        _plan_entry(NOAA_GLOTEC_INDEX_URL, ttl_seconds=300),
+        _plan_entry(NASA_DONKI_FLR_URL, donki_params, ttl_seconds=1800),
+        _plan_entry(NASA_DONKI_GST_URL, donki_params, ttl_seconds=1800),
+        *build_surface_irradiance_fetch_plan(latitude, longitude, time_zone_name),
+    ]
+
+
+def _fetch_space_weather_sources(
+    latitude: float,
+    longitude: float,
+    time_zone_name: str,
+    force_refresh: bool = False,
+):
+    donki_params = _recent_donki_params()
+    return _run_concurrently(
+        {
+            "scales": (
+                _fetch_json,
+                (NOAA_SCALES_URL,),
+                {
+                    "ttl_seconds": 60,
+                    "force_refresh": force_refresh,
+                    "return_metadata": True,
+                    "source_name": "noaa-scales",
+                },
+            ),
+            "alerts": (
+                _fetch_json,
+                (NOAA_ALERTS_URL,),
+                {
+                    "ttl_seconds": 60,
+                    "force_refresh": force_refresh,
+                    "return_metadata": True,
+                    "source_name": "noaa-alerts",
+                },
+            ),
+            "plasma": (
+                _fetch_json,
+                (NOAA_PLASMA_URL,),
+                {
+                    "ttl_seconds": 60,
+                    "force_refresh": force_refresh,
+                    "return_metadata": True,
+                    "source_name": "noaa-solar-wind",
+                },
+            ),
+            "xray": (
+                _fetch_json,
+                (NOAA_XRAY_URL,),
+                {
+                    "ttl_seconds": 60,
+                    "force_refresh": force_refresh,
+                    "return_metadata": True,
+                    "source_name": "noaa-goes-xray",
+                },
+            ),
+            "aurora": (
+                _fetch_optional_json,
+                (NOAA_AURORA_OVATION_URL,),
+                {
+                    "ttl_seconds": 300,
+                    "force_refresh": force_refresh,
+                    "source_name": "noaa-ovation-aurora",
+                    "default_data": {},
+                },
+            ),
+            "drap": (
+                _fetch_optional_text,
+                (NOAA_DRAP_URL,),
+                {
+                    "ttl_seconds": 60,
+                    "force_refresh": force_refresh,
+                    "source_name": "noaa-drap",
+                    "default_data": "",
+                },
+            ),
+            "glotec": (
+                _fetch_glotec_context,
+                (latitude, longitude),
+                {"force_refresh": force_refresh},
+            ),
+            "flares": (
+                _fetch_json,
+                (NASA_DONKI_FLR_URL,),
+                {
+                    "params": donki_params,
+                    "ttl_seconds": 1800,
+                    "force_refresh": force_refresh,
+                    "return_metadata": True,
+                    "source_name": "nasa-donki-flares",
+                },
+            ),
+            "storms": (
+                _fetch_json,
+                (NASA_DONKI_GST_URL,),
+                {
+                    "params": donki_params,
+                    "ttl_seconds": 1800,
+                    "force_refresh": force_refresh,
+                    "return_metadata": True,
+                    "source_name": "nasa-donki-geomagnetic-storms",
+                },
+            ),
+            "irradiance": (
+                get_surface_irradiance_snapshot,
+                (latitude, longitude, time_zone_name),
+                {"force_refresh": force_refresh},
+            ),
+        }
     )
-    drap_response = _fetch_optional_text(
-        NOAA_DRAP_URL,
-        ttl_seconds=60,
+
+
+def get_space_weather_snapshot(
+    latitude: float,
+    longitude: float,
+    time_zone_name: str,
+    force_refresh: bool = False,
+):
+    responses = _fetch_space_weather_sources(
+        latitude,
+        longitude,
+        time_zone_name,
         force_refresh=force_refresh,
-        source_name="noaa-drap",
-        default_data="",
     )
+    scales_response = responses["scales"]
+    alerts_response = responses["alerts"]
+    plasma_response = responses["plasma"]
+    xray_response = responses["xray"]
+    aurora_response = responses["aurora"]
+    drap_response = responses["drap"]
+    flares_response = responses["flares"]
+    storms_response = responses["storms"]
+    glotec_context = responses["glotec"]
+    irradiance_snapshot = responses["irradiance"]
     scales_payload = scales_response["data"]
     alerts_payload = alerts_response["data"]
     plasma_payload = plasma_response["data"]
     xray_payload = xray_response["data"]
     aurora_payload = aurora_response["data"]
     drap_context = _build_drap_context(drap_response.get("data") or "", latitude, longitude)
-    glotec_context = _fetch_glotec_context(
-        latitude,
-        longitude,
-        force_refresh=force_refresh,
-    )
-
-    end_date = datetime.now(timezone.utc).date()
-    start_date = end_date - timedelta(days=7)
-    flares_response = _fetch_json(
-        NASA_DONKI_FLR_URL,
-        params={
-            "startDate": start_date.isoformat(),
-            "endDate": end_date.isoformat(),
-        },
-        ttl_seconds=1800,
-        force_refresh=force_refresh,
-        return_metadata=True,
-        source_name="nasa-donki-flares",
-    )
-    storms_response = _fetch_json(
-        NASA_DONKI_GST_URL,
-        params={
-            "startDate": start_date.isoformat(),
-            "endDate": end_date.isoformat(),
-        },
-        ttl_seconds=1800,
-        force_refresh=force_refresh,
-        return_metadata=True,
-        source_name="nasa-donki-geomagnetic-storms",
-    )
     flares_payload = flares_response["data"]
     storms_payload = storms_response["data"]
-    irradiance_snapshot = get_surface_irradiance_snapshot(
-        latitude,
-        longitude,
-        time_zone_name,
-        force_refresh=force_refresh,
-    )
 
     current_scale_entry = _extract_scale_entry(scales_payload, "0")
     day_one_scale_entry = _extract_scale_entry(scales_payload, "1")
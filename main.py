@@ -1,12 +1,19 @@
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+import asyncio
+import contextvars
+import json
 import logging
 import math
 import os
+import threading
+import time
 from data_persistence import (
     store_personal_info, store_browser_data, store_solar_data,
     check_existing_address_data, check_existing_solar_data, check_existing_zip_data,
@@ -15,24 +22,48 @@ from data_persistence import (
     list_solar_quote_leads, store_solar_quote_lead,
     get_cached_property_climate, store_cached_property_climate,
     build_address_lookup_key, build_coordinate_lookup_key, get_geocode_cache, store_geocode_cache,
+    close_connections, get_connection_pool_stats, flush_write_behind, get_write_behind_stats,
 )
-from property_context import get_property_context_snapshot
+from db_maintenance import run_maintenance_periodically
+from env_settings import env_float, env_int
+from batch_geocode import (
+    acquire_provider_token,
+    get_provider_bucket_stats,
+    get_token_wait_seconds,
+    is_rate_limited,
+    run_batch,
+)
+from address_index import (
+    STREET_ABBREVIATIONS, get_address_index, normalize_lookup_text, normalize_lookup_tokens, normalize_street_text,
+    warm_address_index,
+)
+from property_context import build_property_context_fetch_plan, get_property_context_snapshot
 from live_conditions import (
+    build_property_climate_fetch_plan,
+    build_space_weather_fetch_plan,
+    build_surface_irradiance_fetch_plan,
     get_property_climate_snapshot,
     get_space_weather_history,
     get_space_weather_snapshot,
     get_surface_irradiance_snapshot,
 )
 from utility_context import resolve_utility_context
+from response_cache import (
+    close_persistence as close_response_cache_persistence, get_bounded_store_stats, get_response_cache_stats,
+)
 import uuid
 from geopy.geocoders import Nominatim
 from datetime import datetime, timedelta
+import httpx
 import requests
+import http_client
 from geopy.exc import GeocoderTimedOut
 import ssl
 import certifi
 from timezonefinder import TimezoneFinder
 import re
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
 from types import SimpleNamespace
 from typing import Optional
 from urllib.parse import urlparse
@@ -107,6 +138,11 @@ class PropertyRecordRequest(BaseModel):
     garden_zones: Optional[list[GardenZone]] = None
 
 
+class PropertyPreviewBatchRequest(BaseModel):
+    addresses: list[Address]
+    workers: Optional[int] = None
+
+
 class PropertyRecordRecentRequest(BaseModel):
     max_items: int = 8
     require_garden_zones: bool = False
@@ -196,6 +232,21 @@ def get_env_setting(name, default=""):
     return value or default
 
 
+def get_env_int(name, default):
+    return env_int(name, default)
+
+
+def get_env_float(name, default):
+    return env_float(name, default)
+
+
+def get_env_flag(name, default=False):
+    value = get_env_setting(name, "")
+    if not value:
+        return default
+    return value.lower() in {"1", "true", "yes", "on"}
+
+
 def normalize_domain_value(value):
     if not value:
         return ""
@@ -261,6 +312,20 @@ NREL_PVWATTS_DEFAULT_DATASET = "nsrdb"
 NREL_PVWATTS_DEFAULT_RADIUS = 0
 FORWARD_PROPERTY_PREVIEW_CACHE = "forward-property-preview"
 REVERSE_PROPERTY_PREVIEW_CACHE = "reverse-property-preview"
+GEOCODE_DEADLINE_SECONDS = max(get_env_float("GEOCODE_DEADLINE_SECONDS", 20.0), 0.0)
+GEOCODE_REVERSE_CHECK_LIMIT = max(get_env_int("GEOCODE_REVERSE_CHECK_LIMIT", 3), 0)
+_GEOCODE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(get_env_int("GEOCODE_FETCH_WORKERS", 8), 1),
+    thread_name_prefix="geocode-fetch",
+)
+_reverse_check_stats = {"cache_hits": 0, "upstream_calls": 0, "failures": 0}
+_reverse_check_stats_lock = threading.Lock()
+DEFAULT_GEOCODE_CONFIDENCE_SCORE = 32
+_resolution_tier_counts = {}
+_resolution_tier_lock = threading.Lock()
+# Nominatim's usage policy allows no parallel requests, so every call in the process, from the
+# forward fan-out and the reverse checks alike, takes turns behind this lock.
+_nominatim_lock = threading.Lock()
 
 
 def normalize_quality_percent(value):
@@ -312,42 +377,6 @@ def format_address(address):
     return ", ".join(part for part in parts if part)
 
 
-def normalize_lookup_text(value):
-    return re.sub(r"[^a-z0-9]+", " ", str(value).lower()).strip()
-
-
-STREET_ABBREVIATIONS = {
-    "aly": "alley",
-    "ave": "avenue",
-    "blvd": "boulevard",
-    "cir": "circle",
-    "ct": "court",
-    "dr": "drive",
-    "hwy": "highway",
-    "ln": "lane",
-    "pkwy": "parkway",
-    "pl": "place",
-    "rd": "road",
-    "sq": "square",
-    "st": "street",
-    "ter": "terrace",
-    "trl": "trail",
-    "way": "way",
-}
-
-
-def normalize_lookup_tokens(value):
-    return [
-        STREET_ABBREVIATIONS.get(token, token)
-        for token in normalize_lookup_text(value).split()
-        if token
-    ]
-
-
-def normalize_street_text(value):
-    return " ".join(normalize_lookup_tokens(value))
-
-
 def extract_house_number(value):
     tokens = normalize_lookup_tokens(value)
 
@@ -582,31 +611,103 @@ def score_location_precision(location):
     return score
 
 
-def score_reverse_geocode_candidate(address, location):
-    try:
-        if is_arcgis_location(location):
-            reverse_payload = reverse_geocode_arcgis_location(location.latitude, location.longitude)
-            reverse_address = reverse_payload.get("address", {}) or {}
-            candidate_address = extract_arcgis_address_parts(reverse_address)
-            display_text = (
+def record_reverse_check(outcome):
+    with _reverse_check_stats_lock:
+        _reverse_check_stats[outcome] += 1
+
+
+def get_reverse_check_stats():
+    with _reverse_check_stats_lock:
+        stats = dict(_reverse_check_stats)
+    lookups = stats["cache_hits"] + stats["upstream_calls"]
+    return {
+        **stats,
+        "saved_upstream_calls": stats["cache_hits"],
+        "hit_rate": round(stats["cache_hits"] / lookups, 4) if lookups else None,
+    }
+
+
+def build_reverse_check(location):
+    # The parts each reverse provider is scored on; ArcGIS keeps its own labels rather than the
+    # house-number-stripped road that build_arcgis_reverse_location exposes.
+    raw_location = getattr(location, "raw", {}) or {}
+    if is_arcgis_location(location):
+        reverse_address = raw_location.get("raw_address", {}) or {}
+        return {
+            "provider": "arcgis",
+            "address": extract_arcgis_address_parts(reverse_address),
+            "display_text": (
                 reverse_address.get("LongLabel")
                 or reverse_address.get("Match_addr")
                 or reverse_address.get("Address")
                 or ""
-            )
-            return score_address_match(address, candidate_address, display_text)
+            ),
+        }
+
+    return {
+        "provider": "nominatim",
+        "address": extract_address_parts(raw_location.get("address", {}) or {}),
+        "display_text": location.address or "",
+    }
+
+
+def build_reverse_preview_payload(location, latitude, longitude):
+    raw_address = getattr(location, "raw", {}).get("address", {}) or {}
+    normalized_address = extract_address_parts(raw_address)
+
+    return {
+        "query": f"{round(latitude, 6)}, {round(longitude, 6)}",
+        "formatted_address": location.address or format_address(normalized_address),
+        "latitude": round(location.latitude, 6),
+        "longitude": round(location.longitude, 6),
+        "bounds": parse_bounding_box(location),
+        "source": "browser-location",
+        "match_quality": "high",
+        "match_score": None,
+        "address": normalized_address,
+        "reverse_check": build_reverse_check(location),
+    }
+
+
+def score_reverse_geocode_candidate(address, location):
+    # Candidate reverse lookups share the /api/reverse-geocode cache, so a coordinate seen by
+    # either path is only reverse geocoded once per provider.
+    reverse_provider = (
+        "arcgis"
+        if is_arcgis_location(location) or get_geocoder_provider() == "arcgis"
+        else "nominatim"
+    )
+    cache_key = build_coordinate_lookup_key(location.latitude, location.longitude)
+    cached_preview = get_geocode_cache(REVERSE_PROPERTY_PREVIEW_CACHE, cache_key) or {}
+    reverse_check = cached_preview.get("reverse_check") or {}
+    if reverse_check.get("provider") == reverse_provider:
+        record_reverse_check("cache_hits")
+        return score_address_match(
+            address,
+            reverse_check.get("address") or {},
+            reverse_check.get("display_text") or "",
+        )
 
-        reverse_location = reverse_geocode_location(location.latitude, location.longitude)
+    record_reverse_check("upstream_calls")
+    try:
+        if is_arcgis_location(location):
+            reverse_payload = reverse_geocode_arcgis_location(location.latitude, location.longitude)
+            reverse_location = build_arcgis_reverse_location(location.latitude, location.longitude, reverse_payload)
+        else:
+            reverse_location = reverse_geocode_location(location.latitude, location.longitude)
     except HTTPException as exc:
+        record_reverse_check("failures")
         logger.warning("Skipping reverse geocode validation for candidate: %s", exc.detail)
         return 0
     except Exception as exc:
+        record_reverse_check("failures")
         logger.warning("Skipping reverse geocode validation for candidate: %s", str(exc))
         return 0
 
-    raw_address = getattr(reverse_location, "raw", {}).get("address", {}) or {}
-    candidate_address = extract_address_parts(raw_address)
-    return score_address_match(address, candidate_address, reverse_location.address or "")
+    payload = build_reverse_preview_payload(reverse_location, location.latitude, location.longitude)
+    store_geocode_cache(REVERSE_PROPERTY_PREVIEW_CACHE, cache_key, payload, payload.get("source"))
+    reverse_check = payload["reverse_check"]
+    return score_address_match(address, reverse_check["address"], reverse_check["display_text"])
 
 
 def unique_geocode_key(location):
@@ -683,8 +784,9 @@ def is_road_centerline_house_match(location):
 
 
 def fetch_arcgis_point_address(address):
+    acquire_provider_token("arcgis")
     try:
-        response = requests.get(
+        response = http_client.get(
             ARCGIS_GEOCODE_URL,
             params={
                 "SingleLine": format_address(address),
@@ -750,8 +852,9 @@ def fetch_arcgis_point_address(address):
 
 
 def fetch_arcgis_forward_candidates(address):
+    acquire_provider_token("arcgis")
     try:
-        response = requests.get(
+        response = http_client.get(
             ARCGIS_GEOCODE_URL,
             params={
                 "SingleLine": format_address(address),
@@ -812,14 +915,13 @@ def fetch_arcgis_forward_candidates(address):
     return candidates
 
 
-def fetch_nominatim_candidates(address):
-    structured_query = build_structured_query(address)
-    formatted_address = format_address(address)
-    country_code = get_country_code(address.get("country", ""))
-    queries = [structured_query, formatted_address]
-    candidates = []
+def build_nominatim_queries(address):
+    return [build_structured_query(address), format_address(address)]
+
 
-    for query in queries:
+def fetch_nominatim_query(query, country_code):
+    acquire_provider_token("nominatim")
+    with _nominatim_lock:
         results = geolocator.geocode(
             query,
             timeout=10,
@@ -829,20 +931,29 @@ def fetch_nominatim_candidates(address):
             country_codes=country_code,
         )
 
-        if not results:
-            continue
+    if not results:
+        return []
+
+    if not isinstance(results, list):
+        results = [results]
 
-        if not isinstance(results, list):
-            results = [results]
+    return results
 
-        candidates.extend(results)
+
+def fetch_nominatim_candidates(address):
+    country_code = get_country_code(address.get("country", ""))
+    candidates = []
+
+    for query in build_nominatim_queries(address):
+        candidates.extend(fetch_nominatim_query(query, country_code))
 
     return dedupe_geocode_candidates(candidates)
 
 
 def reverse_geocode_arcgis_location(latitude, longitude):
+    acquire_provider_token("arcgis")
     try:
-        response = requests.get(
+        response = http_client.get(
             ARCGIS_REVERSE_GEOCODE_URL,
             params={
                 "location": f"{longitude},{latitude}",
@@ -906,7 +1017,7 @@ def get_nrel_pvwatts_data(
     }
 
     try:
-        response = requests.get(NREL_PVWATTS_URL, params=params, timeout=30)
+        response = http_client.get(NREL_PVWATTS_URL, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
     except requests.RequestException as exc:
@@ -1009,7 +1120,7 @@ def get_nasa_power_data(lat: float, lon: float):
     }
 
     try:
-        response = requests.get(base_url, params=params, timeout=30)
+        response = http_client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
 
@@ -1093,62 +1204,198 @@ def get_fresh_solar_data(lat: float, lon: float):
     solar_data["provider"] = "nasa"
     return solar_data, "nasa"
 
-def geocode_location(address):
+class _DeferredGeocodeTask(Future):
+    """A geocode fetch that runs in the reading thread the first time its result is asked for.
+
+    Batch jobs use these instead of the shared fetch pool: their provider token waits then block
+    the batch worker rather than a pool thread interactive lookups need, and a task cancelled
+    before it is read never runs or spends a token.
+    """
+
+    def __init__(self, context, function, args):
+        super().__init__()
+        self._call = (context, function, args)
+
+    def result(self, timeout=None):
+        if not (self.running() or self.done()):
+            if timeout is not None and timeout <= 0:
+                self.cancel()
+                raise FutureTimeoutError()
+            if self.set_running_or_notify_cancel():
+                context, function, args = self._call
+                try:
+                    self.set_result(context.run(function, *args))
+                except BaseException as exc:
+                    self.set_exception(exc)
+        return super().result(timeout)
+
+
+def submit_geocode_task(function, *args, deadline=None):
+    # Each task runs in its own copy of the caller's context so request-scoped ContextVars follow it.
+    context = contextvars.copy_context()
+    if is_rate_limited():
+        return _DeferredGeocodeTask(context, function, args)
+    if deadline is not None:
+        # Interactive fetches stop retrying at the lookup deadline; batch ones wait out tokens first.
+        context.run(http_client.request_deadline.set, deadline)
+    return _GEOCODE_EXECUTOR.submit(context.run, function, *args)
+
+
+def collect_geocode_result(future, deadline, label, default):
+    # Time a batch job spent waiting for provider tokens does not run down its deadline.
+    remaining = deadline + get_token_wait_seconds() - time.monotonic()
     try:
-        provider = get_geocoder_provider()
-        country_code = get_country_code(address.get("country", ""))
-        unique_candidates = []
+        return future.result(timeout=max(remaining, 0)), False
+    except FutureTimeoutError:
+        future.cancel()
+        logger.warning("Geocode %s missed the %.1fs deadline", label, GEOCODE_DEADLINE_SECONDS)
+        return default, True
 
-        if provider in {"nominatim", "hybrid"}:
-            unique_candidates.extend(fetch_nominatim_candidates(address))
 
-        if provider == "arcgis":
-            unique_candidates = dedupe_geocode_candidates(
-                [*unique_candidates, *fetch_arcgis_forward_candidates(address)]
-            )
+def plan_geocode_fetches(address, provider, country_code):
+    # Listed in the order the serial lookup merged them, so dedupe keeps the same first-seen
+    # candidate and ranking ties break the same way when the fetches run concurrently.
+    fetches = []
+    if provider in {"nominatim", "hybrid"}:
+        # One task runs the Nominatim queries back to back; they could not overlap anyway.
+        fetches.append(("nominatim", fetch_nominatim_candidates, (address,)))
 
-        if country_code == "us" and extract_house_number(address.get("street", "")):
-            arcgis_candidate = fetch_arcgis_point_address(address)
-            if arcgis_candidate and provider in {"arcgis", "hybrid"}:
-                unique_candidates = dedupe_geocode_candidates(
-                    [*unique_candidates, arcgis_candidate]
-                )
+    if provider == "arcgis":
+        fetches.append(("arcgis-forward", fetch_arcgis_forward_candidates, (address,)))
 
-        if not unique_candidates:
-            raise HTTPException(status_code=404, detail="Address not found")
+    if (
+        provider in {"arcgis", "hybrid"}
+        and country_code == "us"
+        and extract_house_number(address.get("street", ""))
+    ):
+        fetches.append(("arcgis-pointaddress", fetch_arcgis_point_address, (address,)))
 
-        evaluated_candidates = []
-        for location in unique_candidates:
-            forward_score = score_geocode_candidate(address, location)
-            precision_score = score_location_precision(location)
-            evaluated_candidates.append(
-                {
-                    "location": location,
-                    "match_score": forward_score + precision_score,
-                    "forward_score": forward_score,
-                    "precision_score": precision_score,
-                    "reverse_score": 0,
-                }
-            )
+    return fetches
+
+
+def submit_geocode_fetches(fetches, deadline=None):
+    return [(label, submit_geocode_task(function, *args, deadline=deadline)) for label, function, args in fetches]
+
+
+def collect_geocode_candidates(futures, deadline):
+    candidates = []
+    timed_out = False
+    for label, future in futures:
+        results, missed = collect_geocode_result(future, deadline, label, [])
+        timed_out = timed_out or missed
+        if results is None:
+            continue
+        candidates.extend(results if isinstance(results, list) else [results])
+
+    return candidates, timed_out
+
+
+def evaluate_geocode_candidates(address, candidates):
+    evaluated_candidates = []
+    for location in dedupe_geocode_candidates(candidates):
+        forward_score = score_geocode_candidate(address, location)
+        precision_score = score_location_precision(location)
+        evaluated_candidates.append(
+            {
+                "location": location,
+                "match_score": forward_score + precision_score,
+                "forward_score": forward_score,
+                "precision_score": precision_score,
+                "reverse_score": 0,
+            }
+        )
+
+    evaluated_candidates.sort(key=lambda item: item["match_score"], reverse=True)
+    return evaluated_candidates
 
-        evaluated_candidates.sort(key=lambda item: item["match_score"], reverse=True)
 
-        for candidate in evaluated_candidates[:3]:
-            reverse_score = score_reverse_geocode_candidate(address, candidate["location"])
+def find_confident_candidate(evaluated_candidates):
+    if not evaluated_candidates:
+        return None
+    best_candidate = evaluated_candidates[0]
+    if best_candidate["match_score"] >= get_env_int("GEOCODE_CONFIDENCE_SCORE", DEFAULT_GEOCODE_CONFIDENCE_SCORE):
+        return best_candidate
+    return None
+
+
+def build_geocode_result(candidate, resolution_tier):
+    with _resolution_tier_lock:
+        _resolution_tier_counts[resolution_tier] = _resolution_tier_counts.get(resolution_tier, 0) + 1
+
+    location = candidate["location"]
+    return {
+        "location": location,
+        "match_score": candidate["match_score"],
+        "match_quality": assess_match_quality(candidate["match_score"]),
+        "source": get_location_source(location),
+        "resolution_tier": resolution_tier,
+    }
+
+
+def get_geocode_resolution_stats():
+    with _resolution_tier_lock:
+        tiers = dict(_resolution_tier_counts)
+    return {
+        "tiered_evaluation": get_env_flag("GEOCODE_TIERED_EVALUATION"),
+        "confidence_score": get_env_int("GEOCODE_CONFIDENCE_SCORE", DEFAULT_GEOCODE_CONFIDENCE_SCORE),
+        "tiers": tiers,
+    }
+
+
+def geocode_location(address):
+    try:
+        provider = get_geocoder_provider()
+        country_code = get_country_code(address.get("country", ""))
+        deadline = time.monotonic() + GEOCODE_DEADLINE_SECONDS
+        futures = submit_geocode_fetches(plan_geocode_fetches(address, provider, country_code), deadline)
+        tiered = get_env_flag("GEOCODE_TIERED_EVALUATION")
+        candidates = []
+        timed_out = False
+
+        # Tiered mode submits the PointAddress probe with the other fetches but reads it first, and
+        # answers from it alone when its forward plus precision score clears GEOCODE_CONFIDENCE_SCORE.
+        point_futures = [item for item in futures if item[0] == "arcgis-pointaddress"]
+        if tiered and point_futures:
+            candidates, timed_out = collect_geocode_candidates(point_futures, deadline)
+            confident_candidate = find_confident_candidate(evaluate_geocode_candidates(address, candidates))
+            if confident_candidate:
+                # Fetches still queued are dropped; ones already running finish in the background.
+                for _, future in futures:
+                    future.cancel()
+                return build_geocode_result(confident_candidate, "pointaddress")
+            futures = [item for item in futures if item[0] != "arcgis-pointaddress"]
+
+        fetched_candidates, fetch_timed_out = collect_geocode_candidates(futures, deadline)
+        # PointAddress results always merge last, matching the untiered order.
+        candidates = [*fetched_candidates, *candidates]
+        timed_out = timed_out or fetch_timed_out
+
+        evaluated_candidates = evaluate_geocode_candidates(address, candidates)
+        if not evaluated_candidates:
+            if timed_out:
+                raise HTTPException(status_code=408, detail="Geocoding service timed out")
+            raise HTTPException(status_code=404, detail="Address not found")
+
+        if tiered:
+            confident_candidate = find_confident_candidate(evaluated_candidates)
+            if confident_candidate:
+                return build_geocode_result(confident_candidate, "forward")
+
+        reverse_checks = [
+            (
+                candidate,
+                submit_geocode_task(score_reverse_geocode_candidate, address, candidate["location"], deadline=deadline),
+            )
+            for candidate in evaluated_candidates[:GEOCODE_REVERSE_CHECK_LIMIT]
+        ]
+        for candidate, future in reverse_checks:
+            # A reverse check that misses the deadline scores 0, the same as one that fails.
+            reverse_score, _ = collect_geocode_result(future, deadline, "reverse check", 0)
             candidate["reverse_score"] = reverse_score
             candidate["match_score"] += reverse_score
 
         best_candidate = max(evaluated_candidates, key=lambda item: item["match_score"])
-        best_location = best_candidate["location"]
-        match_score = best_candidate["match_score"]
-        source = get_location_source(best_location)
-
-        return {
-            "location": best_location,
-            "match_score": match_score,
-            "match_quality": assess_match_quality(match_score),
-            "source": source,
-        }
+        return build_geocode_result(best_candidate, "reverse-verified")
     except HTTPException:
         raise
     except GeocoderTimedOut:
@@ -1163,47 +1410,54 @@ def geocode_address(address):
     return location.latitude, location.longitude
 
 
+def build_arcgis_reverse_location(latitude, longitude, payload):
+    reverse_address = payload.get("address", {}) or {}
+    house_number = reverse_address.get("AddNum", "")
+    road = (reverse_address.get("Address", "") or "").strip()
+    if house_number and road.lower().startswith(f"{house_number.lower()} "):
+        road = road[len(house_number):].strip()
+    formatted_address = (
+        reverse_address.get("LongLabel")
+        or reverse_address.get("Match_addr")
+        or reverse_address.get("Address")
+        or f"{round(latitude, 6)}, {round(longitude, 6)}"
+    )
+    return build_location(
+        formatted_address,
+        latitude,
+        longitude,
+        {
+            "provider": "arcgis",
+            "source": "arcgis-reverse",
+            "boundingbox": None,
+            "address": {
+                "house_number": house_number,
+                "road": road,
+                "city": reverse_address.get("City", ""),
+                "state": reverse_address.get("RegionAbbr", "") or reverse_address.get("Region", ""),
+                "postcode": reverse_address.get("Postal", ""),
+                "country": reverse_address.get("CntryName", "") or reverse_address.get("CountryCode", ""),
+            },
+            "raw_address": reverse_address,
+        },
+    )
+
+
 def reverse_geocode_location(latitude, longitude):
     try:
         if get_geocoder_provider() == "arcgis":
             payload = reverse_geocode_arcgis_location(latitude, longitude)
-            reverse_address = payload.get("address", {}) or {}
-            house_number = reverse_address.get("AddNum", "")
-            road = (reverse_address.get("Address", "") or "").strip()
-            if house_number and road.lower().startswith(f"{house_number.lower()} "):
-                road = road[len(house_number):].strip()
-            formatted_address = (
-                reverse_address.get("LongLabel")
-                or reverse_address.get("Match_addr")
-                or reverse_address.get("Address")
-                or f"{round(latitude, 6)}, {round(longitude, 6)}"
+            return build_arcgis_reverse_location(latitude, longitude, payload)
+
+        acquire_provider_token("nominatim")
+        with _nominatim_lock:
+            location = geolocator.reverse(
+                f"{latitude}, {longitude}",
+                timeout=10,
+                exactly_one=True,
+                zoom=18,
+                addressdetails=True,
             )
-            return build_location(
-                formatted_address,
-                latitude,
-                longitude,
-                {
-                    "provider": "arcgis",
-                    "source": "arcgis-reverse",
-                    "boundingbox": None,
-                    "address": {
-                        "house_number": house_number,
-                        "road": road,
-                        "city": reverse_address.get("City", ""),
-                        "state": reverse_address.get("RegionAbbr", "") or reverse_address.get("Region", ""),
-                        "postcode": reverse_address.get("Postal", ""),
-                        "country": reverse_address.get("CntryName", "") or reverse_address.get("CountryCode", ""),
-                    },
-                },
-            )
-
-        location = geolocator.reverse(
-            f"{latitude}, {longitude}",
-            timeout=10,
-            exactly_one=True,
-            zoom=18,
-            addressdetails=True,
-        )
 
         if not location:
             raise HTTPException(status_code=404, detail="Unable to resolve an address from browser location")
@@ -1232,9 +1486,83 @@ async def store_user_data(request: Request, user_data: UserData):
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+TIMEZONE_CACHE_SIZE = max(get_env_int("TIMEZONE_CACHE_SIZE", 4096), 1)
+TIMEZONE_COORDINATE_PRECISION = 4
+_timezone_finder = None
+_timezone_finder_lock = threading.Lock()
+_timezone_lookup_lock = threading.Lock()
+
+
+def get_timezone_finder():
+    global _timezone_finder
+    if _timezone_finder is None:
+        with _timezone_finder_lock:
+            if _timezone_finder is None:
+                _timezone_finder = TimezoneFinder()
+    return _timezone_finder
+
+
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def _resolve_timezone(lat, lon):
+    finder = get_timezone_finder()
+    with _timezone_lookup_lock:
+        return finder.timezone_at(lat=lat, lng=lon)
+
+
 def get_timezone(lat, lon):
-    tf = TimezoneFinder()
-    return tf.timezone_at(lat=lat, lng=lon)
+    return _resolve_timezone(
+        round(float(lat), TIMEZONE_COORDINATE_PRECISION),
+        round(float(lon), TIMEZONE_COORDINATE_PRECISION),
+    )
+
+
+def get_timezone_cache_stats():
+    cache_info = _resolve_timezone.cache_info()
+    return {
+        "hits": cache_info.hits,
+        "misses": cache_info.misses,
+        "size": cache_info.currsize,
+        "max_size": cache_info.maxsize,
+        "coordinate_precision": TIMEZONE_COORDINATE_PRECISION,
+        "finder_loaded": _timezone_finder is not None,
+    }
+
+
+async def _prefetch_entry(entry):
+    cache = entry["cache"]
+    # Cache lookups and writes can touch SQLite, so they stay off the event loop.
+    if await run_in_threadpool(cache.get_fresh, entry["key"]):
+        return False
+    try:
+        response = await http_client.async_get(entry["url"], params=entry.get("params"), timeout=entry.get("timeout"))
+        response.raise_for_status()
+        data = entry["decode"](response.text)
+    except (httpx.HTTPError, ValueError) as exc:
+        # The sync build stage retries the request and applies its own stale fallback.
+        logger.warning("Async prefetch failed for %s: %s", entry["url"], str(exc))
+        return False
+    await run_in_threadpool(cache.set, entry["key"], data, entry["ttl_seconds"])
+    return True
+
+
+async def prefetch_upstream(plan_builder, *args, **kwargs):
+    """Fetch an endpoint's upstream requests concurrently on the event loop and warm their caches.
+
+    Plan entries carry ``cache``, ``key``, ``url``, ``params``, ``ttl_seconds`` and ``decode``, so the
+    threadpool build stage that runs afterwards finds the entries under the keys it would have used
+    instead of holding a worker thread on upstream I/O. UPSTREAM_ASYNC_PREFETCH=false turns it off.
+    """
+    if not get_env_flag("UPSTREAM_ASYNC_PREFETCH", True):
+        return 0
+    try:
+        plan = plan_builder(*args, **kwargs)
+        if not plan:
+            return 0
+        results = await asyncio.gather(*(_prefetch_entry(entry) for entry in plan))
+    except Exception as exc:
+        logger.warning("Async upstream prefetch skipped: %s", str(exc))
+        return 0
+    return sum(1 for fetched in results if fetched)
 
 
 def clamp(value, minimum, maximum):
@@ -2638,6 +2966,42 @@ def save_property_record(payload: PropertyRecordRequest):
     }
 
 
+def lookup_indexed_preview(address_dict, cache_key, formatted_address):
+    # Near-duplicate spellings ("Main St" / "Main Street", small typos) reuse a cached preview.
+    if not get_env_flag("ADDRESS_INDEX_ENABLED", True):
+        return None
+
+    warm_address_index(FORWARD_PROPERTY_PREVIEW_CACHE)
+    match = get_address_index().match(address_dict)
+    if not match or match[0] == cache_key:
+        return None
+    if match[1] == "hint":
+        # A similar but not near-identical street name may be a different street: ask the provider.
+        logger.debug("Address index hint for %s (similarity %s) needs a provider lookup", cache_key, match[2])
+        return None
+
+    matched_key, match_type, similarity = match
+    cached_preview = get_geocode_cache(FORWARD_PROPERTY_PREVIEW_CACHE, matched_key)
+    if not cached_preview:
+        get_address_index().discard(matched_key)
+        return None
+
+    payload = {
+        **cached_preview,
+        "query": formatted_address,
+        "index_match": {"type": match_type, "similarity": similarity},
+    }
+    if match_type != "exact":
+        # A fuzzy hit is a guess: it is never cached under the new key, and never reported as high.
+        if payload.get("match_quality") == "high":
+            payload["match_quality"] = "medium"
+        return payload
+
+    store_geocode_cache(FORWARD_PROPERTY_PREVIEW_CACHE, cache_key, payload, payload.get("source"))
+    get_address_index().add(cache_key, [address_dict])
+    return payload
+
+
 @app.post(
     "/api/property-preview",
     response_model=dict,
@@ -2652,6 +3016,10 @@ def preview_property(address: Address):
         return cached_preview
 
     formatted_address = format_address(address_dict)
+    indexed_preview = lookup_indexed_preview(address_dict, cache_key, formatted_address)
+    if indexed_preview:
+        return indexed_preview
+
     geocode_result = geocode_location(address_dict)
     location = geocode_result["location"]
     raw_address = getattr(location, "raw", {}).get("address", {}) or {}
@@ -2666,6 +3034,7 @@ def preview_property(address: Address):
         "source": geocode_result.get("source", "nominatim"),
         "match_quality": geocode_result["match_quality"],
         "match_score": geocode_result["match_score"],
+        "resolution_tier": geocode_result.get("resolution_tier"),
         "address": normalized_address,
     }
     store_geocode_cache(
@@ -2674,9 +3043,49 @@ def preview_property(address: Address):
         payload,
         payload.get("source"),
     )
+    get_address_index().add(cache_key, [address_dict, normalized_address])
     return payload
 
 
+def lookup_cached_preview(address_dict, cache_key):
+    return get_geocode_cache(FORWARD_PROPERTY_PREVIEW_CACHE, cache_key) or lookup_indexed_preview(
+        address_dict,
+        cache_key,
+        format_address(address_dict),
+    )
+
+
+def stream_property_preview_batch(addresses, workers=None):
+    provider = get_geocoder_provider()
+    results = run_batch(
+        addresses,
+        lookup_cached_preview,
+        lambda address_dict: preview_property(Address(**address_dict)),
+        workers=workers,
+        providers={"arcgis": ("arcgis",), "nominatim": ("nominatim",)}.get(provider, ("nominatim", "arcgis")),
+    )
+    for result in results:
+        yield json.dumps(result) + "\n"
+
+
+@app.post(
+    "/api/property-preview/batch",
+    summary="Locate Properties In Bulk",
+    description="Geocodes a list of addresses and streams one NDJSON line per address as results arrive. Duplicates are resolved once, cache hits are sent first, and misses are rate limited per geocoding provider.",
+)
+def preview_property_batch(payload: PropertyPreviewBatchRequest):
+    max_addresses = get_env_int("GEOCODE_BATCH_MAX_ADDRESSES", 5000)
+    if len(payload.addresses) > max_addresses:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {max_addresses} addresses")
+
+    addresses = [address.model_dump() for address in payload.addresses]
+    workers = min(payload.workers, get_env_int("GEOCODE_BATCH_MAX_WORKERS", 8)) if payload.workers else None
+    return StreamingResponse(
+        stream_property_preview_batch(addresses, workers=workers),
+        media_type="application/x-ndjson",
+    )
+
+
 @app.post(
     "/api/reverse-geocode",
     response_model=dict,
@@ -2690,20 +3099,7 @@ def reverse_geocode_property(coordinates: Coordinates):
         return cached_preview
 
     location = reverse_geocode_location(coordinates.latitude, coordinates.longitude)
-    raw_address = getattr(location, "raw", {}).get("address", {}) or {}
-    normalized_address = extract_address_parts(raw_address)
-
-    payload = {
-        "query": f"{round(coordinates.latitude, 6)}, {round(coordinates.longitude, 6)}",
-        "formatted_address": location.address or format_address(normalized_address),
-        "latitude": round(location.latitude, 6),
-        "longitude": round(location.longitude, 6),
-        "bounds": parse_bounding_box(location),
-        "source": "browser-location",
-        "match_quality": "high",
-        "match_score": None,
-        "address": normalized_address,
-    }
+    payload = build_reverse_preview_payload(location, coordinates.latitude, coordinates.longitude)
     store_geocode_cache(
         REVERSE_PROPERTY_PREVIEW_CACHE,
         cache_key,
@@ -2719,12 +3115,15 @@ def reverse_geocode_property(coordinates: Coordinates):
     summary="Get Property Context",
     description="Returns first-pass building, vegetation, and terrain context around the property for Solar Buddy and Garden Buddy.",
 )
-def get_property_context(payload: PropertyContextRequest):
+async def get_property_context(payload: PropertyContextRequest):
+    bounds = payload.bounds.model_dump() if payload.bounds else None
+    await prefetch_upstream(build_property_context_fetch_plan, payload.latitude, payload.longitude, bounds)
     try:
-        return get_property_context_snapshot(
+        return await run_in_threadpool(
+            get_property_context_snapshot,
             payload.latitude,
             payload.longitude,
-            bounds=payload.bounds.model_dump() if payload.bounds else None,
+            bounds=bounds,
             match_quality=payload.match_quality,
         )
     except requests.HTTPError as exc:
@@ -2741,10 +3140,18 @@ def get_property_context(payload: PropertyContextRequest):
     summary="Get Space Weather",
     description="Returns live flare, solar wind, and geomagnetic context localized to the provided coordinates.",
 )
-def get_space_weather(coordinates: Coordinates):
-    time_zone = get_timezone(coordinates.latitude, coordinates.longitude) or "UTC"
+async def get_space_weather(coordinates: Coordinates):
+    time_zone = await run_in_threadpool(get_timezone, coordinates.latitude, coordinates.longitude) or "UTC"
+    await prefetch_upstream(
+        build_space_weather_fetch_plan,
+        coordinates.latitude,
+        coordinates.longitude,
+        time_zone,
+        force_refresh=coordinates.force_refresh,
+    )
     try:
-        return get_space_weather_snapshot(
+        return await run_in_threadpool(
+            get_space_weather_snapshot,
             coordinates.latitude,
             coordinates.longitude,
             time_zone,
@@ -2796,15 +3203,27 @@ def get_space_weather_history_endpoint(payload: SpaceWeatherHistoryRequest):
     summary="Get Surface Irradiance",
     description="Returns live and near-term surface irradiance conditions for the provided coordinates.",
 )
-def get_surface_irradiance(coordinates: Coordinates):
-    time_zone = get_timezone(coordinates.latitude, coordinates.longitude) or "UTC"
+async def get_surface_irradiance(coordinates: Coordinates):
+    time_zone = await run_in_threadpool(get_timezone, coordinates.latitude, coordinates.longitude) or "UTC"
+    await prefetch_upstream(
+        build_surface_irradiance_fetch_plan,
+        coordinates.latitude,
+        coordinates.longitude,
+        time_zone,
+        force_refresh=coordinates.force_refresh,
+    )
     property_context = None
     if coordinates.guid:
-        property_record = get_property_record(coordinates.guid)
+        property_record = await run_in_threadpool(
+            get_property_record,
+            coordinates.guid,
+            fields=("property_context",),
+        )
         if property_record:
             property_context = property_record.get("property_context")
     try:
-        return get_surface_irradiance_snapshot(
+        return await run_in_threadpool(
+            get_surface_irradiance_snapshot,
             coordinates.latitude,
             coordinates.longitude,
             time_zone,
@@ -2838,23 +3257,32 @@ def fetch_garden_crop_catalog():
     summary="Get Property Climate",
     description="Returns historical climate context and an estimated hardiness band for the provided coordinates.",
 )
-def get_property_climate(coordinates: Coordinates):
+async def get_property_climate(coordinates: Coordinates):
     if not coordinates.force_refresh:
-        cached_snapshot = get_cached_property_climate(
+        cached_snapshot = await run_in_threadpool(
+            get_cached_property_climate,
             coordinates.latitude,
             coordinates.longitude,
         )
         if cached_snapshot:
             return cached_snapshot
 
-    time_zone = get_timezone(coordinates.latitude, coordinates.longitude) or "UTC"
+    time_zone = await run_in_threadpool(get_timezone, coordinates.latitude, coordinates.longitude) or "UTC"
+    await prefetch_upstream(
+        build_property_climate_fetch_plan,
+        coordinates.latitude,
+        coordinates.longitude,
+        time_zone,
+    )
     try:
-        snapshot = get_property_climate_snapshot(
+        snapshot = await run_in_threadpool(
+            get_property_climate_snapshot,
             coordinates.latitude,
             coordinates.longitude,
             time_zone,
         )
-        store_cached_property_climate(
+        await run_in_threadpool(
+            store_cached_property_climate,
             coordinates.latitude,
             coordinates.longitude,
             snapshot,
@@ -2869,8 +3297,8 @@ def get_property_climate(coordinates: Coordinates):
 
 
 @app.post("/api/solar-potential", response_model=dict, summary="Calculate Solar Potential", description="Calculates the solar potential based on user data and system specifications.")
-def calculate_solar_potential(input_data: SolarPotentialRequest):
-    return build_solar_estimate_response(input_data)
+async def calculate_solar_potential(input_data: SolarPotentialRequest):
+    return await run_in_threadpool(build_solar_estimate_response, input_data)
 
 
 @app.post(
@@ -3065,6 +3493,53 @@ def get_solar_quote(quote_id: str):
 def health_check():
     return {"status": "ok"}
 
+
+@app.get("/metrics", response_model=dict, include_in_schema=False)
+def get_metrics():
+    return {
+        "timezone_cache": get_timezone_cache_stats(),
+        "reverse_checks": get_reverse_check_stats(),
+        "geocode_resolution": get_geocode_resolution_stats(),
+        "address_index": get_address_index().stats(),
+        "provider_rate_limits": get_provider_bucket_stats(),
+        "sqlite_connections": get_connection_pool_stats(),
+        "write_behind": get_write_behind_stats(),
+        "response_caches": get_response_cache_stats(),
+        "memory_stores": get_bounded_store_stats(),
+        "http_client": http_client.get_http_client_stats(),
+    }
+
+
+_maintenance_task = None
+
+
+@app.on_event("startup")
+async def start_database_maintenance():
+    global _maintenance_task
+
+    interval_seconds = get_env_int("APP_DB_MAINTENANCE_INTERVAL_SECONDS", 0)
+    if interval_seconds > 0:
+        _maintenance_task = asyncio.create_task(run_maintenance_periodically(interval_seconds))
+
+
+@app.on_event("startup")
+async def start_address_index_warmup():
+    # Warm in the background; lookups before it finishes just fall through to the providers.
+    if get_env_flag("ADDRESS_INDEX_ENABLED", True):
+        asyncio.get_running_loop().run_in_executor(None, warm_address_index, FORWARD_PROPERTY_PREVIEW_CACHE)
+
+
+@app.on_event("shutdown")
+async def close_persistence_connections():
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+    flush_write_behind()
+    close_connections()
+    close_response_cache_persistence()
+    http_client.close_sessions()
+    await http_client.close_async_clients()
+
+
 @app.get("/api/privacy-policy", response_model=dict, summary="Get Privacy Policy", description="Returns the privacy policy of the application.")
 def get_privacy_policy():
     policy_text = """
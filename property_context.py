@@ -1,21 +1,47 @@
 from __future__ import annotations
 
+import contextvars
+import json
+import logging
 import math
+import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Any, Optional
 
 import requests
 
+from env_settings import env_float, env_int
+import http_client
+from response_cache import get_response_cache
 
-_CACHE: dict[tuple[str, tuple[tuple[str, str], ...]], dict[str, Any]] = {}
+
+logger = logging.getLogger(__name__)
+
+_CACHE = get_response_cache("property-context")
+
+
+_FETCH_LOCKS: dict[tuple[str, tuple[tuple[str, str], ...]], threading.Lock] = {}
+_FETCH_LOCKS_GUARD = threading.Lock()
 
 OVERPASS_INTERPRETER_URL = "https://overpass-api.de/api/interpreter"
+OVERPASS_QUERY_MODES = {"tiled", "combined", "separate"}
+OVERPASS_TILE_METERS = max(env_float("PROPERTY_CONTEXT_OVERPASS_TILE_METERS", 250), 50.0)
+# Pads each tile by the largest building/canopy search radius so any point inside can be answered locally.
+OVERPASS_TILE_PADDING_METERS = 105
 OPEN_TOPO_DATA_URL = "https://api.opentopodata.org/v1/srtm90m"
 EARTH_RADIUS_METERS = 6371000
 SQ_METERS_TO_SQ_FEET = 10.7639
 BASELINE_PANEL_EFFICIENCY = 0.20
 ROOF_COVERAGE_FACTOR = 0.565
+CONTEXT_LAYER_DEADLINE_SECONDS = max(env_float("PROPERTY_CONTEXT_DEADLINE_SECONDS", 25), 0.0)
+CONTEXT_FETCH_WORKERS = max(env_int("PROPERTY_CONTEXT_FETCH_WORKERS", 12), 1)
+_FETCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=CONTEXT_FETCH_WORKERS,
+    thread_name_prefix="property-context-fetch",
+)
 
 
 def _normalize_params(params: Optional[dict[str, Any]]) -> tuple[tuple[str, str], ...]:
@@ -24,21 +50,37 @@ def _normalize_params(params: Optional[dict[str, Any]]) -> tuple[tuple[str, str]
     return tuple(sorted((str(key), str(value)) for key, value in params.items()))
 
 
+def _fetch_lock(key: tuple[str, tuple[tuple[str, str], ...]]):
+    with _FETCH_LOCKS_GUARD:
+        return _FETCH_LOCKS.setdefault(key, threading.Lock())
+
+
 def _fetch_json(url: str, params: Optional[dict[str, Any]] = None, ttl_seconds: int = 300):
     key = (url, _normalize_params(params))
-    now = time.time()
-    cached = _CACHE.get(key)
-    if cached and cached["expires_at"] > now:
+    cached = _CACHE.get_fresh(key)
+    if cached:
         return cached["data"]
 
-    response = requests.get(url, params=params, timeout=20)
-    response.raise_for_status()
-    data = response.json()
-    _CACHE[key] = {
-        "data": data,
-        "expires_at": now + ttl_seconds,
-    }
-    return data
+    # Concurrent layers asking for the same query wait for one upstream round trip.
+    with _fetch_lock(key):
+        cached = _CACHE.get(key)
+        if cached and cached["expires_at"] > time.time():
+            return cached["data"]
+
+        try:
+            response = http_client.get(url, params=params, timeout=20)
+            response.raise_for_status()
+            data = response.json()
+            _CACHE.set(key, data, ttl_seconds)
+            return data
+        except (requests.RequestException, ValueError):
+            if cached:
+                logger.warning("Using cached fallback for %s after upstream fetch failure", url, exc_info=True)
+                return cached["data"]
+            raise
+        finally:
+            with _FETCH_LOCKS_GUARD:
+                _FETCH_LOCKS.pop(key, None)
 
 
 def _safe_float(value: Any, default: Optional[float] = None):
@@ -790,26 +832,211 @@ def _build_overpass_canopy(latitude: float, longitude: float, radius_m: int):
     )
 
 
+def _get_overpass_query_mode():
+    # A padded tile is several times the area of one lookup, so tiling only pays off for dense
+    # batches of neighbouring properties and stays opt-in.
+    mode = (os.getenv("PROPERTY_CONTEXT_OVERPASS_MODE") or "combined").strip().lower()
+    return mode if mode in OVERPASS_QUERY_MODES else "combined"
+
+
+def _overpass_features_query(latitude: float, longitude: float, radius_m: int):
+    return (
+        f'[out:json][timeout:20];('
+        f'way["building"](around:{radius_m},{latitude},{longitude});'
+        f'node["natural"="tree"](around:{radius_m},{latitude},{longitude});'
+        f'way["natural"~"wood|tree_row|scrub"](around:{radius_m},{latitude},{longitude});'
+        f'way["landuse"~"forest|orchard|vineyard"](around:{radius_m},{latitude},{longitude});'
+        f');out tags geom center;'
+    )
+
+
+def _build_overpass_features(latitude: float, longitude: float, radius_m: int):
+    return _fetch_json(
+        OVERPASS_INTERPRETER_URL,
+        params={"data": _overpass_features_query(latitude, longitude, radius_m)},
+        ttl_seconds=86400,
+    )
+
+
+def _is_building_element(element: dict[str, Any]):
+    return element.get("type") == "way" and "building" in (element.get("tags") or {})
+
+
+def _is_canopy_element(element: dict[str, Any]):
+    tags = element.get("tags") or {}
+    if element.get("type") == "node":
+        return tags.get("natural") == "tree"
+    if element.get("type") != "way":
+        return False
+    return bool(
+        re.search(r"wood|tree_row|scrub", str(tags.get("natural") or ""))
+        or re.search(r"forest|orchard|vineyard", str(tags.get("landuse") or ""))
+    )
+
+
+def _local_xy_meters(latitude: float, longitude: float, origin_latitude: float, origin_longitude: float):
+    # Equirectangular projection is accurate to well under a meter at search-radius scale.
+    meters_per_degree = EARTH_RADIUS_METERS * math.pi / 180
+    return (
+        (longitude - origin_longitude) * meters_per_degree * math.cos(math.radians(origin_latitude)),
+        (latitude - origin_latitude) * meters_per_degree,
+    )
+
+
+def _segment_distance_to_origin(start: tuple[float, float], end: tuple[float, float]):
+    delta_x = end[0] - start[0]
+    delta_y = end[1] - start[1]
+    length_squared = delta_x * delta_x + delta_y * delta_y
+    if length_squared == 0:
+        return math.hypot(*start)
+    fraction = _clamp(-(start[0] * delta_x + start[1] * delta_y) / length_squared, 0, 1)
+    return math.hypot(start[0] + fraction * delta_x, start[1] + fraction * delta_y)
+
+
+def _polygon_contains_origin(points: list[tuple[float, float]]):
+    inside = False
+    for (x_a, y_a), (x_b, y_b) in zip(points, points[1:] + points[:1]):
+        if (y_a > 0) != (y_b > 0) and 0 < x_a + (0 - y_a) * (x_b - x_a) / (y_b - y_a):
+            inside = not inside
+    return inside
+
+
+def _element_within_radius(element: dict[str, Any], latitude: float, longitude: float, radius_m: float):
+    """Match Overpass ``around``: a way counts when any segment, not just a vertex, is in range."""
+    points = [
+        _local_xy_meters(float(point["lat"]), float(point["lon"]), latitude, longitude)
+        for point in (element.get("geometry") or [])
+        if point.get("lat") is not None and point.get("lon") is not None
+    ]
+    if not points:
+        for point in (element, element.get("center") or {}):
+            if point.get("lat") is not None and point.get("lon") is not None:
+                points = [_local_xy_meters(float(point["lat"]), float(point["lon"]), latitude, longitude)]
+                break
+    if not points:
+        return False
+
+    if len(points) == 1:
+        return math.hypot(*points[0]) <= radius_m
+    if any(_segment_distance_to_origin(start, end) <= radius_m for start, end in zip(points, points[1:])):
+        return True
+    # A closed way that surrounds the point intersects the circle even when every edge is outside it.
+    return len(points) >= 4 and points[0] == points[-1] and _polygon_contains_origin(points[:-1])
+
+
+def _filter_overpass_elements(
+    payload: dict[str, Any],
+    latitude: float,
+    longitude: float,
+    radius_m: int,
+    predicate,
+):
+    return {
+        "elements": [
+            element
+            for element in payload.get("elements") or []
+            if predicate(element) and _element_within_radius(element, latitude, longitude, radius_m)
+        ]
+    }
+
+
+def _combined_overpass_radius(envelope: dict[str, Any]):
+    return max(_building_search_radius(envelope), _canopy_search_radius(envelope))
+
+
+def _overpass_tile_bounds(latitude: float, longitude: float):
+    lat_step = _meters_to_lat_delta(OVERPASS_TILE_METERS)
+    south = math.floor(latitude / lat_step) * lat_step
+    north = south + lat_step
+    row_latitude = south + lat_step / 2
+    lon_step = _meters_to_lon_delta(OVERPASS_TILE_METERS, row_latitude)
+    west = math.floor(longitude / lon_step) * lon_step
+    east = west + lon_step
+
+    lat_padding = _meters_to_lat_delta(OVERPASS_TILE_PADDING_METERS)
+    lon_padding = _meters_to_lon_delta(OVERPASS_TILE_PADDING_METERS, row_latitude)
+    return {
+        "south": round(south - lat_padding, 6),
+        "west": round(west - lon_padding, 6),
+        "north": round(north + lat_padding, 6),
+        "east": round(east + lon_padding, 6),
+    }
+
+
+def _overpass_tile_query(bounds: dict[str, float]):
+    bbox = f"{bounds['south']},{bounds['west']},{bounds['north']},{bounds['east']}"
+    return (
+        f'[out:json][timeout:25][bbox:{bbox}];('
+        f'way["building"];'
+        f'node["natural"="tree"];'
+        f'way["natural"~"wood|tree_row|scrub"];'
+        f'way["landuse"~"forest|orchard|vineyard"];'
+        f');out tags geom center;'
+    )
+
+
+def _build_overpass_tile_features(bounds: dict[str, float]):
+    return _fetch_json(
+        OVERPASS_INTERPRETER_URL,
+        params={"data": _overpass_tile_query(bounds)},
+        ttl_seconds=86400,
+    )
+
+
+def _load_overpass_layer(
+    latitude: float,
+    longitude: float,
+    envelope: dict[str, Any],
+    radius_m: int,
+    predicate,
+    separate_fetch,
+):
+    mode = _get_overpass_query_mode()
+    if mode == "separate":
+        return separate_fetch(latitude, longitude, radius_m)
+
+    if mode == "tiled":
+        payload = _build_overpass_tile_features(_overpass_tile_bounds(latitude, longitude))
+    else:
+        payload = _build_overpass_features(latitude, longitude, _combined_overpass_radius(envelope))
+    return _filter_overpass_elements(payload, latitude, longitude, radius_m, predicate)
+
+
+def _building_search_radius(envelope: dict[str, Any]):
+    return int(_clamp(max(envelope.get("width_m") or 0, envelope.get("height_m") or 0) * 0.95, 50, 95))
+
+
+def _build_unavailable_building_context(radius_m: int):
+    return {
+        "source": "openstreetmap-overpass",
+        "search_radius_m": radius_m,
+        "building_count": 0,
+        "nearby_buildings": [],
+        "nearest_building": None,
+        "directional_pressure": {
+            "north": 0.0,
+            "south": 0.0,
+            "east": 0.0,
+            "west": 0.0,
+        },
+        "obstruction_risk": "low",
+        "summary": "Mapped building context is unavailable for this property right now.",
+    }
+
+
 def _build_building_context(latitude: float, longitude: float, envelope: dict[str, Any]):
-    radius_m = int(_clamp(max(envelope.get("width_m") or 0, envelope.get("height_m") or 0) * 0.95, 50, 95))
+    radius_m = _building_search_radius(envelope)
     try:
-        payload = _build_overpass_buildings(latitude, longitude, radius_m)
+        payload = _load_overpass_layer(
+            latitude,
+            longitude,
+            envelope,
+            radius_m,
+            _is_building_element,
+            _build_overpass_buildings,
+        )
     except requests.RequestException:
-        return {
-            "source": "openstreetmap-overpass",
-            "search_radius_m": radius_m,
-            "building_count": 0,
-            "nearby_buildings": [],
-            "nearest_building": None,
-            "directional_pressure": {
-                "north": 0.0,
-                "south": 0.0,
-                "east": 0.0,
-                "west": 0.0,
-            },
-            "obstruction_risk": "low",
-            "summary": "Mapped building context is unavailable for this property right now.",
-        }
+        return _build_unavailable_building_context(radius_m)
     directional_scores = {"north": 0.0, "south": 0.0, "east": 0.0, "west": 0.0}
     nearby_buildings = []
 
@@ -1066,25 +1293,40 @@ def _build_roof_capacity_context(
     }
 
 
+def _canopy_search_radius(envelope: dict[str, Any]):
+    return int(_clamp(max(envelope.get("width_m") or 0, envelope.get("height_m") or 0) * 1.05, 35, 85))
+
+
+def _build_unavailable_canopy_context(radius_m: int):
+    return {
+        "source": "openstreetmap-overpass",
+        "search_radius_m": radius_m,
+        "canopy_count": 0,
+        "nearby_canopy": [],
+        "nearest_canopy": None,
+        "directional_pressure": {
+            "north": 0.0,
+            "south": 0.0,
+            "east": 0.0,
+            "west": 0.0,
+        },
+        "summary": "Mapped canopy context is unavailable for this property right now.",
+    }
+
+
 def _build_canopy_context(latitude: float, longitude: float, envelope: dict[str, Any]):
-    radius_m = int(_clamp(max(envelope.get("width_m") or 0, envelope.get("height_m") or 0) * 1.05, 35, 85))
+    radius_m = _canopy_search_radius(envelope)
     try:
-        payload = _build_overpass_canopy(latitude, longitude, radius_m)
+        payload = _load_overpass_layer(
+            latitude,
+            longitude,
+            envelope,
+            radius_m,
+            _is_canopy_element,
+            _build_overpass_canopy,
+        )
     except requests.RequestException:
-        return {
-            "source": "openstreetmap-overpass",
-            "search_radius_m": radius_m,
-            "canopy_count": 0,
-            "nearby_canopy": [],
-            "nearest_canopy": None,
-            "directional_pressure": {
-                "north": 0.0,
-                "south": 0.0,
-                "east": 0.0,
-                "west": 0.0,
-            },
-            "summary": "Mapped canopy context is unavailable for this property right now.",
-        }
+        return _build_unavailable_canopy_context(radius_m)
 
     directional_scores = {"north": 0.0, "south": 0.0, "east": 0.0, "west": 0.0}
     nearby_canopy = []
@@ -1189,24 +1431,42 @@ def _build_canopy_context(latitude: float, longitude: float, envelope: dict[str,
     }
 
 
+def _terrain_sample_params(samples: list[dict[str, Any]]):
+    return {"locations": "|".join(f"{sample['lat']:.6f},{sample['lng']:.6f}" for sample in samples)}
+
+
 def _fetch_terrain_samples(samples: list[dict[str, Any]]):
-    locations = "|".join(f"{sample['lat']:.6f},{sample['lng']:.6f}" for sample in samples)
     return _fetch_json(
         OPEN_TOPO_DATA_URL,
-        params={"locations": locations},
+        params=_terrain_sample_params(samples),
         ttl_seconds=86400,
     )
 
 
-def _build_terrain_context(latitude: float, longitude: float, envelope: dict[str, Any]):
-    sample_radius_m = int(_clamp(max(envelope.get("width_m") or 0, envelope.get("height_m") or 0) * 0.55, 24, 42))
-    samples = [
+def _terrain_sample_radius(envelope: dict[str, Any]):
+    return int(_clamp(max(envelope.get("width_m") or 0, envelope.get("height_m") or 0) * 0.55, 24, 42))
+
+
+def _build_terrain_samples(latitude: float, longitude: float, sample_radius_m: int):
+    return [
         {"id": "center", "lat": round(latitude, 6), "lng": round(longitude, 6)},
         {"id": "north", **_offset_coordinate(latitude, longitude, north_meters=sample_radius_m)},
         {"id": "south", **_offset_coordinate(latitude, longitude, north_meters=-sample_radius_m)},
         {"id": "east", **_offset_coordinate(latitude, longitude, east_meters=sample_radius_m)},
         {"id": "west", **_offset_coordinate(latitude, longitude, east_meters=-sample_radius_m)},
     ]
+
+
+def _build_unavailable_terrain_context():
+    return {
+        "source": "opentopodata-srtm90m",
+        "summary": "Terrain context is unavailable for this property right now.",
+    }
+
+
+def _build_terrain_context(latitude: float, longitude: float, envelope: dict[str, Any]):
+    sample_radius_m = _terrain_sample_radius(envelope)
+    samples = _build_terrain_samples(latitude, longitude, sample_radius_m)
     payload = _fetch_terrain_samples(samples)
     elevations_by_id = {}
     enriched_samples = []
@@ -1231,10 +1491,7 @@ def _build_terrain_context(latitude: float, longitude: float, envelope: dict[str
     east_elevation = elevations_by_id.get("east")
     west_elevation = elevations_by_id.get("west")
     if not elevations_by_id:
-        return {
-            "source": "opentopodata-srtm90m",
-            "summary": "Terrain context is unavailable for this property right now.",
-        }
+        return _build_unavailable_terrain_context()
 
     relief_m = max(elevations_by_id.values()) - min(elevations_by_id.values())
     north_south_difference = (north_elevation or center_elevation or 0) - (south_elevation or center_elevation or 0)
@@ -1304,6 +1561,80 @@ def _build_shade_context(
     }
 
 
+def _gather_context_layers(latitude: float, longitude: float, envelope: dict[str, Any]):
+    layers = {
+        "building": (
+            _build_building_context,
+            lambda: _build_unavailable_building_context(_building_search_radius(envelope)),
+        ),
+        "terrain": (_build_terrain_context, _build_unavailable_terrain_context),
+        "canopy": (
+            _build_canopy_context,
+            lambda: _build_unavailable_canopy_context(_canopy_search_radius(envelope)),
+        ),
+    }
+    deadline = time.monotonic() + CONTEXT_LAYER_DEADLINE_SECONDS
+    # Upstream calls inside each layer, retries included, stop at the same deadline.
+    context = contextvars.copy_context()
+    context.run(http_client.request_deadline.set, deadline)
+    futures = {
+        name: _FETCH_EXECUTOR.submit(context.copy().run, builder, latitude, longitude, envelope)
+        for name, (builder, _) in layers.items()
+    }
+
+    results = {}
+    for name, future in futures.items():
+        fallback = layers[name][1]
+        try:
+            results[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning("Property %s context missed the %.1fs deadline", name, CONTEXT_LAYER_DEADLINE_SECONDS)
+            results[name] = fallback()
+        except requests.RequestException as exc:
+            logger.warning("Property %s context fetch failed: %s", name, exc)
+            results[name] = fallback()
+    return results
+
+
+def _plan_entry(url: str, params: dict[str, Any], ttl_seconds: int):
+    return {
+        "cache": _CACHE,
+        "key": (url, _normalize_params(params)),
+        "url": url,
+        "params": params,
+        "ttl_seconds": ttl_seconds,
+        "timeout": 20,
+        "decode": json.loads,
+    }
+
+
+def build_property_context_fetch_plan(
+    latitude: float,
+    longitude: float,
+    bounds: Optional[dict[str, Any]] = None,
+):
+    envelope = _build_context_envelope(latitude, longitude, bounds)
+    plan = [
+        _plan_entry(
+            OPEN_TOPO_DATA_URL,
+            _terrain_sample_params(
+                _build_terrain_samples(latitude, longitude, _terrain_sample_radius(envelope))
+            ),
+            ttl_seconds=86400,
+        )
+    ]
+    mode = _get_overpass_query_mode()
+    if mode == "tiled":
+        query = _overpass_tile_query(_overpass_tile_bounds(latitude, longitude))
+    elif mode == "combined":
+        query = _overpass_features_query(latitude, longitude, _combined_overpass_radius(envelope))
+    else:
+        return plan
+    plan.append(_plan_entry(OVERPASS_INTERPRETER_URL, {"data": query}, ttl_seconds=86400))
+    return plan
+
+
 def get_property_context_snapshot(
     latitude: float,
     longitude: float,
@@ -1311,14 +1642,15 @@ def get_property_context_snapshot(
     match_quality: Optional[str] = None,
 ):
     envelope = _build_context_envelope(latitude, longitude, bounds)
-    building_context = _build_building_context(latitude, longitude, envelope)
+    layers = _gather_context_layers(latitude, longitude, envelope)
+    building_context = layers["building"]
+    terrain_context = layers["terrain"]
+    canopy_context = layers["canopy"]
     roof_capacity_context = _build_roof_capacity_context(
         envelope,
         building_context,
         match_quality,
     )
-    terrain_context = _build_terrain_context(latitude, longitude, envelope)
-    canopy_context = _build_canopy_context(latitude, longitude, envelope)
     parcel_context = _build_parcel_context(
         latitude,
         longitude,
@@ -0,0 +1,489 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from env_settings import env_int
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_STALE_SECONDS = 7 * 86400
+DEFAULT_MEMORY_STORE_MAX_ENTRIES = 1024
+DEFAULT_MEMORY_STORE_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_PRUNE_EVERY_WRITES = 256
+
+_CACHES: dict[str, "ResponseCache"] = {}
+_STORES: dict[str, "BoundedLruStore"] = {}
+_CACHES_LOCK = threading.Lock()
+_PERSISTENCE_LOCK = threading.Lock()
+_persistence_connection: Optional[sqlite3.Connection] = None
+_persistence_path: Optional[str] = None
+
+
+def _persistence_db_path():
+    return (os.getenv("RESPONSE_CACHE_DB_PATH") or "").strip() or None
+
+
+def _persistence_key(key: Any):
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _estimate_size(data: Any):
+    if isinstance(data, (str, bytes)):
+        return len(data)
+    try:
+        return len(json.dumps(data, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _persistence_connect():
+    global _persistence_connection, _persistence_path
+
+    path = _persistence_db_path()
+    if not path:
+        return None
+    if _persistence_connection is not None and _persistence_path == path:
+        return _persistence_connection
+
+    close_persistence()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS response_cache (
+            namespace TEXT NOT NULL,
+            key_hash TEXT NOT NULL,
+            payload_json TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            ttl_seconds INTEGER NOT NULL,
+            PRIMARY KEY (namespace, key_hash)
+        )
+        """
+    )
+    connection.commit()
+    _persistence_connection = connection
+    _persistence_path = path
+    return connection
+
+
+def close_persistence():
+    global _persistence_connection, _persistence_path
+
+    if _persistence_connection is not None:
+        try:
+            _persistence_connection.close()
+        except sqlite3.Error:
+            pass
+    _persistence_connection = None
+    _persistence_path = None
+
+
+class BoundedLruStore:
+    """Mapping bounded by entry count and approximate byte size, evicting least recently written keys.
+
+    Reads do not reorder entries unless ``touch`` is called, so callers that list values by write
+    recency keep that ordering.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        entries_env: str = "APP_MEMORY_STORE_MAX_ENTRIES",
+        bytes_env: str = "APP_MEMORY_STORE_MAX_BYTES",
+        default_max_entries: int = DEFAULT_MEMORY_STORE_MAX_ENTRIES,
+        default_max_bytes: int = DEFAULT_MEMORY_STORE_MAX_BYTES,
+    ):
+        self.name = name
+        self.max_entries = max(
+            max_entries if max_entries is not None else env_int(entries_env, default_max_entries),
+            1,
+        )
+        self.max_bytes = max(
+            max_bytes if max_bytes is not None else env_int(bytes_env, default_max_bytes),
+            1,
+        )
+        self._entries: OrderedDict[Any, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    def _drop(self, key: Any):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item[1]
+        return item
+
+    def put(self, key: Any, value: Any, size_bytes: Optional[int] = None):
+        size_bytes = _estimate_size(value) if size_bytes is None else size_bytes
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, size_bytes)
+            self._bytes += size_bytes
+            # The newest entry is kept even when it alone exceeds the byte budget.
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def __setitem__(self, key: Any, value: Any):
+        self.put(key, value)
+
+    def get(self, key: Any, default: Any = None):
+        item = self._entries.get(key)
+        return default if item is None else item[0]
+
+    def __getitem__(self, key: Any):
+        return self._entries[key][0]
+
+    def __contains__(self, key: Any):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def touch(self, key: Any):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def pop(self, key: Any, default: Any = None):
+        with self._lock:
+            item = self._drop(key)
+        return default if item is None else item[0]
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def values(self):
+        with self._lock:
+            return [value for value, _ in self._entries.values()]
+
+    def items(self):
+        with self._lock:
+            return [(key, value) for key, (value, _) in self._entries.items()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class ResponseCache:
+    """Bounded LRU of upstream responses, kept past expiry for stale-while-error fallback.
+
+    Entries are dicts with ``data``, ``fetched_at``, ``expires_at`` and ``ttl_seconds`` so each
+    source keeps its own TTL. When RESPONSE_CACHE_DB_PATH is set, entries are also written to
+    SQLite and reloaded on a memory miss, which lets a restarted worker skip a cold fetch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_stale_seconds: Optional[int] = None,
+        persistent: bool = True,
+    ):
+        self.name = name
+        self._entries = BoundedLruStore(
+            name,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            entries_env="RESPONSE_CACHE_MAX_ENTRIES",
+            bytes_env="RESPONSE_CACHE_MAX_BYTES",
+            default_max_entries=DEFAULT_MAX_ENTRIES,
+            default_max_bytes=DEFAULT_MAX_BYTES,
+        )
+        self.max_stale_seconds = max(
+            max_stale_seconds
+            if max_stale_seconds is not None
+            else env_int("RESPONSE_CACHE_MAX_STALE_SECONDS", DEFAULT_MAX_STALE_SECONDS),
+            0,
+        )
+        self.persistent = persistent
+        self.prune_every_writes = max(env_int("RESPONSE_CACHE_PRUNE_EVERY_WRITES", DEFAULT_PRUNE_EVERY_WRITES), 1)
+        self._writes = 0
+        self._lock = threading.RLock()
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "persistent_hits": 0,
+            "pruned": 0,
+        }
+
+    def _is_retained(self, entry: dict[str, Any], now: float):
+        return entry["expires_at"] + self.max_stale_seconds > now
+
+    def _insert(self, key: Any, entry: dict[str, Any]):
+        self._entries.put(key, entry, size_bytes=entry["size_bytes"])
+
+    def _load_persisted(self, key: Any, now: float):
+        if not self.persistent:
+            return None
+        try:
+            with _PERSISTENCE_LOCK:
+                connection = _persistence_connect()
+                if connection is None:
+                    return None
+                row = connection.execute(
+                    """
+                    SELECT payload_json, fetched_at, expires_at, ttl_seconds
+                    FROM response_cache
+                    WHERE namespace = ? AND key_hash = ?
+                    """,
+                    (self.name, _persistence_key(key)),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Response cache %s lookup fell back to memory: %s", self.name, str(exc))
+            return None
+        if not row:
+            return None
+
+        payload_json, fetched_at, expires_at, ttl_seconds = row
+        try:
+            data = json.loads(payload_json)
+        except (TypeError, ValueError):
+            logger.warning("Response cache %s dropped a corrupt persisted row", self.name)
+            self._delete_persisted(key)
+            return None
+        entry = {
+            "data": data,
+            "fetched_at": float(fetched_at),
+            "expires_at": float(expires_at),
+            "ttl_seconds": int(ttl_seconds),
+            "size_bytes": len(payload_json),
+        }
+        if not self._is_retained(entry, now):
+            return None
+        return entry
+
+    def _delete_persisted(self, key: Any):
+        try:
+            with _PERSISTENCE_LOCK:
+                connection = _persistence_connect()
+                if connection is not None:
+                    connection.execute(
+                        "DELETE FROM response_cache WHERE namespace = ? AND key_hash = ?",
+                        (self.name, _persistence_key(key)),
+                    )
+                    connection.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Response cache %s delete skipped: %s", self.name, str(exc))
+
+    def _prune_persisted(self, connection: sqlite3.Connection, now: float):
+        # Rows past the stale window can never be served again; without this the table only grows.
+        deleted = connection.execute(
+            "DELETE FROM response_cache WHERE namespace = ? AND expires_at + ? <= ?",
+            (self.name, self.max_stale_seconds, now),
+        ).rowcount
+        self._counters["pruned"] += max(deleted, 0)
+        return deleted
+
+    def prune(self, now: Optional[float] = None):
+        """Delete persisted rows that aged past the stale window and return how many went."""
+        if not self.persistent:
+            return 0
+        try:
+            with _PERSISTENCE_LOCK:
+                connection = _persistence_connect()
+                if connection is None:
+                    return 0
+                deleted = self._prune_persisted(connection, time.time() if now is None else now)
+                connection.commit()
+                return deleted
+        except sqlite3.Error as exc:
+            logger.warning("Response cache %s prune skipped: %s", self.name, str(exc))
+            return 0
+
+    def _persist(self, key: Any, entry: dict[str, Any], payload_json: Optional[str]):
+        if not self.persistent or payload_json is None:
+            return
+        try:
+            with _PERSISTENCE_LOCK:
+                connection = _persistence_connect()
+                if connection is None:
+                    return
+                connection.execute(
+                    """
+                    INSERT INTO response_cache (namespace, key_hash, payload_json, fetched_at, expires_at, ttl_seconds)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(namespace, key_hash) DO UPDATE SET
+                        payload_json = excluded.payload_json,
+                        fetched_at = excluded.fetched_at,
+                        expires_at = excluded.expires_at,
+                        ttl_seconds = excluded.ttl_seconds
+                    """,
+                    (
+                        self.name,
+                        _persistence_key(key),
+                        payload_json,
+                        entry["fetched_at"],
+                        entry["expires_at"],
+                        entry["ttl_seconds"],
+                    ),
+                )
+                self._writes += 1
+                if self._writes % self.prune_every_writes == 0:
+                    self._prune_persisted(connection, entry["fetched_at"])
+                connection.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Response cache %s persistence fell back to memory: %s", self.name, str(exc))
+
+    def _lookup(self, key: Any, now: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_retained(entry, now):
+                self._entries.pop(key)
+                entry = None
+            if entry is not None:
+                self._entries.touch(key)
+                return entry
+
+        # The disk read runs outside the lock so other readers are not queued behind it.
+        loaded = self._load_persisted(key, now)
+        if loaded is None:
+            return None
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current["fetched_at"] >= loaded["fetched_at"]:
+                # A set that landed during the read is newer than the persisted copy.
+                self._entries.touch(key)
+                return current
+            self._counters["persistent_hits"] += 1
+            self._insert(key, loaded)
+            return loaded
+
+    def get(self, key: Any):
+        """Return the cached entry, fresh or stale, or None once it ages past the stale window."""
+        now = time.time()
+        entry = self._lookup(key, now)
+        with self._lock:
+            if entry is None:
+                self._counters["misses"] += 1
+            elif entry["expires_at"] > now:
+                self._counters["hits"] += 1
+            else:
+                self._counters["stale_hits"] += 1
+        return entry
+
+    def get_fresh(self, key: Any):
+        # A stale entry is a miss for callers that will refetch it.
+        now = time.time()
+        entry = self._lookup(key, now)
+        fresh = entry is not None and entry["expires_at"] > now
+        with self._lock:
+            self._counters["hits" if fresh else "misses"] += 1
+        return entry if fresh else None
+
+    def set(self, key: Any, data: Any, ttl_seconds: float, fetched_at: Optional[float] = None):
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        # Serialized once: the length sizes the memory entry and the text is what gets persisted.
+        try:
+            payload_json = json.dumps(data, default=str)
+        except (TypeError, ValueError) as exc:
+            logger.warning("Response cache %s kept an unserializable payload in memory only: %s", self.name, str(exc))
+            payload_json = None
+        entry = {
+            "data": data,
+            "fetched_at": fetched_at,
+            "expires_at": fetched_at + ttl_seconds,
+            "ttl_seconds": ttl_seconds,
+            "size_bytes": len(payload_json) if payload_json is not None else 0,
+        }
+        with self._lock:
+            self._insert(key, entry)
+        self._persist(key, entry, payload_json)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        if not self.persistent:
+            return
+        try:
+            with _PERSISTENCE_LOCK:
+                connection = _persistence_connect()
+                if connection is not None:
+                    connection.execute("DELETE FROM response_cache WHERE namespace = ?", (self.name,))
+                    connection.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Response cache %s clear skipped persistence: %s", self.name, str(exc))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                **self._entries.stats(),
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else None,
+                "persistent": self.persistent and _persistence_db_path() is not None,
+            }
+
+
+def get_response_cache(name: str, **options):
+    with _CACHES_LOCK:
+        cache = _CACHES.get(name)
+        if cache is None:
+            cache = ResponseCache(name, **options)
+            _CACHES[name] = cache
+        return cache
+
+
+def get_response_cache_stats():
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def prune_response_caches(now: Optional[float] = None):
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    return {cache.name: cache.prune(now) for cache in caches}
+
+
+def get_bounded_store(name: str, **options):
+    with _CACHES_LOCK:
+        store = _STORES.get(name)
+        if store is None:
+            store = BoundedLruStore(name, **options)
+            _STORES[name] = store
+        return store
+
+
+def get_bounded_store_stats():
+    with _CACHES_LOCK:
+        stores = list(_STORES.values())
+    return {store.name: store.stats() for store in stores}
@@ -0,0 +1,328 @@
+from abc import ABC, abstractmethod
+import itertools
+import logging
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+from env_settings import env_float
+
+try:
+    import psycopg
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg = None
+
+logger = logging.getLogger(__name__)
+
+# Every backend raises one of these; data_persistence catches them to fall back to memory.
+DATABASE_ERRORS = (sqlite3.Error,) + ((psycopg.Error,) if psycopg is not None else ())
+
+_DEFAULT_BUSY_TIMEOUT_SECONDS = 5.0
+_memory_database_ids = itertools.count(1)
+
+
+class StorageBackend(ABC):
+    """Opens DB-API connections for data_persistence and answers the few dialect-specific questions.
+
+    Connections must behave like ``sqlite3.Connection``: ``?`` placeholders, ``execute`` /
+    ``executemany`` / ``executescript``, rows indexable by name and position, and a context manager
+    that commits or rolls back without closing.
+    """
+
+    name = ""
+    dialect = "sqlite"
+    # Whether bytes can be written to the TEXT JSON columns (used by the compressed blob codec).
+    stores_binary_in_text_columns = True
+    # Whether every connection sees the same database, so the schema only needs to be created once.
+    shared = True
+
+    @property
+    @abstractmethod
+    def key(self):
+        """Identifies the database; connections and schema setup are pooled per key."""
+
+    @abstractmethod
+    def open(self):
+        """Return a new connection."""
+
+    @abstractmethod
+    def table_exists(self, connection, table_name):
+        pass
+
+    @abstractmethod
+    def table_columns(self, connection, table_name):
+        pass
+
+    def describe(self):
+        return {"backend": self.name, "dialect": self.dialect}
+
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path, busy_timeout=_DEFAULT_BUSY_TIMEOUT_SECONDS):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        # Each ":memory:" connection is its own database, so it always needs the schema.
+        self.shared = str(path) != ":memory:"
+
+    @property
+    def key(self):
+        return f"sqlite:{self.path}"
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+
+    def configure(self, connection):
+        if not self.shared:
+            return
+
+        # Only takes effect on a new database file; see db_maintenance for converting older ones.
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+        journal_mode = (os.getenv("APP_DB_JOURNAL_MODE") or "").strip().lower()
+        if journal_mode in {"wal", "delete", "truncate", "persist", "memory", "off"}:
+            connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+        synchronous = (os.getenv("APP_DB_SYNCHRONOUS") or "").strip().lower()
+        if synchronous in {"off", "normal", "full", "extra"}:
+            connection.execute(f"PRAGMA synchronous = {synchronous}")
+
+    def open(self):
+        connection = self._connect()
+        connection.row_factory = sqlite3.Row
+        try:
+            self.configure(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def table_exists(self, connection, table_name):
+        return connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table_name,),
+        ).fetchone() is not None
+
+    def table_columns(self, connection, table_name):
+        return {row["name"] for row in connection.execute(f"PRAGMA table_info({table_name})").fetchall()}
+
+    def describe(self):
+        return {**super().describe(), "path": str(self.path)}
+
+
+class MemoryBackend(SQLiteBackend):
+    """Process-local database shared by every thread; contents live until ``discard`` is called.
+
+    Uses SQLite's shared-cache in-memory mode, so the same SQL runs without touching the disk,
+    which suits tests and benchmarks.
+    """
+
+    name = "memory"
+
+    def __init__(self, label="default"):
+        self.label = label
+        self.uri = f"file:solar-potential-{label}-{next(_memory_database_ids)}?mode=memory&cache=shared"
+        super().__init__(self.uri)
+        # The in-memory database is dropped when its last connection closes.
+        self._anchor = self._connect()
+
+    @property
+    def key(self):
+        return f"memory:{self.label}"
+
+    def _connect(self):
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+
+    def configure(self, connection):
+        return None
+
+    def discard(self):
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
+
+    def describe(self):
+        return {"backend": self.name, "dialect": self.dialect, "label": self.label}
+
+
+class _ServerRow(tuple):
+    """Row readable by column name or position, like ``sqlite3.Row``."""
+
+    def __new__(cls, names, values):
+        row = super().__new__(cls, values)
+        row._index = names
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return list(self._index)
+
+
+def _server_row_factory(cursor):
+    names = {column.name: position for position, column in enumerate(cursor.description or ())}
+    return lambda values: _ServerRow(names, values)
+
+
+def _translate_server_sql(sql):
+    # The shared SQL uses sqlite "?" placeholders; psycopg expects "%s" and literal "%" doubled.
+    sql = sql.replace("%", "%%").replace("?", "%s")
+    # SQLite INTEGER is 64-bit; Postgres INTEGER is not, and epoch seconds must survive 2038.
+    return re.sub(r"\bINTEGER\b", "BIGINT", sql)
+
+
+def _split_sql_script(script):
+    """Split a script on top-level ``;`` the way sqlite3's executescript does.
+
+    Semicolons inside quoted literals, quoted identifiers and comments do not end a statement.
+    """
+    statements = []
+    start = 0
+    position = 0
+    length = len(script)
+    while position < length:
+        char = script[position]
+        if char in "'\"":
+            # A doubled quote is an escaped quote, which this loop reads as close-then-reopen.
+            closing = script.find(char, position + 1)
+            position = length if closing < 0 else closing + 1
+        elif script.startswith("--", position):
+            newline = script.find("\n", position)
+            position = length if newline < 0 else newline + 1
+        elif script.startswith("/*", position):
+            closing = script.find("*/", position + 2)
+            position = length if closing < 0 else closing + 2
+        elif char == ";":
+            statements.append(script[start:position])
+            position += 1
+            start = position
+        else:
+            position += 1
+    statements.append(script[start:])
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+class _ServerConnection:
+    """Adapts a psycopg connection to the sqlite3 connection surface data_persistence uses."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, sql, params=()):
+        cursor = self._connection.cursor()
+        cursor.execute(_translate_server_sql(sql), tuple(params))
+        return cursor
+
+    def executemany(self, sql, params_seq):
+        cursor = self._connection.cursor()
+        cursor.executemany(_translate_server_sql(sql), [tuple(params) for params in params_seq])
+        return cursor
+
+    def executescript(self, script):
+        for statement in _split_sql_script(script):
+            self.execute(statement)
+        self.commit()
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+class PostgresBackend(StorageBackend):
+    """Server database for running several workers against one store; needs the psycopg package."""
+
+    name = "postgres"
+    dialect = "postgres"
+    stores_binary_in_text_columns = False
+
+    def __init__(self, dsn):
+        if psycopg is None:
+            raise RuntimeError("APP_DB_BACKEND=postgres requires the psycopg package")
+        if not dsn:
+            raise RuntimeError("APP_DB_BACKEND=postgres requires APP_DB_DSN")
+        self.dsn = dsn
+
+    @property
+    def key(self):
+        return f"postgres:{self.dsn}"
+
+    def open(self):
+        return _ServerConnection(psycopg.connect(self.dsn, row_factory=_server_row_factory))
+
+    def table_exists(self, connection, table_name):
+        return connection.execute("SELECT to_regclass(?)", (table_name,)).fetchone()[0] is not None
+
+    def table_columns(self, connection, table_name):
+        rows = connection.execute(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = ?
+            """,
+            (table_name,),
+        ).fetchall()
+        return {row["column_name"] for row in rows}
+
+
+def _busy_timeout():
+    return max(env_float("APP_DB_BUSY_TIMEOUT_SECONDS", _DEFAULT_BUSY_TIMEOUT_SECONDS), 0.0)
+
+
+def _sqlite_path():
+    raw_path = os.getenv("APP_DB_PATH") or ".runtime/solar-potential.sqlite3"
+    if raw_path == ":memory:":
+        return raw_path
+
+    path = Path(raw_path)
+    if not path.is_absolute():
+        path = Path(__file__).resolve().parent / path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def backend_from_env(existing=None):
+    """Build the backend selected by APP_DB_BACKEND (sqlite, memory or postgres).
+
+    ``existing`` maps backend keys to live backends so an in-memory database and its contents are
+    reused for as long as the process keeps asking for it.
+    """
+    existing = {} if existing is None else existing
+    kind = (os.getenv("APP_DB_BACKEND") or "sqlite").strip().lower()
+    if kind == "memory":
+        label = (os.getenv("APP_DB_MEMORY_NAME") or "default").strip() or "default"
+        key = f"memory:{label}"
+        if key not in existing:
+            existing[key] = MemoryBackend(label)
+        return existing[key]
+    if kind == "postgres":
+        dsn = (os.getenv("APP_DB_DSN") or "").strip()
+        key = f"postgres:{dsn}"
+        if key not in existing:
+            existing[key] = PostgresBackend(dsn)
+        return existing[key]
+
+    if kind != "sqlite":
+        logger.warning("Unknown APP_DB_BACKEND %r; using sqlite", kind)
+    # File backends hold no state of their own, so they follow APP_DB_PATH on every call.
+    return SQLiteBackend(_sqlite_path(), busy_timeout=_busy_timeout())
@@ -0,0 +1,127 @@
+import unittest
+
+import data_persistence
+from address_index import AddressIndex, address_from_lookup_key, get_address_index, warm_address_index
+
+
+def build_address(street, city="Houston", state="TX", zip_code="77024", country="United States"):
+    return {"street": street, "city": city, "state": state, "zip": zip_code, "country": country}
+
+
+class AddressIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = AddressIndex(max_entries=10, min_similarity=0.85)
+        self.index.add("boheme", [build_address("12518 Boheme Dr")])
+
+    def test_street_suffix_spellings_match_exactly(self):
+        self.assertEqual(self.index.match(build_address("12518 Boheme Drive")), ("boheme", "exact", 1.0))
+        self.assertEqual(self.index.match(build_address("12518 BOHEME DR.")), ("boheme", "exact", 1.0))
+
+    def test_street_typo_matches_fuzzily(self):
+        cache_key, match_type, similarity = self.index.match(build_address("12518 Bohem Drive"))
+
+        self.assertEqual((cache_key, match_type), ("boheme", "fuzzy"))
+        self.assertGreaterEqual(similarity, 0.85)
+
+    def test_other_house_numbers_and_localities_do_not_match(self):
+        self.assertIsNone(self.index.match(build_address("12520 Boheme Dr")))
+        self.assertIsNone(self.index.match(build_address("12518 Boheme Dr", zip_code="77079")))
+        self.assertIsNone(self.index.match(build_address("12518 Bonham Dr")))
+        self.assertEqual(self.index.stats()["misses"], 3)
+
+    def test_missing_locality_parts_never_match_fuzzily(self):
+        self.assertIsNone(self.index.match(build_address("12518 Bohem Drive", city="", zip_code="")))
+        self.assertIsNone(self.index.match(build_address("12518 Bohem Drive", city="", state="", zip_code="")))
+
+    def test_directional_ordinal_and_unit_tokens_must_match_exactly(self):
+        index = AddressIndex(max_entries=10, min_similarity=0.85)
+        index.add("north-main", [build_address("123 North Main St")])
+        index.add("second-ave", [build_address("40 W 2nd Ave")])
+        index.add("apt-4", [build_address("7 Harbor Way Apt 4")])
+
+        self.assertIsNone(index.match(build_address("123 South Main Street")))
+        self.assertIsNone(index.match(build_address("40 W 3rd Ave")))
+        self.assertIsNone(index.match(build_address("40 E 2nd Ave")))
+        self.assertIsNone(index.match(build_address("7 Harbor Way Apt 5")))
+        self.assertIsNone(index.match(build_address("7 Harbor Way")))
+        self.assertEqual(index.match(build_address("123 N Main Street")), ("north-main", "exact", 1.0))
+        self.assertEqual(index.match(build_address("7 Harbour Way Apt 4"))[:2], ("apt-4", "fuzzy"))
+
+    def test_similar_but_different_street_names_never_match_fuzzily(self):
+        index = AddressIndex(max_entries=10, min_similarity=0.85)
+        index.add("hall", [build_address("123 Hall St")])
+        index.add("maine", [build_address("123 Maine St", zip_code="77025")])
+        index.add("pine", [build_address("123 Pine Ave", zip_code="77026")])
+
+        self.assertIsNone(index.match(build_address("123 Hill St")))
+        self.assertIsNone(index.match(build_address("123 Hull Street")))
+        self.assertIsNone(index.match(build_address("123 Pike Ave", zip_code="77026")))
+        # One edit on a short name token is close enough to suggest, not to reuse.
+        self.assertEqual(index.match(build_address("123 Main St", zip_code="77025"))[:2], ("maine", "hint"))
+        self.assertEqual(index.stats()["fuzzy_hits"], 0)
+        self.assertEqual(index.stats()["hints"], 1)
+
+    def test_street_types_must_match_exactly(self):
+        self.assertIsNone(self.index.match(build_address("12518 Boheme Ct")))
+        self.assertIsNone(self.index.match(build_address("12518 Bohem Ln")))
+
+    def test_city_and_state_block_matches_without_a_zip(self):
+        match = self.index.match(build_address("12518 Bohem Drive", zip_code=""))
+
+        self.assertEqual(match[:2], ("boheme", "fuzzy"))
+
+    def test_oldest_entries_are_evicted(self):
+        index = AddressIndex(max_entries=2)
+        for house_number in ("1", "2", "3"):
+            index.add(house_number, [build_address(f"{house_number} Main St")])
+
+        self.assertIsNone(index.match(build_address("1 Main Street")))
+        self.assertEqual(index.match(build_address("3 Main Street"))[0], "3")
+        self.assertEqual(index.stats()["evictions"], 1)
+
+    def test_address_from_lookup_key_round_trips(self):
+        address = build_address("12518 Boheme Dr")
+        rebuilt = address_from_lookup_key(data_persistence.build_address_lookup_key(address))
+
+        self.assertEqual(rebuilt["street"], "12518 boheme dr")
+        self.assertEqual(rebuilt["zip"], "77024")
+
+
+class AddressIndexWarmTests(unittest.TestCase):
+    def setUp(self):
+        data_persistence.reset_memory_storage()
+        get_address_index().clear()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        get_address_index().clear()
+
+    def test_warm_loads_cached_previews_and_saved_records(self):
+        cached_address = build_address("12518 Boheme Dr")
+        data_persistence.store_geocode_cache(
+            "forward-property-preview",
+            data_persistence.build_address_lookup_key(cached_address),
+            {"latitude": 29.76698, "longitude": -95.55091, "address": build_address("12518 Boheme Drive", state="Texas")},
+            "test",
+        )
+        record_address = build_address("500 Memorial Dr")
+        data_persistence.upsert_property_record(
+            "record-guid",
+            record_address,
+            property_preview={"latitude": 29.76, "longitude": -95.4, "source": "arcgis"},
+        )
+
+        loaded = warm_address_index("forward-property-preview", force=True)
+
+        index = get_address_index()
+        self.assertEqual(loaded, 2)
+        self.assertEqual(index.match(build_address("12518 Boheme Drive", state="Texas"))[1], "exact")
+        record_key = index.match(build_address("500 Memorial Drive"))[0]
+        self.assertEqual(
+            data_persistence.get_geocode_cache("forward-property-preview", record_key)["source"],
+            "arcgis",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import batch_geocode
+import data_persistence
+import main
+from address_index import get_address_index
+
+
+def build_address(street="12518 Boheme Dr", zip_code="77024"):
+    return {
+        "street": street,
+        "city": "Houston",
+        "state": "TX",
+        "zip": zip_code,
+        "country": "United States",
+    }
+
+
+def build_geocode_payload(house_number="12518", road="Boheme Drive", latitude=29.76698, longitude=-95.55091):
+    return {
+        "location": SimpleNamespace(
+            address=f"{house_number} {road}, Houston, Texas 77024, United States",
+            latitude=latitude,
+            longitude=longitude,
+            raw={"address": {"house_number": house_number, "road": road, "postcode": "77024"}},
+        ),
+        "match_quality": "high",
+        "match_score": 31,
+        "source": "test-provider",
+    }
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_bucket_spaces_calls_beyond_its_burst(self):
+        bucket = batch_geocode.TokenBucket(rate_per_second=50, capacity=1)
+
+        waits = [bucket.acquire() for _ in range(3)]
+
+        self.assertEqual(waits[0], 0)
+        self.assertGreater(sum(waits), 0.03)
+        self.assertEqual(bucket.stats()["acquired"], 3)
+
+    def test_tokens_are_only_taken_inside_a_rate_limited_context(self):
+        bucket = batch_geocode.TokenBucket(rate_per_second=1000, capacity=10)
+
+        batch_geocode.acquire_provider_token("arcgis")
+        batch_geocode.rate_limited_context({"arcgis": bucket}).run(batch_geocode.acquire_provider_token, "arcgis")
+
+        self.assertEqual(bucket.stats()["acquired"], 1)
+
+
+class RunBatchTests(unittest.TestCase):
+    def test_duplicates_resolve_once_and_cache_hits_come_first(self):
+        cached_key = data_persistence.build_address_lookup_key(build_address(zip_code="77079"))
+        resolved = []
+        limits_seen = []
+        lock = threading.Lock()
+
+        def lookup_cached(address, cache_key):
+            return {"cached": True} if cache_key == cached_key else None
+
+        def resolve(address):
+            with lock:
+                resolved.append(address["street"])
+                limits_seen.append(batch_geocode.provider_rate_limits.get() is not None)
+            if address["street"].startswith("404"):
+                raise HTTPException(status_code=404, detail="Address not found")
+            return {"street": address["street"]}
+
+        addresses = [
+            build_address(),
+            build_address(street="12518 BOHEME DR"),
+            build_address(zip_code="77079"),
+            build_address(street="404 Nowhere Ln"),
+        ]
+        lines = list(batch_geocode.run_batch(addresses, lookup_cached, resolve, workers=2))
+
+        results = lines[:-1]
+        summary = lines[-1]["summary"]
+        self.assertEqual(results[0], {"index": 2, "key": cached_key, "status": "cached", "result": {"cached": True}})
+        self.assertEqual(sorted(resolved), ["12518 Boheme Dr", "404 Nowhere Ln"])
+        self.assertEqual(limits_seen, [True, True])
+        self.assertEqual(sorted(result["index"] for result in results), [0, 1, 2, 3])
+        errors = [result for result in results if result["status"] == "error"]
+        self.assertEqual(errors[0]["status_code"], 404)
+        self.assertEqual(
+            summary,
+            {**summary, "addresses": 4, "unique_addresses": 3, "cached": 1, "geocoded": 2, "error": 1},
+        )
+
+    def test_workers_are_capped_by_the_slowest_provider_rate(self):
+        buckets = {
+            "nominatim": batch_geocode.TokenBucket(rate_per_second=1, capacity=1),
+            "arcgis": batch_geocode.TokenBucket(rate_per_second=1000, capacity=10),
+        }
+        threads = set()
+
+        def resolve(address):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.02)
+            return {}
+
+        addresses = [build_address(street=f"{number} Main St") for number in range(1, 5)]
+        with patch.object(batch_geocode, "get_provider_buckets", return_value=buckets):
+            list(batch_geocode.run_batch(addresses, lambda *_: None, resolve, workers=4))
+
+        self.assertEqual(len(threads), 1)
+
+    def test_batch_fetches_wait_for_tokens_off_the_shared_pool_and_outside_the_deadline(self):
+        buckets = {"arcgis": batch_geocode.TokenBucket(rate_per_second=5, capacity=1)}
+        skipped_calls = []
+
+        def fetch():
+            batch_geocode.acquire_provider_token("arcgis")
+            return threading.current_thread().name
+
+        def resolve(address):
+            deadline = time.monotonic() + 0.05
+            futures = [main.submit_geocode_task(fetch) for _ in range(3)]
+            main.submit_geocode_task(skipped_calls.append, "ran").cancel()
+            return [main.collect_geocode_result(future, deadline, "test", None) for future in futures]
+
+        with patch.object(batch_geocode, "get_provider_buckets", return_value=buckets), patch.object(
+            main._GEOCODE_EXECUTOR, "submit", side_effect=AssertionError("batch fetch used the shared pool")
+        ):
+            result = list(batch_geocode.run_batch([build_address()], lambda *_: None, resolve))[0]
+
+        # Tokens arrive 0.2s apart, well past the 0.05s deadline, yet no fetch is cut off.
+        self.assertEqual(result["status"], "geocoded")
+        self.assertEqual([timed_out for _, timed_out in result["result"]], [False, False, False])
+        self.assertTrue(all(name.startswith("geocode-batch") for name, _ in result["result"]))
+        self.assertGreater(buckets["arcgis"].stats()["waited_seconds"], 0.3)
+        self.assertEqual(skipped_calls, [])
+
+    def test_read_addresses_accepts_csv_and_ndjson(self):
+        csv_rows = batch_geocode.read_addresses(
+            iter(["street,city,state,zip,country\n", "1 Main St,Austin,TX,78702,US\n"]),
+            "addresses.csv",
+        )
+        ndjson_rows = batch_geocode.read_addresses(iter(['{"street": "1 Main St", "zip": 78702}\n']), "a.ndjson")
+
+        self.assertEqual(csv_rows[0]["city"], "Austin")
+        self.assertEqual(ndjson_rows[0], {"street": "1 Main St", "city": "", "state": "", "zip": "78702", "country": ""})
+
+
+class BatchEndpointTests(unittest.TestCase):
+    def setUp(self):
+        data_persistence.reset_memory_storage()
+        get_address_index().clear()
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        get_address_index().clear()
+
+    def test_batch_endpoint_streams_ndjson_and_geocodes_each_address_once(self):
+        memorial_payload = build_geocode_payload("500", "Memorial Drive", 29.76, -95.4)
+        with patch.object(main, "geocode_location", return_value=memorial_payload):
+            self.client.post("/api/property-preview", json=build_address(street="500 Memorial Dr"))
+
+        with patch.object(main, "geocode_location", return_value=build_geocode_payload()) as geocode_mock:
+            response = self.client.post(
+                "/api/property-preview/batch",
+                json={
+                    "addresses": [
+                        build_address(),
+                        build_address(street="500 Memorial Dr"),
+                        build_address(),
+                    ]
+                },
+            )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        self.assertEqual(geocode_mock.call_count, 1)
+        self.assertEqual((lines[0]["index"], lines[0]["status"]), (1, "cached"))
+        self.assertEqual(sorted(line["index"] for line in lines[1:3]), [0, 2])
+        self.assertEqual(lines[1]["result"]["latitude"], 29.76698)
+        self.assertEqual(lines[-1]["summary"]["unique_addresses"], 2)
+
+    def test_batch_endpoint_rejects_oversized_batches(self):
+        with patch.dict(os.environ, {"GEOCODE_BATCH_MAX_ADDRESSES": "1"}, clear=False):
+            response = self.client.post(
+                "/api/property-preview/batch",
+                json={"addresses": [build_address(), build_address(zip_code="77079")]},
+            )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_cli_writes_one_line_per_address(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, "addresses.csv")
+            output_path = os.path.join(temp_dir, "results.ndjson")
+            with open(input_path, "w", encoding="utf-8") as stream:
+                stream.write("street,city,state,zip,country\n")
+                stream.write("12518 Boheme Dr,Houston,TX,77024,United States\n")
+                stream.write("12518 Boheme Drive,Houston,TX,77024,United States\n")
+
+            with patch.object(main, "geocode_location", return_value=build_geocode_payload()) as geocode_mock:
+                batch_geocode.main([input_path, output_path, "--workers", "1"])
+
+            with open(output_path, encoding="utf-8") as stream:
+                lines = [json.loads(line) for line in stream]
+
+        # Both spellings miss the cache up front; the second then resolves from the address index.
+        self.assertEqual(geocode_mock.call_count, 1)
+        self.assertEqual([line.get("status") for line in lines[:2]], ["geocoded", "geocoded"])
+        self.assertEqual(lines[1]["result"]["index_match"]["type"], "exact")
+        self.assertEqual(lines[-1]["summary"]["addresses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from os import environ
+from unittest.mock import patch
+
+import bulk_transfer
+import data_persistence
+
+
+def build_address():
+    return {
+        "street": "123 Main St",
+        "city": "Austin",
+        "state": "TX",
+        "zip": "78702",
+        "country": "United States",
+    }
+
+
+class BulkTransferTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, "source.sqlite3")
+        self.target_path = os.path.join(self.temp_dir.name, "target.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.source_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+        for index in range(7):
+            data_persistence.upsert_property_record(
+                f"guid-{index}",
+                build_address(),
+                property_context={"buildings": [index]},
+                garden_zones=[{"id": f"zone-{index}"}],
+                saved_solar_reports=[{"id": f"report-{index}", "homeowner_quote": {"id": f"quote-{index}"}}],
+            )
+            data_persistence.store_geocode_cache("search", f"query-{index}", {"lat": index})
+        data_persistence.store_solar_data("guid-1", {"annual": 1}, "America/Chicago", build_address(), "nrel")
+        data_persistence.store_cached_property_climate(30.26, -97.74, {"zone": "9a"})
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def _switch_to_target(self):
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+        environ["APP_DB_PATH"] = self.target_path
+
+    def test_export_then_import_round_trips_records_and_caches_in_chunks(self):
+        stream = io.StringIO()
+        exported = bulk_transfer.export_tables(stream, chunk_size=3)
+        lines = stream.getvalue().splitlines()
+
+        self._switch_to_target()
+        with patch.object(bulk_transfer, "_write_chunk", wraps=bulk_transfer._write_chunk) as write_chunk:
+            imported = bulk_transfer.import_rows(io.StringIO(stream.getvalue()), chunk_size=10)
+
+        self.assertEqual(exported["rows"], len(lines))
+        self.assertEqual(imported["rows"], exported["rows"])
+        self.assertEqual(exported["tables"]["geocode_cache"], 7)
+        self.assertEqual(write_chunk.call_count, -(-len(lines) // 10))
+        record = data_persistence.get_property_record("guid-4")
+        self.assertEqual(record["property_context"], {"buildings": [4]})
+        self.assertEqual(record["garden_zones"], [{"id": "zone-4"}])
+        self.assertEqual(data_persistence.find_solar_quote("quote-4")["record"]["guid"], "guid-4")
+        self.assertEqual(data_persistence.get_geocode_cache("search", "query-6"), {"lat": 6})
+        self.assertEqual(data_persistence.check_existing_solar_data("guid-1"), ({"annual": 1}, "America/Chicago"))
+        self.assertEqual(data_persistence.get_cached_property_climate(30.26, -97.74), {"zone": "9a"})
+
+    def test_cli_exports_only_caches_to_gzip(self):
+        dump_path = os.path.join(self.temp_dir.name, "caches.ndjson.gz")
+        bulk_transfer.main(["export", dump_path, "--tables", "caches"])
+
+        with bulk_transfer._open_stream(dump_path, "r") as stream:
+            tables = {json.loads(line)["table"] for line in stream}
+        self.assertEqual(tables, {"geocode_cache", "solar_data", "property_climate_snapshots"})
+
+        self._switch_to_target()
+        bulk_transfer.main(["import", dump_path, "--chunk-size", "2"])
+        self.assertEqual(data_persistence.get_geocode_cache("search", "query-0"), {"lat": 0})
+        self.assertIsNone(data_persistence.get_property_record("guid-0"))
+
+    def test_imported_records_replace_stale_child_rows(self):
+        stream = io.StringIO()
+        bulk_transfer.export_tables(stream, tables=["records"])
+
+        self._switch_to_target()
+        data_persistence.upsert_property_record(
+            "guid-4",
+            build_address(),
+            garden_zones=[{"id": "stale-1"}, {"id": "stale-2"}],
+            saved_solar_reports=[{"id": "stale-report", "homeowner_quote": {"id": "stale-quote"}}],
+        )
+        bulk_transfer.import_rows(io.StringIO(stream.getvalue()), tables=["records"])
+
+        record = data_persistence.get_property_record("guid-4")
+        self.assertEqual(record["garden_zones"], [{"id": "zone-4"}])
+        self.assertEqual([report["id"] for report in record["saved_solar_reports"]], ["report-4"])
+        self.assertIsNone(data_persistence.find_solar_quote("stale-quote"))
+
+    def test_export_fails_on_a_corrupt_json_column_instead_of_writing_null(self):
+        with data_persistence._connect() as connection:
+            connection.execute(
+                "UPDATE geocode_cache SET response_json = ? WHERE cache_key = ?",
+                ("{not json", "search:query-3"),
+            )
+
+        with self.assertRaisesRegex(ValueError, "search:query-3"):
+            bulk_transfer.export_tables(io.StringIO(), tables=["geocode_cache"])
+        self.assertEqual(bulk_transfer.main(["export", os.path.join(self.temp_dir.name, "bad.ndjson")]), 1)
+
+    def test_json_columns_round_trip_and_corrupt_blobs_raise(self):
+        with patch.dict(environ, {"APP_DB_BLOB_CODEC": "zlib", "APP_DB_BLOB_MIN_BYTES": "1"}, clear=False):
+            encoded = data_persistence.dump_json_column({"zone": "9a"}, compressible=True)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(data_persistence.load_json_column(encoded), {"zone": "9a"})
+        self.assertEqual(data_persistence.load_json_column(data_persistence.dump_json_column([1])), [1])
+        with self.assertRaises(ValueError):
+            data_persistence.load_json_column(encoded[:-4])
+
+    def test_unknown_tables_are_rejected(self):
+        with self.assertRaises(ValueError):
+            bulk_transfer.resolve_tables(["browser_data"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,583 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from os import environ
+from unittest.mock import patch
+
+import data_persistence
+import response_cache
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "pool-test.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+
+    def tearDown(self):
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_connect_reuses_one_connection_per_thread(self):
+        first = data_persistence._connect()
+        second = data_persistence._connect()
+        other_thread_connections = []
+
+        worker = threading.Thread(
+            target=lambda: other_thread_connections.append(data_persistence._connect())
+        )
+        worker.start()
+        worker.join()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(other_thread_connections), 1)
+        self.assertIsNot(other_thread_connections[0], first)
+
+    def test_schema_setup_runs_once_per_process(self):
+        with patch.object(
+            data_persistence,
+            "_initialize_db",
+            wraps=data_persistence._initialize_db,
+        ) as initialize_mock:
+            data_persistence._connect()
+            worker = threading.Thread(target=data_persistence._connect)
+            worker.start()
+            worker.join()
+            data_persistence.get_property_record("missing-guid")
+
+        self.assertEqual(initialize_mock.call_count, 1)
+
+    def test_close_connections_hands_out_fresh_connection(self):
+        first = data_persistence._connect()
+        data_persistence.close_connections()
+        second = data_persistence._connect()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(data_persistence.get_connection_pool_stats()["open_connections"], 1)
+
+    def test_journal_mode_is_configurable(self):
+        with patch.dict(environ, {"APP_DB_JOURNAL_MODE": "wal"}, clear=False):
+            connection = data_persistence._connect()
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+        self.assertEqual(journal_mode, "wal")
+
+    def test_reset_memory_storage_keeps_garden_crop_catalog_seeded(self):
+        data_persistence.reset_memory_storage()
+
+        with data_persistence._connect() as connection:
+            row = connection.execute(
+                "SELECT version FROM garden_crop_catalogs WHERE catalog_id = ?",
+                ("default",),
+            ).fetchone()
+
+        self.assertIsNotNone(row)
+
+
+def build_address():
+    return {
+        "street": "123 Main St",
+        "city": "Austin",
+        "state": "TX",
+        "zip": "78702",
+        "country": "United States",
+    }
+
+
+def build_quoted_report(report_id, quote_id):
+    return {
+        "id": report_id,
+        "name": f"Report {report_id}",
+        "homeowner_quote": {"id": quote_id, "status": "share-ready"},
+    }
+
+
+class SolarQuoteIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "quote-index.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_upsert_maintains_quote_index(self):
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            saved_solar_reports=[
+                build_quoted_report("report-1", "quote-1"),
+                {"id": "report-2", "name": "Unquoted"},
+            ],
+        )
+
+        match = data_persistence.find_solar_quote("quote-1")
+        self.assertEqual(match["record"]["guid"], "guid-1")
+        self.assertEqual(match["report"]["id"], "report-1")
+
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            saved_solar_reports=[{"id": "report-2", "name": "Unquoted"}],
+        )
+        with data_persistence._connect() as connection:
+            indexed = connection.execute("SELECT quote_id FROM solar_quotes").fetchall()
+
+        self.assertEqual(indexed, [])
+        self.assertIsNone(data_persistence.find_solar_quote("quote-1"))
+
+    def test_quote_lookup_does_not_scan_property_records(self):
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            saved_solar_reports=[build_quoted_report("report-1", "quote-1")],
+        )
+        for index in range(5):
+            data_persistence.upsert_property_record(f"guid-extra-{index}", build_address())
+
+        with patch.object(
+            data_persistence,
+            "_build_property_record_from_row",
+            wraps=data_persistence._build_property_record_from_row,
+        ) as build_mock:
+            match = data_persistence.find_solar_quote("quote-1")
+
+        self.assertEqual(match["quote"]["id"], "quote-1")
+        self.assertEqual(build_mock.call_count, 1)
+
+    def test_existing_rows_are_backfilled_into_quote_index(self):
+        data_persistence.upsert_property_record(
+            "guid-legacy",
+            build_address(),
+            saved_solar_reports=[build_quoted_report("report-9", "quote-legacy")],
+        )
+        with data_persistence._connect() as connection:
+            connection.execute("DROP TABLE solar_quotes")
+            connection.commit()
+        data_persistence.close_connections()
+
+        match = data_persistence.find_solar_quote("quote-legacy")
+
+        self.assertIsNotNone(match)
+        self.assertEqual(match["record"]["guid"], "guid-legacy")
+        self.assertEqual(match["report"]["id"], "report-9")
+
+
+class PartialPropertyRecordWriteTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "partial-writes.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def _capture_statements(self):
+        statements = []
+        # tearDown closes the pooled connection, which also drops the trace callback.
+        data_persistence._connect().set_trace_callback(statements.append)
+        return statements
+
+    def test_roof_selection_update_writes_only_changed_column(self):
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            property_context={"summary": "x" * 2048},
+            garden_zones=[{"id": "zone-1"}],
+            saved_solar_reports=[build_quoted_report("report-1", "quote-1")],
+        )
+        statements = self._capture_statements()
+
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            roof_selection={"area_square_feet": 900},
+        )
+
+        writes = [statement for statement in statements if not statement.lstrip().upper().startswith("SELECT")]
+        self.assertTrue(any("roof_selection_json" in statement for statement in writes))
+        self.assertFalse(any("property_context_json" in statement for statement in writes))
+        self.assertFalse(any("property_solar_reports" in statement for statement in writes))
+        self.assertFalse(any("property_garden_zones" in statement for statement in writes))
+
+        record = data_persistence.get_property_record("guid-1")
+        self.assertEqual(record["roof_selection"], {"area_square_feet": 900})
+        self.assertEqual(record["property_context"], {"summary": "x" * 2048})
+        self.assertEqual(record["garden_zones"], [{"id": "zone-1"}])
+        self.assertEqual(record["saved_solar_reports"][0]["id"], "report-1")
+
+    def test_adding_a_report_keeps_order_and_only_writes_the_new_report(self):
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            saved_solar_reports=[build_quoted_report("report-1", "quote-1")],
+        )
+        statements = self._capture_statements()
+
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            saved_solar_reports=[
+                build_quoted_report("report-2", "quote-2"),
+                build_quoted_report("report-1", "quote-1"),
+            ],
+        )
+
+        inserts = [statement for statement in statements if "INSERT INTO property_solar_reports" in statement]
+        self.assertEqual(len(inserts), 1)
+        self.assertIn("report-2", inserts[0])
+        record = data_persistence.get_property_record("guid-1")
+        self.assertEqual([report["id"] for report in record["saved_solar_reports"]], ["report-2", "report-1"])
+        self.assertEqual(data_persistence.find_solar_quote("quote-2")["report"]["id"], "report-2")
+
+    def test_legacy_blob_columns_are_migrated_into_child_tables(self):
+        data_persistence.upsert_property_record("guid-legacy", build_address())
+        with data_persistence._connect() as connection:
+            connection.execute(
+                "UPDATE property_records SET garden_zones_json = ?, saved_solar_reports_json = ? WHERE guid = ?",
+                (
+                    '[{"id": "zone-legacy"}]',
+                    '[{"id": "report-legacy", "homeowner_quote": {"id": "quote-legacy"}}]',
+                    "guid-legacy",
+                ),
+            )
+            connection.execute("DROP TABLE property_solar_reports")
+            connection.execute("DROP TABLE property_garden_zones")
+            connection.execute("DROP TABLE solar_quotes")
+            connection.commit()
+        data_persistence.close_connections()
+
+        record = data_persistence.get_property_record("guid-legacy")
+        listed = data_persistence.list_property_records(require_garden_zones=True)
+
+        self.assertEqual(record["garden_zones"], [{"id": "zone-legacy"}])
+        self.assertEqual(record["saved_solar_reports"][0]["id"], "report-legacy")
+        self.assertEqual([item["guid"] for item in listed], ["guid-legacy"])
+        self.assertEqual(data_persistence.find_solar_quote("quote-legacy")["record"]["guid"], "guid-legacy")
+        with data_persistence._connect() as connection:
+            legacy = connection.execute(
+                "SELECT garden_zones_json FROM property_records WHERE guid = ?",
+                ("guid-legacy",),
+            ).fetchone()
+        self.assertEqual(legacy["garden_zones_json"], '[{"id": "zone-legacy"}]')
+
+    def test_writes_diff_against_the_row_read_under_the_write_lock(self):
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            property_context={"context_version": "v1"},
+            garden_zones=[{"id": "zone-1"}],
+            saved_solar_reports=[build_quoted_report("report-1", "quote-1")],
+        )
+        begin_write = data_persistence._begin_property_record_write
+        interleaved = []
+
+        def _commit_concurrent_write_first(connection, guid):
+            if interleaved:
+                return begin_write(connection, guid)
+            interleaved.append(guid)
+            # Another request commits between this writer's call and its BEGIN IMMEDIATE.
+            writer = threading.Thread(
+                target=data_persistence.upsert_property_record,
+                args=("guid-1", build_address()),
+                kwargs={
+                    "property_context": {"context_version": "v2"},
+                    "garden_zones": [{"id": "zone-1"}, {"id": "zone-2"}, {"id": "zone-3"}],
+                    "saved_solar_reports": [
+                        build_quoted_report("report-1", "quote-1"),
+                        build_quoted_report("report-2", "quote-2"),
+                    ],
+                },
+            )
+            writer.start()
+            writer.join()
+            begin_write(connection, guid)
+
+        with patch.object(data_persistence, "_begin_property_record_write", side_effect=_commit_concurrent_write_first):
+            data_persistence.upsert_property_record(
+                "guid-1",
+                build_address(),
+                property_context={"context_version": "v1"},
+                garden_zones=[{"id": "zone-1"}],
+                saved_solar_reports=[build_quoted_report("report-1", "quote-1")],
+            )
+
+        # The last writer wins: v1 differs from the row it overwrites even though it matches the stale read.
+        record = data_persistence.get_property_record("guid-1")
+        self.assertEqual(record["property_context"], {"context_version": "v1"})
+        self.assertEqual(record["garden_zones"], [{"id": "zone-1"}])
+        self.assertEqual([report["id"] for report in record["saved_solar_reports"]], ["report-1"])
+        self.assertIsNone(data_persistence.find_solar_quote("quote-2"))
+
+
+class BoundedMemoryFallbackTests(unittest.TestCase):
+    def setUp(self):
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+
+    def test_property_record_memory_evicts_least_recently_written_records(self):
+        with patch.object(data_persistence._property_record_memory, "max_entries", 2), patch.object(
+            data_persistence, "_connect", side_effect=sqlite3.OperationalError("down")
+        ):
+            for index in range(3):
+                data_persistence.upsert_property_record(f"guid-{index}", build_address())
+            listed = data_persistence.list_property_records()
+
+        self.assertEqual([record["guid"] for record in listed], ["guid-2", "guid-1"])
+        self.assertIsNone(data_persistence._property_record_memory.get("guid-0"))
+        self.assertGreaterEqual(data_persistence._property_record_memory.stats()["evictions"], 1)
+
+    def test_committed_writes_replace_the_memory_fallback_copy_without_mirroring(self):
+        with patch.object(data_persistence, "_connect", side_effect=sqlite3.OperationalError("down")):
+            data_persistence.upsert_property_record("guid-1", build_address())
+        self.assertIsNotNone(data_persistence._property_record_memory.get("guid-1"))
+
+        with patch.object(response_cache, "_estimate_size", return_value=0) as estimate_size:
+            data_persistence.upsert_property_record("guid-1", build_address(), roof_selection={"pitch": 20})
+
+        sized_values = [call.args[0] for call in estimate_size.call_args_list]
+        self.assertFalse(any("roof_selection" in value for value in sized_values if isinstance(value, dict)))
+        self.assertIsNone(data_persistence._property_record_memory.get("guid-1"))
+        self.assertEqual(data_persistence.get_property_record("guid-1")["roof_selection"], {"pitch": 20})
+
+
+class WriteBehindTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "write-behind.sqlite3")
+        self.env_patch = patch.dict(
+            environ,
+            {
+                "APP_DB_PATH": self.db_path,
+                "APP_DB_WRITE_BEHIND": "1",
+                "APP_DB_WRITE_BEHIND_FLUSH_SECONDS": "30",
+            },
+            clear=False,
+        )
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def _browser_row_count(self):
+        with data_persistence._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM browser_data").fetchone()[0]
+
+    def test_queued_writes_land_in_one_batch_on_flush(self):
+        batches_before = data_persistence.get_write_behind_stats()["batches"]
+        for index in range(3):
+            data_persistence.store_browser_data(f"guid-{index}", {"userAgent": "test"}, "127.0.0.1")
+
+        self.assertEqual(self._browser_row_count(), 0)
+        self.assertEqual(data_persistence.get_write_behind_stats()["queue_depth"], 3)
+
+        self.assertEqual(data_persistence.flush_write_behind(), 3)
+        stats = data_persistence.get_write_behind_stats()
+        self.assertEqual(self._browser_row_count(), 3)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["batches"], batches_before + 1)
+
+    def test_solar_lookup_sees_queued_rows(self):
+        data_persistence.store_solar_data("guid-1", {"annual": 1}, "America/Chicago", build_address(), "nrel")
+
+        self.assertEqual(
+            data_persistence.check_existing_solar_data("guid-1"),
+            ({"annual": 1}, "America/Chicago"),
+        )
+        self.assertEqual(data_persistence.get_write_behind_stats()["queue_depth"], 0)
+
+    def test_solar_lookups_only_flush_when_their_row_is_queued(self):
+        data_persistence.store_browser_data("guid-1", {"userAgent": "test"}, "127.0.0.1")
+        data_persistence.store_solar_data("guid-2", {"annual": 2}, "America/Chicago", build_address(), "nrel")
+
+        self.assertEqual(data_persistence.check_existing_solar_data("guid-unknown"), (None, None))
+        self.assertEqual(data_persistence.check_existing_zip_data("99999"), (None, None))
+        self.assertEqual(data_persistence.get_write_behind_stats()["queue_depth"], 2)
+
+        self.assertEqual(
+            data_persistence.check_existing_zip_data(build_address()["zip"]),
+            ({"annual": 2}, "America/Chicago"),
+        )
+        self.assertEqual(data_persistence.get_write_behind_stats()["queue_depth"], 0)
+
+    def test_durable_writes_bypass_the_queue(self):
+        data_persistence.store_browser_data("guid-1", {"userAgent": "test"}, "127.0.0.1", durable=True)
+        data_persistence.store_solar_data(
+            "guid-2", {"annual": 2}, "America/Chicago", build_address(), "nrel", durable=True
+        )
+
+        self.assertEqual(self._browser_row_count(), 1)
+        self.assertEqual(data_persistence.get_write_behind_stats()["queue_depth"], 0)
+        with patch.object(data_persistence, "flush_write_behind") as mocked_flush:
+            self.assertEqual(
+                data_persistence.check_existing_solar_data("guid-2"),
+                ({"annual": 2}, "America/Chicago"),
+            )
+        mocked_flush.assert_not_called()
+
+
+class CacheFreshnessTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "freshness.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_per_table_ttls_filter_rows_in_sql(self):
+        data_persistence.store_geocode_cache("search", "austin", {"lat": 30.26})
+        data_persistence.store_cached_property_climate(30.26, -97.74, {"zone": "9a"})
+
+        with patch.object(data_persistence.time, "time", return_value=data_persistence.time.time() + 3600), patch.dict(
+            environ, {"APP_GEOCODE_CACHE_TTL_SECONDS": "60"}, clear=False
+        ), patch.object(data_persistence, "_json_load", wraps=data_persistence._json_load) as json_load:
+            geocode = data_persistence.get_geocode_cache("search", "austin")
+            climate = data_persistence.get_cached_property_climate(30.26, -97.74)
+
+        self.assertIsNone(geocode)
+        self.assertEqual(climate, {"zone": "9a"})
+        self.assertEqual(json_load.call_count, 1)
+
+    def test_legacy_date_rows_are_backfilled_with_epochs(self):
+        data_persistence.store_solar_data("guid-1", {"annual": 1}, "America/Chicago", build_address(), "nrel")
+        with data_persistence._connect() as connection:
+            connection.execute("DROP INDEX idx_solar_data_stored_at_epoch")
+            connection.execute("DROP INDEX idx_solar_data_zip_code_fresh")
+            connection.execute("ALTER TABLE solar_data DROP COLUMN stored_at_epoch")
+            connection.commit()
+        data_persistence.close_connections()
+
+        self.assertEqual(
+            data_persistence.check_existing_zip_data("78702"),
+            ({"annual": 1}, "America/Chicago"),
+        )
+        with data_persistence._connect() as connection:
+            epoch = connection.execute("SELECT stored_at_epoch FROM solar_data").fetchone()[0]
+        self.assertIsInstance(epoch, int)
+
+
+class CompressedBlobStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "blob-codec.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_codec_compresses_large_columns_and_keeps_plain_rows_readable(self):
+        context = {"buildings": [{"geometry": [[30.26, -97.74]] * 200}]}
+        data_persistence.upsert_property_record("guid-plain", build_address(), property_context=context)
+        with patch.dict(environ, {"APP_DB_BLOB_CODEC": "zlib"}, clear=False):
+            data_persistence.upsert_property_record(
+                "guid-packed",
+                build_address(),
+                property_context=context,
+                saved_solar_reports=[build_quoted_report("report-1", "quote-1")],
+            )
+
+        with data_persistence._connect() as connection:
+            rows = dict(
+                connection.execute("SELECT guid, property_context_json FROM property_records").fetchall()
+            )
+
+        self.assertIsInstance(rows["guid-plain"], str)
+        self.assertTrue(rows["guid-packed"].startswith(b"SPB\x01z"))
+        self.assertLess(len(rows["guid-packed"]), len(rows["guid-plain"]))
+        self.assertEqual(data_persistence.get_property_record("guid-plain")["property_context"], context)
+        self.assertEqual(data_persistence.get_property_record("guid-packed")["property_context"], context)
+        self.assertEqual(data_persistence.find_solar_quote("quote-1")["record"]["guid"], "guid-packed")
+
+    def test_unknown_blob_codec_reads_as_default(self):
+        self.assertIsNone(data_persistence._json_load(b"SPB\x01?payload"))
+        self.assertEqual(data_persistence._json_load(b"SPB\x09z", default={}), {})
+
+
+class ProjectedPropertyRecordReadTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "projection.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            property_context={"summary": "context"},
+            property_climate={"hardiness_zone": {"label": "9a"}},
+            garden_zones=[{"id": "zone-1"}],
+            saved_solar_reports=[build_quoted_report("report-1", "quote-1")],
+        )
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_projected_read_selects_and_decodes_only_requested_fields(self):
+        statements = []
+        data_persistence._connect().set_trace_callback(statements.append)
+
+        with patch.object(data_persistence, "_json_load", wraps=data_persistence._json_load) as json_load:
+            record = data_persistence.get_property_record("guid-1", fields=("property_context",))
+
+        self.assertEqual(record, {"guid": "guid-1", "property_context": {"summary": "context"}})
+        self.assertEqual(json_load.call_count, 1)
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("property_climate_json", statements[0])
+
+    def test_list_and_find_accept_field_projection(self):
+        listed = data_persistence.list_property_records(fields=("address", "garden_zones"))
+        found = data_persistence.find_property_record_by_address(build_address(), fields=("stored_at",))
+
+        self.assertEqual(listed[0]["garden_zones"], [{"id": "zone-1"}])
+        self.assertNotIn("saved_solar_reports", listed[0])
+        self.assertEqual(set(found), {"guid", "stored_at"})
+        self.assertEqual(data_persistence.check_existing_address_data("guid-1")["street"], "123 Main St")
+
+    def test_unknown_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            data_persistence.get_property_record("guid-1", fields=("address_json",))
+
+
+if __name__ == "__main__":
+    unittest.main()
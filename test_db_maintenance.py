@@ -0,0 +1,97 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from os import environ
+from unittest.mock import patch
+
+import data_persistence
+import db_maintenance
+
+
+class DatabaseMaintenanceTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "maintenance.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def _seed_geocode_rows(self, count, age_days):
+        stored_at_epoch = int(time.time()) - age_days * 86400
+        with data_persistence._connect() as connection:
+            connection.executemany(
+                """
+                INSERT INTO geocode_cache (cache_key, query_type, source, response_json, stored_at, stored_at_epoch)
+                VALUES (?, 'search', 'test', ?, '2026-01-01', ?)
+                """,
+                [(f"search:{age_days}:{index}", "x" * 4096, stored_at_epoch) for index in range(count)],
+            )
+            connection.commit()
+
+    def test_purges_only_expired_rows_in_batches(self):
+        self._seed_geocode_rows(25, 120)
+        self._seed_geocode_rows(3, 1)
+        data_persistence.store_cached_property_climate(30.26, -97.74, {"hardiness_zone": "9a"})
+
+        report = db_maintenance.run_maintenance(batch_size=10, vacuum_pages=0)
+
+        with data_persistence._connect() as connection:
+            remaining = connection.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+
+        self.assertEqual(report["purged_rows"]["geocode_cache"], 25)
+        self.assertEqual(remaining, 3)
+        self.assertEqual(report["vacuum"], "skipped")
+        self.assertIsNotNone(data_persistence.get_cached_property_climate(30.26, -97.74))
+
+    def test_purge_defaults_to_the_table_ttl_and_rejects_other_tables(self):
+        self._seed_geocode_rows(4, 120)
+        self._seed_geocode_rows(2, 1)
+
+        self.assertEqual(data_persistence.purge_expired_cache_rows("geocode_cache", batch_size=3), 4)
+        with self.assertRaises(ValueError):
+            data_persistence.purge_expired_cache_rows("property_records")
+
+    def test_incremental_vacuum_reclaims_pages_of_new_databases(self):
+        self._seed_geocode_rows(200, 120)
+
+        report = db_maintenance.run_maintenance()
+
+        self.assertEqual(report["vacuum"], "incremental")
+        self.assertGreater(report["reclaimed_pages"], 0)
+        self.assertEqual(report["freelist_pages"], 0)
+
+    def test_cli_prints_maintenance_report(self):
+        with patch("builtins.print") as mocked_print:
+            exit_code = db_maintenance.main(["--batch-size", "50"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn('"purged_rows"', mocked_print.call_args.args[0])
+
+    def test_periodic_loop_survives_unexpected_errors(self):
+        calls = []
+
+        def failing_pass():
+            calls.append(1)
+            if len(calls) == 1:
+                raise KeyError("unexpected")
+            raise asyncio.CancelledError()
+
+        with patch.object(db_maintenance, "run_maintenance", side_effect=failing_pass):
+            with self.assertLogs(db_maintenance.logger, level="ERROR"):
+                with self.assertRaises(asyncio.CancelledError):
+                    asyncio.run(db_maintenance.run_maintenance_periodically(0))
+
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from os import environ
+from unittest.mock import patch
+
+from env_settings import env_float, env_int
+
+
+class EnvSettingsTests(unittest.TestCase):
+    def test_valid_values_are_parsed(self):
+        with patch.dict(environ, {"LIVE_CONDITIONS_FETCH_WORKERS": " 4 ", "PROPERTY_CONTEXT_DEADLINE_SECONDS": "2.5"}):
+            self.assertEqual(env_int("LIVE_CONDITIONS_FETCH_WORKERS", 16), 4)
+            self.assertEqual(env_float("PROPERTY_CONTEXT_DEADLINE_SECONDS", 25), 2.5)
+
+    def test_blank_values_use_the_default_quietly(self):
+        with patch.dict(environ, {"LIVE_CONDITIONS_FETCH_WORKERS": "  "}), self.assertNoLogs("env_settings"):
+            self.assertEqual(env_int("LIVE_CONDITIONS_FETCH_WORKERS", 16), 16)
+
+    def test_invalid_values_warn_and_fall_back(self):
+        with patch.dict(
+            environ,
+            {"PROPERTY_CONTEXT_DEADLINE_SECONDS": "soon", "PROPERTY_CONTEXT_FETCH_WORKERS": "many"},
+        ), self.assertLogs("env_settings", level="WARNING") as logs:
+            self.assertEqual(env_float("PROPERTY_CONTEXT_DEADLINE_SECONDS", 25), 25)
+            self.assertEqual(env_int("PROPERTY_CONTEXT_FETCH_WORKERS", 12), 12)
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("PROPERTY_CONTEXT_FETCH_WORKERS", logs.output[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 from os import environ
 from unittest.mock import patch
@@ -423,6 +425,291 @@ class GeocodeSelectionTests(unittest.TestCase):
         self.assertAlmostEqual(result["location"].longitude, -95.551499, places=6)
 
 
+class ConcurrentGeocodeTests(unittest.TestCase):
+    requested_address = {
+        "street": "12518 Boheme Dr",
+        "city": "Houston",
+        "state": "TX",
+        "zip": "77024",
+        "country": "United States",
+    }
+    hybrid_env = {
+        "GEOCODER_PROVIDER": "hybrid",
+        "GEOCODER_NOMINATIM_DOMAIN": "nominatim.internal.example",
+    }
+
+    def setUp(self):
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+
+    def test_providers_run_concurrently_but_nominatim_calls_never_overlap(self):
+        block_off_candidate = build_candidate(1, 29.767210, -95.550680, "12518", "Boheme Drive")
+        exact_candidate = build_candidate(2, 29.766980, -95.550910, "12518", "Boheme Drive")
+        # Each side waits for the other to start, so both providers must be in flight together.
+        nominatim_started = threading.Event()
+        point_address_started = threading.Event()
+        in_flight = {"current": 0, "max": 0}
+        in_flight_lock = threading.Lock()
+        reverse_lookup = {
+            "29.76721, -95.55068": FakeLocation(
+                address="12502 Boheme Drive, Houston, Texas 77024, United States",
+                latitude=29.767210,
+                longitude=-95.550680,
+                raw={"address": build_raw_address("12502", "Boheme Drive")},
+            ),
+            "29.76698, -95.55091": FakeLocation(
+                address="12518 Boheme Drive, Houston, Texas 77024, United States",
+                latitude=29.766980,
+                longitude=-95.550910,
+                raw={"address": build_raw_address("12518", "Boheme Drive")},
+            ),
+        }
+
+        def track_nominatim(result):
+            with in_flight_lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            time.sleep(0.02)
+            with in_flight_lock:
+                in_flight["current"] -= 1
+            return result
+
+        def geocode(*args, **kwargs):
+            nominatim_started.set()
+            self.assertTrue(point_address_started.wait(5))
+            return track_nominatim([block_off_candidate, exact_candidate])
+
+        def point_address(address):
+            point_address_started.set()
+            self.assertTrue(nominatim_started.wait(5))
+            return None
+
+        def reverse(query, **kwargs):
+            return track_nominatim(reverse_lookup[query])
+
+        with patch.dict(environ, self.hybrid_env, clear=False):
+            with patch.object(main.geolocator, "geocode", side_effect=geocode):
+                with patch.object(main.geolocator, "reverse", side_effect=reverse):
+                    with patch.object(main, "fetch_arcgis_point_address", side_effect=point_address):
+                        result = main.geocode_location(self.requested_address)
+
+        self.assertIs(result["location"], exact_candidate)
+        self.assertEqual(result["match_quality"], "high")
+        self.assertEqual(in_flight["max"], 1)
+
+    def test_invalid_deadline_setting_falls_back_to_default(self):
+        with patch.dict(environ, {"GEOCODE_DEADLINE_SECONDS": "twenty"}, clear=False):
+            self.assertEqual(main.get_env_float("GEOCODE_DEADLINE_SECONDS", 20.0), 20.0)
+
+    def test_reverse_check_past_deadline_scores_zero(self):
+        exact_candidate = build_candidate(2, 29.766980, -95.550910, "12518", "Boheme Drive")
+        release = threading.Event()
+
+        def reverse(query, **kwargs):
+            release.wait(5)
+            raise AssertionError("reverse check should have been abandoned")
+
+        try:
+            with patch.dict(environ, self.hybrid_env, clear=False):
+                with patch.object(main, "GEOCODE_DEADLINE_SECONDS", 0.2):
+                    with patch.object(main.geolocator, "geocode", return_value=[exact_candidate]):
+                        with patch.object(main.geolocator, "reverse", side_effect=reverse):
+                            with patch.object(main, "fetch_arcgis_point_address", return_value=None):
+                                result = main.geocode_location(self.requested_address)
+        finally:
+            release.set()
+
+        forward_score = main.score_geocode_candidate(self.requested_address, exact_candidate)
+        precision_score = main.score_location_precision(exact_candidate)
+        self.assertIs(result["location"], exact_candidate)
+        self.assertEqual(result["match_score"], forward_score + precision_score)
+
+    def test_all_providers_past_deadline_reports_timeout(self):
+        release = threading.Event()
+
+        def slow_geocode(*args, **kwargs):
+            release.wait(5)
+            return []
+
+        try:
+            with patch.dict(environ, self.hybrid_env, clear=False):
+                with patch.object(main, "GEOCODE_DEADLINE_SECONDS", 0.1):
+                    with patch.object(main.geolocator, "geocode", side_effect=slow_geocode):
+                        with patch.object(main, "fetch_arcgis_point_address", return_value=None):
+                            with self.assertRaises(main.HTTPException) as raised:
+                                main.geocode_location(self.requested_address)
+        finally:
+            release.set()
+
+        self.assertEqual(raised.exception.status_code, 408)
+
+
+class TieredGeocodeTests(unittest.TestCase):
+    requested_address = ConcurrentGeocodeTests.requested_address
+
+    def setUp(self):
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+
+    def build_point_address(self, postcode="77024"):
+        return main.build_location(
+            "12518 Boheme Dr, Houston, Texas, 77024",
+            29.767836,
+            -95.551491,
+            {
+                "provider": "arcgis",
+                "source": "arcgis-pointaddress",
+                "boundingbox": None,
+                "address": {
+                    "house_number": "12518",
+                    "road": "Boheme Dr",
+                    "city": "Houston",
+                    "state": "TX",
+                    "postcode": postcode,
+                    "country": "United States",
+                },
+            },
+        )
+
+    def test_confident_point_address_answers_without_waiting_for_other_providers(self):
+        point_address = self.build_point_address()
+        env = {**ConcurrentGeocodeTests.hybrid_env, "GEOCODE_TIERED_EVALUATION": "true"}
+        release = threading.Event()
+        point_address_called = threading.Event()
+
+        def slow_geocode(*args, **kwargs):
+            # Submitted alongside the probe; it must not have to finish for the probe to answer.
+            self.assertTrue(point_address_called.wait(5))
+            release.wait(5)
+            return []
+
+        def point_address_lookup(address):
+            point_address_called.set()
+            return point_address
+
+        try:
+            with patch.dict(environ, env, clear=False):
+                with patch.object(main.geolocator, "geocode", side_effect=slow_geocode):
+                    with patch.object(main.geolocator, "reverse", side_effect=AssertionError("should not reverse geocode")):
+                        with patch.object(main, "reverse_geocode_arcgis_location", side_effect=AssertionError("should not reverse geocode")):
+                            with patch.object(main, "fetch_arcgis_point_address", side_effect=point_address_lookup):
+                                started_at = time.monotonic()
+                                result = main.geocode_location(self.requested_address)
+                                elapsed = time.monotonic() - started_at
+        finally:
+            release.set()
+
+        self.assertLess(elapsed, 2)
+        self.assertIs(result["location"], point_address)
+        self.assertEqual(result["resolution_tier"], "pointaddress")
+        self.assertEqual(result["match_quality"], "high")
+
+    def test_unconfident_point_address_falls_through_to_verification(self):
+        point_address = self.build_point_address(postcode="77079")
+        exact_candidate = build_candidate(2, 29.766980, -95.550910, "12518", "Boheme Drive", addresstype="road")
+        env = {
+            **ConcurrentGeocodeTests.hybrid_env,
+            "GEOCODE_TIERED_EVALUATION": "true",
+            "GEOCODE_CONFIDENCE_SCORE": "100",
+        }
+
+        with patch.dict(environ, env, clear=False):
+            with patch.object(main.geolocator, "geocode", return_value=[exact_candidate]) as geocode_mock:
+                with patch.object(main.geolocator, "reverse", return_value=exact_candidate):
+                    with patch.object(main, "reverse_geocode_arcgis_location", side_effect=main.HTTPException(status_code=500)):
+                        with patch.object(main, "fetch_arcgis_point_address", return_value=point_address):
+                            result = main.geocode_location(self.requested_address)
+
+        self.assertEqual(geocode_mock.call_count, 2)
+        self.assertEqual(result["resolution_tier"], "reverse-verified")
+
+    def test_untiered_mode_always_verifies(self):
+        point_address = self.build_point_address()
+
+        with patch.dict(environ, {**ConcurrentGeocodeTests.hybrid_env, "GEOCODE_TIERED_EVALUATION": ""}, clear=False):
+            with patch.object(main.geolocator, "geocode", return_value=[]) as geocode_mock:
+                with patch.object(main, "reverse_geocode_arcgis_location", side_effect=main.HTTPException(status_code=500)):
+                    with patch.object(main, "fetch_arcgis_point_address", return_value=point_address):
+                        result = main.geocode_location(self.requested_address)
+
+        self.assertEqual(geocode_mock.call_count, 2)
+        self.assertEqual(result["resolution_tier"], "reverse-verified")
+        self.assertIn("reverse-verified", main.get_geocode_resolution_stats()["tiers"])
+
+
+class ReverseCheckCacheTests(unittest.TestCase):
+    requested_address = ConcurrentGeocodeTests.requested_address
+
+    def setUp(self):
+        data_persistence.reset_memory_storage()
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+
+    def geocode_with_reverse_mock(self, candidates):
+        reverse_lookup = {
+            f"{candidate.latitude}, {candidate.longitude}": FakeLocation(
+                address=candidate.address,
+                latitude=candidate.latitude,
+                longitude=candidate.longitude,
+                raw=candidate.raw,
+            )
+            for candidate in candidates
+        }
+        with patch.dict(environ, ConcurrentGeocodeTests.hybrid_env, clear=False):
+            with patch.object(main.geolocator, "geocode", return_value=list(candidates)):
+                with patch.object(
+                    main.geolocator,
+                    "reverse",
+                    side_effect=lambda query, **kwargs: reverse_lookup[query],
+                ) as reverse_mock:
+                    with patch.object(main, "fetch_arcgis_point_address", return_value=None):
+                        result = main.geocode_location(self.requested_address)
+        return result, reverse_mock.call_count
+
+    def test_repeat_lookup_reuses_cached_reverse_checks(self):
+        candidates = [
+            build_candidate(1, 29.767210, -95.550680, "12502", "Boheme Drive"),
+            build_candidate(2, 29.766980, -95.550910, "12518", "Boheme Drive"),
+        ]
+        before = main.get_reverse_check_stats()
+
+        first_result, first_calls = self.geocode_with_reverse_mock(candidates)
+        second_result, second_calls = self.geocode_with_reverse_mock(candidates)
+
+        after = main.get_reverse_check_stats()
+        self.assertEqual(first_calls, 2)
+        self.assertEqual(second_calls, 0)
+        self.assertIs(second_result["location"], candidates[1])
+        self.assertEqual(first_result["match_score"], second_result["match_score"])
+        self.assertEqual(after["saved_upstream_calls"] - before["saved_upstream_calls"], 2)
+        self.assertEqual(after["upstream_calls"] - before["upstream_calls"], 2)
+
+    def test_reverse_geocode_endpoint_shares_candidate_cache(self):
+        candidate = build_candidate(2, 29.766980, -95.550910, "12518", "Boheme Drive")
+        self.geocode_with_reverse_mock([candidate])
+
+        with patch.dict(environ, ConcurrentGeocodeTests.hybrid_env, clear=False):
+            with patch.object(
+                main.geolocator,
+                "reverse",
+                side_effect=AssertionError("should reuse the cached reverse lookup"),
+            ):
+                response = self.client.post(
+                    "/api/reverse-geocode",
+                    json={"latitude": candidate.latitude, "longitude": candidate.longitude},
+                )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["address"]["street"], "12518 Boheme Drive")
+        self.assertEqual(response.json()["source"], "browser-location")
+
+
 class GeocodeCacheTests(unittest.TestCase):
     def setUp(self):
         data_persistence.reset_memory_storage()
@@ -460,5 +747,95 @@ class GeocodeCacheTests(unittest.TestCase):
         )
 
 
+    def test_property_preview_reuses_near_duplicate_address(self):
+        candidate = build_candidate(99, 29.766980, -95.550910, "12518", "Boheme Drive")
+        geocode_payload = {
+            "location": candidate,
+            "match_quality": "high",
+            "match_score": 31,
+            "source": "test-provider",
+        }
+        first_address = {
+            "street": "12518 Boheme Dr",
+            "city": "Houston",
+            "state": "TX",
+            "zip": "77024",
+            "country": "United States",
+        }
+
+        with patch.object(main, "geocode_location", return_value=geocode_payload) as geocode_mock:
+            first_response = self.client.post("/api/property-preview", json=first_address)
+            suffix_response = self.client.post(
+                "/api/property-preview",
+                json={**first_address, "street": "12518 Boheme Drive"},
+            )
+            typo_response = self.client.post(
+                "/api/property-preview",
+                json={**first_address, "street": "12518 Bohem Drive"},
+            )
+
+        self.assertEqual(geocode_mock.call_count, 1)
+        self.assertEqual(suffix_response.json()["index_match"]["type"], "exact")
+        self.assertEqual(typo_response.json()["index_match"]["type"], "fuzzy")
+        self.assertEqual(typo_response.json()["latitude"], first_response.json()["latitude"])
+        # A fuzzy hit is served but never cached under the typo's key, nor reported as high quality.
+        self.assertEqual(typo_response.json()["match_quality"], "medium")
+        typo_key = data_persistence.build_address_lookup_key({**first_address, "street": "12518 Bohem Drive"})
+        self.assertIsNone(data_persistence.get_geocode_cache(main.FORWARD_PROPERTY_PREVIEW_CACHE, typo_key))
+
+    def test_property_preview_asks_the_provider_for_similar_street_names(self):
+        candidate = build_candidate(99, 29.766980, -95.550910, "123", "Maine Street")
+        geocode_payload = {
+            "location": candidate,
+            "match_quality": "high",
+            "match_score": 31,
+            "source": "test-provider",
+        }
+        first_address = {
+            "street": "123 Maine St",
+            "city": "Houston",
+            "state": "TX",
+            "zip": "77024",
+            "country": "United States",
+        }
+
+        with patch.object(main, "geocode_location", return_value=geocode_payload) as geocode_mock:
+            self.client.post("/api/property-preview", json=first_address)
+            similar_response = self.client.post(
+                "/api/property-preview",
+                json={**first_address, "street": "123 Main St"},
+            )
+
+        self.assertEqual(geocode_mock.call_count, 2)
+        self.assertNotIn("index_match", similar_response.json())
+
+    def test_property_preview_skips_index_entries_without_cache(self):
+        candidate = build_candidate(99, 29.766980, -95.550910, "12518", "Boheme Drive")
+        geocode_payload = {
+            "location": candidate,
+            "match_quality": "high",
+            "match_score": 31,
+            "source": "test-provider",
+        }
+        requested_address = {
+            "street": "12518 Boheme Dr",
+            "city": "Houston",
+            "state": "TX",
+            "zip": "77024",
+            "country": "United States",
+        }
+
+        with patch.object(main, "geocode_location", return_value=geocode_payload) as geocode_mock:
+            self.client.post("/api/property-preview", json=requested_address)
+            data_persistence.reset_memory_storage()
+            response = self.client.post(
+                "/api/property-preview",
+                json={**requested_address, "street": "12518 Boheme Drive"},
+            )
+
+        self.assertEqual(geocode_mock.call_count, 2)
+        self.assertNotIn("index_match", response.json())
+
+
 if __name__ == "__main__":
     unittest.main()
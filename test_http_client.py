@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import environ
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import http_client
+
+
+class HttpClientTests(unittest.TestCase):
+    def setUp(self):
+        http_client.close_sessions()
+        http_client.reset_stats()
+
+    def tearDown(self):
+        http_client.close_sessions()
+        http_client.reset_stats()
+
+    def test_sessions_are_shared_per_host_with_retrying_pools(self):
+        first = http_client.get_session("https://services.swpc.noaa.gov/products/a.json")
+        second = http_client.get_session("https://services.swpc.noaa.gov/products/b.json")
+        other = http_client.get_session("https://overpass-api.de/api/interpreter")
+
+        adapter = first.get_adapter("https://services.swpc.noaa.gov")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+
+    def test_host_timeout_budget_caps_caller_timeout(self):
+        with patch.dict(environ, {"HTTP_HOST_TIMEOUTS": "overpass-api.de=25, api.eia.gov=4"}, clear=False):
+            self.assertEqual(http_client.resolve_timeout("https://overpass-api.de/api/interpreter", 20), 20)
+            self.assertEqual(http_client.resolve_timeout("https://overpass-api.de/api/interpreter"), 25.0)
+            self.assertEqual(http_client.resolve_timeout("https://api.eia.gov/v2/x", 15), 4.0)
+            self.assertEqual(http_client.resolve_timeout("https://example.test/x", 10), 10)
+
+    def test_retry_after_header_is_capped(self):
+        retry = http_client.get_session("https://example.test/x").get_adapter("https://example.test").max_retries
+        response = SimpleNamespace(headers={"Retry-After": "3600"})
+
+        with patch.dict(environ, {"HTTP_RETRY_AFTER_MAX_SECONDS": "2"}, clear=False):
+            self.assertEqual(retry.get_retry_after(response), 2.0)
+            self.assertEqual(retry.new(total=1).get_retry_after(response), 2.0)
+
+    def test_rate_limited_hosts_do_not_retry_429(self):
+        with patch.dict(environ, {"HTTP_RATE_LIMITED_HOSTS": "api.example.test"}, clear=False):
+            overpass = http_client.get_session("https://overpass-api.de/api/interpreter")
+            configured = http_client.get_session("https://api.example.test/x")
+            other = http_client.get_session("https://services.swpc.noaa.gov/x")
+
+        self.assertNotIn(429, overpass.get_adapter("https://overpass-api.de").max_retries.status_forcelist)
+        self.assertNotIn(429, configured.get_adapter("https://api.example.test").max_retries.status_forcelist)
+        self.assertIn(429, other.get_adapter("https://services.swpc.noaa.gov").max_retries.status_forcelist)
+
+    def test_deadline_caps_the_attempt_timeout_and_fails_fast_once_passed(self):
+        with patch.object(http_client.requests.Session, "get", return_value=SimpleNamespace(status_code=200)) as mocked_get:
+            http_client.get("https://example.test/a", timeout=10, deadline=time.monotonic() + 1)
+            token = http_client.request_deadline.set(time.monotonic() - 1)
+            try:
+                with self.assertRaises(http_client.requests.Timeout):
+                    http_client.get("https://example.test/b", timeout=10)
+            finally:
+                http_client.request_deadline.reset(token)
+
+        self.assertLessEqual(mocked_get.call_args.kwargs["timeout"], 1)
+        self.assertEqual(mocked_get.call_count, 1)
+        self.assertEqual(http_client.get_http_client_stats()["hosts"]["example.test"]["errors"], 1)
+
+    def test_retries_stop_when_the_deadline_cannot_fit_another_attempt(self):
+        hits = []
+
+        class UnavailableHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                hits.append(self.path)
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), UnavailableHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/status"
+        try:
+            with patch.dict(environ, {"HTTP_RETRY_BACKOFF_SECONDS": "0"}, clear=False):
+                unbounded = http_client.get(url, timeout=5)
+                hits_without_deadline = len(hits)
+                bounded = http_client.get(url, timeout=5, deadline=time.monotonic() + 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual((unbounded.status_code, bounded.status_code), (503, 503))
+        self.assertEqual(hits_without_deadline, 3)
+        self.assertEqual(len(hits) - hits_without_deadline, 1)
+
+    def test_async_get_shares_the_deadline_rules_and_closes_with_its_loop(self):
+        async def _run():
+            with patch.object(http_client.httpx.AsyncClient, "get", return_value=SimpleNamespace(status_code=200)) as mocked_get:
+                await http_client.async_get("https://example.test/a", timeout=10, deadline=time.monotonic() + 1)
+                with self.assertRaises(http_client.httpx.TimeoutException):
+                    await http_client.async_get("https://example.test/b", timeout=10, deadline=time.monotonic() - 1)
+            self.assertEqual(len(http_client._ASYNC_CLIENTS), 1)
+            await http_client.close_async_clients()
+            return mocked_get
+
+        mocked_get = asyncio.run(_run())
+
+        self.assertLessEqual(mocked_get.call_args.kwargs["timeout"], 1)
+        self.assertEqual(mocked_get.call_count, 1)
+        self.assertEqual(http_client._ASYNC_CLIENTS, {})
+        self.assertEqual(http_client.get_http_client_stats()["hosts"]["example.test"]["errors"], 1)
+
+    def test_get_records_per_host_latency_histogram(self):
+        responses = [SimpleNamespace(status_code=200), SimpleNamespace(status_code=503)]
+
+        with patch.object(http_client.requests.Session, "get", side_effect=responses) as mocked_get:
+            http_client.get("https://example.test/a", params={"q": 1}, timeout=3)
+            http_client.get("https://example.test/b")
+
+        stats = http_client.get_http_client_stats()["hosts"]["example.test"]
+        self.assertEqual(mocked_get.call_args_list[0].kwargs["timeout"], 3)
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(sum(stats["latency_histogram"].values()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import threading
 import unittest
 from unittest.mock import patch
 
@@ -168,6 +169,239 @@ class PropertyContextTests(unittest.TestCase):
         self.assertEqual(focus_anchor["garden_side"], "south")
         self.assertLess(planning_center_lat, raw_center_lat)
 
+    def test_property_context_snapshot_fetches_layers_concurrently(self):
+        gate = threading.Barrier(3, timeout=5)
+
+        def building_layer(latitude, longitude, envelope):
+            gate.wait()
+            return property_context._build_unavailable_building_context(60)
+
+        def canopy_layer(latitude, longitude, envelope):
+            gate.wait()
+            return property_context._build_unavailable_canopy_context(60)
+
+        def terrain_layer(latitude, longitude, envelope):
+            gate.wait()
+            return property_context._build_unavailable_terrain_context()
+
+        with patch.object(property_context, "_build_building_context", side_effect=building_layer):
+            with patch.object(property_context, "_build_canopy_context", side_effect=canopy_layer):
+                with patch.object(property_context, "_build_terrain_context", side_effect=terrain_layer):
+                    snapshot = property_context.get_property_context_snapshot(30.2672, -97.7431)
+
+        self.assertFalse(gate.broken)
+        self.assertEqual(snapshot["building_context"]["building_count"], 0)
+        self.assertEqual(snapshot["canopy_context"]["canopy_count"], 0)
+
+    def test_property_context_snapshot_returns_partial_layers_after_deadline(self):
+        release = threading.Event()
+
+        def slow_terrain(latitude, longitude, envelope):
+            release.wait(5)
+            return {"summary": "Late terrain.", "terrain_class": "steep"}
+
+        try:
+            with patch.object(property_context, "CONTEXT_LAYER_DEADLINE_SECONDS", 0.2):
+                with patch.object(
+                    property_context,
+                    "_build_building_context",
+                    return_value=property_context._build_unavailable_building_context(60),
+                ):
+                    with patch.object(
+                        property_context,
+                        "_build_canopy_context",
+                        side_effect=property_context.requests.RequestException("overpass down"),
+                    ):
+                        with patch.object(property_context, "_build_terrain_context", side_effect=slow_terrain):
+                            snapshot = property_context.get_property_context_snapshot(30.2672, -97.7431)
+        finally:
+            release.set()
+
+        self.assertEqual(
+            snapshot["terrain_context"]["summary"],
+            "Terrain context is unavailable for this property right now.",
+        )
+        self.assertEqual(snapshot["canopy_context"]["canopy_count"], 0)
+        self.assertIn("parcel_context", snapshot)
+
+    def test_context_layers_pass_their_deadline_to_upstream_requests(self):
+        deadlines = []
+
+        def record_deadline(latitude, longitude, envelope):
+            deadlines.append(property_context.http_client.request_deadline.get())
+            return {}
+
+        started_at = property_context.time.monotonic()
+        with patch.object(property_context, "_build_building_context", side_effect=record_deadline):
+            with patch.object(property_context, "_build_canopy_context", side_effect=record_deadline):
+                with patch.object(property_context, "_build_terrain_context", side_effect=record_deadline):
+                    property_context._gather_context_layers(30.2672, -97.7431, {})
+
+        self.assertEqual(len(set(deadlines)), 1)
+        self.assertEqual(len(deadlines), 3)
+        self.assertAlmostEqual(
+            deadlines[0] - started_at,
+            property_context.CONTEXT_LAYER_DEADLINE_SECONDS,
+            delta=1,
+        )
+        self.assertIsNone(property_context.http_client.request_deadline.get())
+
+    def test_combined_overpass_mode_fetches_buildings_and_canopy_in_one_request(self):
+        latitude, longitude = 30.2672, -97.7431
+
+        def building_way(element_id, north_meters):
+            corners = [
+                property_context._offset_coordinate(latitude, longitude, north_meters, east)
+                for east in (-5, 5)
+            ] + [
+                property_context._offset_coordinate(latitude, longitude, north_meters + 8, east)
+                for east in (5, -5)
+            ]
+            return {
+                "type": "way",
+                "id": element_id,
+                "tags": {"building": "house"},
+                "geometry": [{"lat": corner["lat"], "lon": corner["lng"]} for corner in corners],
+            }
+
+        tree = property_context._offset_coordinate(latitude, longitude, east_meters=-15)
+        payload = {
+            "elements": [
+                building_way(1, 12),
+                building_way(2, 400),
+                {"type": "node", "id": 3, "tags": {"natural": "tree"}, "lat": tree["lat"], "lon": tree["lng"]},
+            ]
+        }
+
+        with patch.dict("os.environ", {"PROPERTY_CONTEXT_OVERPASS_MODE": "combined"}):
+            with patch.object(property_context, "_fetch_json", return_value=payload) as mocked_fetch:
+                with patch.object(
+                    property_context,
+                    "_build_terrain_context",
+                    return_value=property_context._build_unavailable_terrain_context(),
+                ):
+                    snapshot = property_context.get_property_context_snapshot(latitude, longitude)
+
+        self.assertEqual(mocked_fetch.call_count, 2)
+        queries = {call.kwargs["params"]["data"] for call in mocked_fetch.call_args_list}
+        self.assertEqual(len(queries), 1)
+        query = queries.pop()
+        self.assertIn('way["building"]', query)
+        self.assertIn('node["natural"="tree"]', query)
+        self.assertEqual(snapshot["building_context"]["building_count"], 1)
+        self.assertEqual(snapshot["building_context"]["nearby_buildings"][0]["id"], "osm-way-1")
+        self.assertEqual(snapshot["canopy_context"]["canopy_count"], 1)
+        self.assertEqual(snapshot["canopy_context"]["nearby_canopy"][0]["id"], "osm-node-3")
+
+    def test_overpass_tiling_is_opt_in(self):
+        with patch.dict("os.environ", {"PROPERTY_CONTEXT_OVERPASS_MODE": ""}):
+            self.assertEqual(property_context._get_overpass_query_mode(), "combined")
+        with patch.dict("os.environ", {"PROPERTY_CONTEXT_OVERPASS_MODE": "tiled"}):
+            self.assertEqual(property_context._get_overpass_query_mode(), "tiled")
+
+    def test_tiled_overpass_mode_answers_neighbors_from_one_tile_fetch(self):
+        tile = property_context._overpass_tile_bounds(30.2672, -97.7431)
+        center_lat, center_lng = self._bounds_center(tile)
+        neighbor = property_context._offset_coordinate(center_lat, center_lng, east_meters=20)
+        tree = property_context._offset_coordinate(center_lat, center_lng, east_meters=60)
+
+        class FakeResponse:
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {
+                    "elements": [
+                        {"type": "node", "id": 7, "tags": {"natural": "tree"}, "lat": tree["lat"], "lon": tree["lng"]},
+                    ]
+                }
+
+        property_context._CACHE.clear()
+        with patch.dict("os.environ", {"PROPERTY_CONTEXT_OVERPASS_MODE": "tiled"}):
+            with patch.object(property_context.http_client, "get", return_value=FakeResponse()) as mocked_get:
+                first = property_context._build_canopy_context(
+                    center_lat,
+                    center_lng,
+                    property_context._build_context_envelope(center_lat, center_lng, None),
+                )
+                second = property_context._build_building_context(
+                    neighbor["lat"],
+                    neighbor["lng"],
+                    property_context._build_context_envelope(neighbor["lat"], neighbor["lng"], None),
+                )
+        property_context._CACHE.clear()
+
+        self.assertEqual(mocked_get.call_count, 1)
+        self.assertIn("[bbox:", mocked_get.call_args.kwargs["params"]["data"])
+        self.assertEqual(first["canopy_count"], 1)
+        self.assertEqual(second["building_count"], 0)
+
+    def test_fetch_json_coalesces_concurrent_identical_requests(self):
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        class FakeResponse:
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {"elements": []}
+
+        def slow_get(url, params=None, timeout=20):
+            started.set()
+            release.wait(5)
+            return FakeResponse()
+
+        property_context._CACHE.clear()
+        with patch.object(property_context.http_client, "get", side_effect=slow_get) as mocked_get:
+            workers = [
+                threading.Thread(
+                    target=lambda: results.append(
+                        property_context._fetch_json("https://example.test/overpass", {"data": "q"})
+                    )
+                )
+                for _ in range(3)
+            ]
+            for worker in workers:
+                worker.start()
+            started.wait(5)
+            release.set()
+            for worker in workers:
+                worker.join()
+        property_context._CACHE.clear()
+
+        self.assertEqual(mocked_get.call_count, 1)
+        self.assertEqual(results, [{"elements": []}] * 3)
+
+    def test_radius_filter_keeps_ways_that_cross_the_circle_without_a_vertex_inside(self):
+        lat, lon = 29.76698, -95.55091
+        lat_step = property_context._meters_to_lat_delta(200)
+        lon_step = property_context._meters_to_lon_delta(200, lat)
+        crossing_edge = {
+            "type": "way",
+            "geometry": [{"lat": lat + lat_step / 10, "lon": lon - lon_step}, {"lat": lat + lat_step / 10, "lon": lon + lon_step}],
+        }
+        surrounding_area = {
+            "type": "way",
+            "geometry": [
+                {"lat": lat - lat_step, "lon": lon - lon_step},
+                {"lat": lat - lat_step, "lon": lon + lon_step},
+                {"lat": lat + lat_step, "lon": lon + lon_step},
+                {"lat": lat + lat_step, "lon": lon - lon_step},
+                {"lat": lat - lat_step, "lon": lon - lon_step},
+            ],
+        }
+        distant_edge = {
+            "type": "way",
+            "geometry": [{"lat": lat + lat_step, "lon": lon - lon_step}, {"lat": lat + lat_step, "lon": lon + lon_step}],
+        }
+
+        self.assertTrue(property_context._element_within_radius(crossing_edge, lat, lon, 50))
+        self.assertTrue(property_context._element_within_radius(surrounding_area, lat, lon, 50))
+        self.assertFalse(property_context._element_within_radius(distant_edge, lat, lon, 50))
+        self.assertFalse(property_context._element_within_radius({"type": "node", "lat": lat + lat_step, "lon": lon}, lat, lon, 50))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from os import environ
+from unittest.mock import patch
+
+import data_persistence
+
+
+def build_address():
+    return {
+        "street": "123 Main St",
+        "city": "Austin",
+        "state": "TX",
+        "zip": "78702",
+        "country": "United States",
+    }
+
+
+class HotQueryPlanTests(unittest.TestCase):
+    """Runs each hot read, captures the SQL it issues and checks SQLite's plan for it."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "query-plans.sqlite3")
+        self.env_patch = patch.dict(environ, {"APP_DB_PATH": self.db_path}, clear=False)
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+        for index in range(20):
+            data_persistence.upsert_property_record(
+                f"guid-{index}",
+                build_address(),
+                garden_zones=[{"id": "zone-1"}] if index % 2 else [],
+                saved_solar_reports=[{"id": f"report-{index}", "homeowner_quote": {"id": f"quote-{index}"}}],
+            )
+        data_persistence.store_solar_data("guid-1", {"annual": 1}, "America/Chicago", build_address(), "nrel")
+        data_persistence.store_geocode_cache("search", "austin", {"lat": 30.26})
+        data_persistence.store_cached_property_climate(30.26, -97.74, {"zone": "9a"})
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def _plans_for(self, read):
+        connection = data_persistence._connect()
+        statements = []
+        connection.set_trace_callback(statements.append)
+        try:
+            read()
+        finally:
+            connection.set_trace_callback(None)
+
+        plans = {}
+        for statement in statements:
+            if statement.lstrip().upper().startswith("SELECT"):
+                rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+                plans[" ".join(statement.split())] = [row["detail"] for row in rows]
+        self.assertTrue(plans)
+        return plans
+
+    def assertIndexedPlan(self, read):
+        for statement, details in self._plans_for(read).items():
+            with self.subTest(statement=statement[:80]):
+                for detail in details:
+                    self.assertNotIn("TEMP B-TREE", detail)
+                    if detail.startswith(("SCAN", "SEARCH")):
+                        self.assertIn("INDEX", detail)
+
+    def test_recency_listings_walk_an_index(self):
+        self.assertIndexedPlan(lambda: data_persistence.list_property_records(limit=5))
+        self.assertIndexedPlan(lambda: data_persistence.list_property_records(limit=5, require_garden_zones=True))
+
+    def test_guid_only_listing_uses_a_covering_index(self):
+        plans = self._plans_for(lambda: data_persistence.list_property_records(limit=5, fields=("stored_at",)))
+
+        self.assertTrue(any("COVERING INDEX" in detail for details in plans.values() for detail in details))
+
+    def test_record_lookups_use_indexes(self):
+        self.assertIndexedPlan(lambda: data_persistence.get_property_record("guid-3"))
+        self.assertIndexedPlan(lambda: data_persistence.find_property_record_by_address(build_address()))
+        self.assertIndexedPlan(lambda: data_persistence.find_solar_quote("quote-3"))
+        self.assertIndexedPlan(lambda: data_persistence.list_solar_quote_leads("quote-3"))
+
+    def test_cache_lookups_use_indexes(self):
+        self.assertIndexedPlan(lambda: data_persistence.check_existing_solar_data("guid-1"))
+        self.assertIndexedPlan(lambda: data_persistence.check_existing_zip_data("78702"))
+        self.assertIndexedPlan(lambda: data_persistence.get_geocode_cache("search", "austin"))
+        self.assertIndexedPlan(lambda: data_persistence.get_cached_property_climate(30.26, -97.74))
+
+    def test_garden_flag_tracks_zone_changes(self):
+        data_persistence.upsert_property_record("guid-0", build_address(), garden_zones=[{"id": "zone-new"}])
+        data_persistence.upsert_property_record("guid-1", build_address(), garden_zones=[])
+
+        listed = data_persistence.list_property_records(limit=50, require_garden_zones=True, fields=("stored_at",))
+        guids = {record["guid"] for record in listed}
+
+        self.assertIn("guid-0", guids)
+        self.assertNotIn("guid-1", guids)
+        self.assertEqual(len(guids), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
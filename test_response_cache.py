@@ -0,0 +1,181 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from os import environ
+from unittest.mock import patch
+
+import requests
+
+import property_context
+import response_cache
+import utility_context
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "response-cache.sqlite3")
+
+    def tearDown(self):
+        response_cache.close_persistence()
+        self.temp_dir.cleanup()
+
+    def test_lru_evicts_least_recently_used_entry(self):
+        cache = response_cache.ResponseCache("lru-test", max_entries=2, persistent=False)
+        cache.set("a", {"value": 1}, 60)
+        cache.set("b", {"value": 2}, 60)
+        cache.get("a")
+        cache.set("c", {"value": 3}, 60)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_byte_budget_bounds_cache_size(self):
+        cache = response_cache.ResponseCache("bytes-test", max_bytes=25, persistent=False)
+        cache.set("a", "x" * 10, 60)
+        cache.set("b", "y" * 10, 60)
+        cache.set("c", "z" * 10, 60)
+
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertLessEqual(stats["bytes"], 25)
+
+    def test_bounded_store_evicts_oldest_write_and_keeps_read_order(self):
+        store = response_cache.BoundedLruStore("store-test", max_entries=2)
+        store["a"] = {"value": 1}
+        store["b"] = {"value": 2}
+        store.get("a")
+        store["c"] = {"value": 3}
+
+        self.assertNotIn("a", store)
+        self.assertEqual(store.keys(), ["b", "c"])
+        self.assertEqual(store.stats()["evictions"], 1)
+
+    def test_expired_entries_are_served_stale_until_the_stale_window_ends(self):
+        cache = response_cache.ResponseCache("stale-test", max_stale_seconds=100, persistent=False)
+        cache.set("key", "payload", 10, fetched_at=1000.0)
+
+        with patch.object(response_cache.time, "time", return_value=1050.0):
+            stale = cache.get("key")
+            fresh = cache.get_fresh("key")
+        with patch.object(response_cache.time, "time", return_value=1200.0):
+            expired = cache.get("key")
+
+        self.assertEqual(stale["data"], "payload")
+        self.assertIsNone(fresh)
+        self.assertIsNone(expired)
+        stats = cache.stats()
+        self.assertEqual((stats["stale_hits"], stats["hits"], stats["misses"]), (1, 0, 2))
+
+    def test_persisted_entries_survive_a_new_process_cache(self):
+        with patch.dict(environ, {"RESPONSE_CACHE_DB_PATH": self.db_path}, clear=False):
+            response_cache.ResponseCache("persist-test").set(("url", ()), {"elements": [1]}, 60)
+            response_cache.close_persistence()
+
+            restarted = response_cache.ResponseCache("persist-test")
+            entry = restarted.get(("url", ()))
+
+        self.assertEqual(entry["data"], {"elements": [1]})
+        self.assertEqual(restarted.stats()["persistent_hits"], 1)
+
+    def test_corrupt_persisted_row_is_deleted_and_treated_as_a_miss(self):
+        with patch.dict(environ, {"RESPONSE_CACHE_DB_PATH": self.db_path}, clear=False):
+            cache = response_cache.ResponseCache("corrupt-test")
+            cache.set("key", {"value": 1}, 60)
+            connection = response_cache._persistence_connect()
+            connection.execute("UPDATE response_cache SET payload_json = '{not json'")
+            connection.commit()
+            cache._entries.clear()
+
+            first = cache.get("key")
+            rows = connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+        self.assertIsNone(first)
+        self.assertEqual(rows, 0)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_set_serializes_the_payload_once(self):
+        payload = {"elements": [1, 2, 3]}
+        with patch.dict(environ, {"RESPONSE_CACHE_DB_PATH": self.db_path}, clear=False), patch.object(
+            response_cache.json, "dumps", wraps=response_cache.json.dumps
+        ) as dumps_mock:
+            entry = response_cache.ResponseCache("serialize-test").set("key", payload, 60)
+
+        payload_dumps = [call for call in dumps_mock.call_args_list if call.args[0] is payload]
+        self.assertEqual(len(payload_dumps), 1)
+        self.assertEqual(entry["size_bytes"], len(response_cache.json.dumps(payload)))
+
+    def test_persisted_reads_do_not_hold_the_cache_lock(self):
+        cache = response_cache.ResponseCache("lock-test")
+        lock_free = []
+        load_persisted = cache._load_persisted
+
+        def probe_lock():
+            acquired = cache._lock.acquire(timeout=1)
+            if acquired:
+                cache._lock.release()
+            lock_free.append(acquired)
+
+        def load_while_probing_lock(key, now):
+            prober = threading.Thread(target=probe_lock)
+            prober.start()
+            prober.join()
+            return load_persisted(key, now)
+
+        with patch.dict(environ, {"RESPONSE_CACHE_DB_PATH": self.db_path}, clear=False):
+            response_cache.ResponseCache("lock-test").set("key", {"value": 1}, 60)
+            with patch.object(cache, "_load_persisted", side_effect=load_while_probing_lock):
+                entry = cache.get("key")
+
+        self.assertEqual(entry["data"], {"value": 1})
+        self.assertEqual(lock_free, [True])
+        self.assertEqual(cache.stats()["persistent_hits"], 1)
+
+    def test_persisted_rows_past_the_stale_window_are_pruned_on_write(self):
+        with patch.dict(
+            environ,
+            {"RESPONSE_CACHE_DB_PATH": self.db_path, "RESPONSE_CACHE_PRUNE_EVERY_WRITES": "2"},
+            clear=False,
+        ):
+            cache = response_cache.ResponseCache("prune-test", max_stale_seconds=100)
+            cache.set("old", "payload", 10, fetched_at=1000.0)
+            cache.set("new", "payload", 10, fetched_at=2000.0)
+            rows = response_cache._persistence_connect().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+        self.assertEqual(rows, 1)
+        self.assertEqual(cache.stats()["pruned"], 1)
+
+    def test_property_context_serves_stale_payload_when_upstream_fails(self):
+        key = ("https://example.test/overpass", (("data", "q"),))
+        property_context._CACHE.clear()
+        property_context._CACHE.set(key, {"elements": ["stale"]}, 60, fetched_at=time.time() - 120)
+
+        with patch.object(property_context.http_client, "get", side_effect=requests.ConnectionError("down")):
+            payload = property_context._fetch_json("https://example.test/overpass", {"data": "q"})
+        property_context._CACHE.clear()
+
+        self.assertEqual(payload, {"elements": ["stale"]})
+
+    def test_utility_context_caches_upstream_responses(self):
+        class FakeResponse:
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {"items": []}
+
+        utility_context._CACHE.clear()
+        with patch.object(utility_context.http_client, "get", return_value=FakeResponse()) as mocked_get:
+            utility_context._fetch_json("https://example.test/rates", {"lat": 30.2})
+            utility_context._fetch_json("https://example.test/rates", {"lat": 30.2})
+        utility_context._CACHE.clear()
+
+        self.assertEqual(mocked_get.call_count, 1)
+        self.assertIn("utility-context", response_cache.get_response_cache_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
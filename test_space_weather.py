@@ -1,7 +1,10 @@
 import json
+import threading
 import unittest
+from os import environ
 from unittest.mock import patch
 
+import httpx
 import requests
 from fastapi.testclient import TestClient
 
@@ -324,7 +327,7 @@ class SpaceWeatherEndpointTests(unittest.TestCase):
         _surface_snapshot,
         _timezone,
     ):
-        with patch.object(live_conditions.requests, "get", side_effect=self._fake_requests_get()):
+        with patch.object(live_conditions.http_client, "get", side_effect=self._fake_requests_get()):
             response = self.client.post(
                 "/api/space-weather",
                 json={"latitude": 30.2672, "longitude": -97.7431},
@@ -351,7 +354,7 @@ class SpaceWeatherEndpointTests(unittest.TestCase):
         _timezone,
     ):
         with patch.object(
-            live_conditions.requests,
+            live_conditions.http_client,
             "get",
             side_effect=self._fake_requests_get(aurora_status_code=503),
         ):
@@ -365,9 +368,81 @@ class SpaceWeatherEndpointTests(unittest.TestCase):
         self.assertEqual(payload["local"]["aurora_viewline"]["forecast_status"], "unavailable")
         self.assertTrue(payload["freshness"]["sources"]["noaa-ovation-aurora"]["refresh_failed"])
 
+    @patch.object(main, "get_timezone", return_value="America/Chicago")
+    @patch.object(live_conditions, "get_surface_irradiance_snapshot", return_value=build_surface_snapshot())
+    def test_space_weather_snapshot_fetches_upstream_sources_concurrently(
+        self,
+        _surface_snapshot,
+        _timezone,
+    ):
+        dispatch = self._fake_requests_get()
+        barrier = threading.Barrier(2, timeout=5)
+        gated_urls = {live_conditions.NOAA_SCALES_URL, live_conditions.NASA_DONKI_FLR_URL}
+
+        def _gated_dispatch(url, params=None, timeout=15):
+            if url in gated_urls:
+                # Both gated sources must be in flight at the same time to pass the barrier.
+                barrier.wait()
+            return dispatch(url, params=params, timeout=timeout)
+
+        with patch.object(live_conditions.http_client, "get", side_effect=_gated_dispatch):
+            snapshot = live_conditions.get_space_weather_snapshot(30.2672, -97.7431, "America/Chicago")
+
+        self.assertFalse(barrier.broken)
+        self.assertEqual(snapshot["global"]["geomagnetic_storm_scale"]["scale"], 2)
+        self.assertFalse(snapshot["freshness"]["sources"]["nasa-donki-flares"]["cache_hit"])
+
+    @patch.object(main, "get_timezone", return_value="America/Chicago")
+    @patch.object(live_conditions, "get_surface_irradiance_snapshot", return_value=build_surface_snapshot())
+    def test_space_weather_endpoint_prefetches_upstream_sources_asynchronously(
+        self,
+        _surface_snapshot,
+        _timezone,
+    ):
+        dispatch = self._fake_requests_get()
+        sync_urls = []
+
+        async def _async_dispatch(url, params=None, timeout=None):
+            try:
+                fake = dispatch(url, params=params)
+            except AssertionError:
+                return httpx.Response(404, request=httpx.Request("GET", url))
+            return httpx.Response(fake.status_code, text=fake.text, request=httpx.Request("GET", url))
+
+        def _tracking_dispatch(url, params=None, timeout=15):
+            sync_urls.append(url)
+            return dispatch(url, params=params, timeout=timeout)
+
+        offloaded = []
+        run_in_threadpool = main.run_in_threadpool
+
+        async def _tracking_threadpool(function, *args, **kwargs):
+            offloaded.append(getattr(function, "__name__", ""))
+            return await run_in_threadpool(function, *args, **kwargs)
+
+        with patch.dict(environ, {"UPSTREAM_ASYNC_PREFETCH": "true"}, clear=False):
+            with patch.object(main.http_client, "async_get", new=_async_dispatch):
+                with patch.object(main, "run_in_threadpool", new=_tracking_threadpool):
+                    with patch.object(live_conditions.http_client, "get", side_effect=_tracking_dispatch):
+                        response = self.client.post(
+                            "/api/space-weather",
+                            json={"latitude": 30.2672, "longitude": -97.7431},
+                        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["global"]["geomagnetic_storm_scale"]["scale"], 2)
+        # Only the GloTEC grid depends on a prior response, so it is the one fetch left for the sync stage.
+        self.assertEqual(len(sync_urls), 1)
+        self.assertIn("/products/glotec/geojson_2d_urt/", sync_urls[0])
+        # Response-cache reads and writes can hit SQLite, so the prefetch runs them in the threadpool.
+        self.assertEqual(offloaded.count("get_fresh"), 10)
+        # The fake feeds have no Open-Meteo forecast, so that prefetch fails and stores nothing.
+        self.assertEqual(offloaded.count("set"), 9)
+        self.assertIn("get_space_weather_snapshot", offloaded)
+
     @patch.object(main, "get_timezone", return_value="America/Chicago")
     def test_space_weather_history_endpoint_returns_recent_donki_timeline(self, _timezone):
-        with patch.object(live_conditions.requests, "get", side_effect=self._fake_requests_get()):
+        with patch.object(live_conditions.http_client, "get", side_effect=self._fake_requests_get()):
             response = self.client.post(
                 "/api/space-weather/history",
                 json={
@@ -394,7 +469,7 @@ class SpaceWeatherEndpointTests(unittest.TestCase):
     @patch.object(main, "get_timezone", return_value="America/Chicago")
     def test_space_weather_history_endpoint_filters_by_event_type_severity_and_limit(self, _timezone):
         with patch.object(
-            live_conditions.requests,
+            live_conditions.http_client,
             "get",
             side_effect=self._fake_requests_get(
                 flares_payload=build_history_flares_payload(),
@@ -444,5 +519,41 @@ class SpaceWeatherEndpointTests(unittest.TestCase):
         self.assertIn("cannot exceed 90 days", response.json()["detail"])
 
 
+class TimezoneCacheTests(unittest.TestCase):
+    def setUp(self):
+        main._resolve_timezone.cache_clear()
+        self.finder_patch = patch.object(main, "_timezone_finder", None)
+        self.finder_patch.start()
+
+    def tearDown(self):
+        self.finder_patch.stop()
+        main._resolve_timezone.cache_clear()
+
+    def test_get_timezone_reuses_one_finder_and_caches_rounded_coordinates(self):
+        with patch.object(main, "TimezoneFinder") as finder_class:
+            finder_class.return_value.timezone_at.return_value = "America/Chicago"
+
+            first = main.get_timezone(30.26721, -97.74311)
+            second = main.get_timezone(30.26719, -97.74309)
+            third = main.get_timezone(40.7128, -74.0060)
+
+        self.assertEqual(first, "America/Chicago")
+        self.assertEqual(second, "America/Chicago")
+        self.assertEqual(third, "America/Chicago")
+        finder_class.assert_called_once_with()
+        self.assertEqual(finder_class.return_value.timezone_at.call_count, 2)
+
+        stats = main.get_timezone_cache_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertTrue(stats["finder_loaded"])
+
+    def test_metrics_endpoint_reports_timezone_cache(self):
+        response = TestClient(main.app).get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hits", response.json()["timezone_cache"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import threading
+import unittest
+from os import environ
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import data_persistence
+import storage_backends
+
+
+def build_address():
+    return {
+        "street": "123 Main St",
+        "city": "Austin",
+        "state": "TX",
+        "zip": "78702",
+        "country": "United States",
+    }
+
+
+class MemoryBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.env_patch = patch.dict(
+            environ,
+            {
+                "APP_DB_BACKEND": "memory",
+                "APP_DB_MEMORY_NAME": "backend-test",
+                "APP_DB_PATH": os.path.join(self.temp_dir.name, "unused.sqlite3"),
+            },
+            clear=False,
+        )
+        self.env_patch.start()
+        data_persistence.close_connections()
+
+    def tearDown(self):
+        backend = data_persistence._runtime_backend()
+        data_persistence.close_connections()
+        backend.discard()
+        data_persistence._backends.pop(backend.key, None)
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_public_functions_share_one_in_memory_database_across_threads(self):
+        data_persistence.upsert_property_record("guid-1", build_address(), garden_zones=[{"id": "zone-1"}])
+        found = []
+        worker = threading.Thread(target=lambda: found.append(data_persistence.get_property_record("guid-1")))
+        worker.start()
+        worker.join()
+
+        data_persistence.store_geocode_cache("search", "austin", {"lat": 30.26})
+
+        self.assertEqual(found[0]["garden_zones"], [{"id": "zone-1"}])
+        self.assertEqual(data_persistence.get_geocode_cache("search", "austin"), {"lat": 30.26})
+        self.assertEqual(data_persistence.get_connection_pool_stats()["backend"], "memory")
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_contents_survive_pool_reset_until_discarded(self):
+        data_persistence.upsert_property_record("guid-1", build_address())
+        data_persistence.close_connections()
+
+        self.assertIsNotNone(data_persistence.get_property_record("guid-1"))
+
+
+class ServerSqlTranslationTests(unittest.TestCase):
+    def test_placeholders_percent_literals_and_integer_widths_are_translated(self):
+        update = storage_backends._translate_server_sql("UPDATE t SET position = ?, note = '5%' WHERE guid = ?")
+        ddl = storage_backends._translate_server_sql("ALTER TABLE t ADD COLUMN stored_at_epoch INTEGER")
+
+        self.assertEqual(update, "UPDATE t SET position = %s, note = '5%%' WHERE guid = %s")
+        self.assertEqual(ddl, "ALTER TABLE t ADD COLUMN stored_at_epoch BIGINT")
+
+    def test_scripts_split_only_on_top_level_semicolons(self):
+        script = """
+        -- seed; then index
+        INSERT INTO t (note) VALUES ('a;b', 'it''s; fine');
+        /* block; comment */ CREATE INDEX "idx;t" ON t(note);
+        """
+
+        statements = storage_backends._split_sql_script(script)
+
+        self.assertEqual(len(statements), 2)
+        self.assertIn("'it''s; fine'", statements[0])
+        self.assertTrue(statements[1].endswith('CREATE INDEX "idx;t" ON t(note)'))
+
+    def test_backends_must_implement_the_connection_surface(self):
+        with self.assertRaises(TypeError):
+            storage_backends.StorageBackend()
+
+    def test_postgres_freshness_backfill_avoids_sqlite_strftime(self):
+        statements = []
+
+        class RecordingConnection:
+            def execute(self, sql, params=()):
+                statements.append(sql)
+
+        backend = SimpleNamespace(dialect="postgres", table_columns=lambda connection, table: set())
+        data_persistence._migrate_cache_freshness_columns(RecordingConnection(), backend)
+
+        backfills = [statement for statement in statements if statement.startswith("UPDATE")]
+        self.assertTrue(backfills)
+        self.assertTrue(all("EXTRACT(EPOCH FROM" in statement for statement in backfills))
+        self.assertFalse(any("strftime" in statement for statement in statements))
+
+    def test_server_rows_read_by_name_and_position(self):
+        row = storage_backends._ServerRow({"guid": 0, "stored_at": 1}, ("guid-1", "2026-01-01"))
+
+        self.assertEqual(row["stored_at"], "2026-01-01")
+        self.assertEqual(row[0], "guid-1")
+
+
+@unittest.skipUnless(
+    storage_backends.psycopg is not None and environ.get("APP_TEST_POSTGRES_DSN"),
+    "set APP_TEST_POSTGRES_DSN and install psycopg to run against a local Postgres",
+)
+class PostgresBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.env_patch = patch.dict(
+            environ,
+            {"APP_DB_BACKEND": "postgres", "APP_DB_DSN": environ["APP_TEST_POSTGRES_DSN"]},
+            clear=False,
+        )
+        self.env_patch.start()
+        data_persistence.close_connections()
+        data_persistence.reset_memory_storage()
+
+    def tearDown(self):
+        data_persistence.reset_memory_storage()
+        data_persistence.close_connections()
+        self.env_patch.stop()
+
+    def test_property_records_and_caches_round_trip(self):
+        data_persistence.upsert_property_record(
+            "guid-1",
+            build_address(),
+            property_context={"summary": "context"},
+            saved_solar_reports=[{"id": "report-1", "homeowner_quote": {"id": "quote-1"}}],
+        )
+        data_persistence.store_cached_property_climate(30.26, -97.74, {"zone": "9a"})
+
+        self.assertEqual(data_persistence.get_property_record("guid-1")["property_context"], {"summary": "context"})
+        self.assertEqual(data_persistence.find_solar_quote("quote-1")["record"]["guid"], "guid-1")
+        self.assertEqual(data_persistence.get_cached_property_climate(30.26, -97.74), {"zone": "9a"})
+
+
+if __name__ == "__main__":
+    unittest.main()
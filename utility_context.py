@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+import logging
 import os
+import time
 from typing import Any, Optional
 
 import requests
 
+import http_client
+from response_cache import get_response_cache
 
+
+logger = logging.getLogger(__name__)
+
+_CACHE = get_response_cache("utility-context")
+
+UTILITY_CACHE_TTL_SECONDS = 86400
 OPENEI_UTILITY_RATES_URL = "https://api.openei.org/utility_rates"
 EIA_RETAIL_SALES_URL = "https://api.eia.gov/v2/electricity/retail-sales/data/"
 
@@ -76,10 +86,29 @@ def _normalize_state_id(value: Optional[str]):
     return STATE_IDS.get(normalized.lower())
 
 
-def _fetch_json(url: str, params: dict[str, Any], timeout: int = 15):
-    response = requests.get(url, params=params, timeout=timeout)
-    response.raise_for_status()
-    return response.json()
+def _fetch_json(
+    url: str,
+    params: dict[str, Any],
+    timeout: int = 15,
+    ttl_seconds: int = UTILITY_CACHE_TTL_SECONDS,
+):
+    key = (url, tuple(sorted((str(name), str(value)) for name, value in params.items())))
+    cached = _CACHE.get(key)
+    if cached and cached["expires_at"] > time.time():
+        return cached["data"]
+
+    try:
+        response = http_client.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError):
+        if cached:
+            logger.warning("Using cached utility fallback for %s after upstream fetch failure", url, exc_info=True)
+            return cached["data"]
+        raise
+
+    _CACHE.set(key, data, ttl_seconds)
+    return data
 
 
 def _to_iso_date_from_timestamp(value: Any):